@@ -0,0 +1 @@
+"""Dados sintéticos e benchmarks de escala do dashboard."""
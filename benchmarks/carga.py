@@ -0,0 +1,334 @@
+"""Teste de carga com sessões simultâneas no servidor Streamlit real.
+
+Sobe ``streamlit run hub.py`` em modo headless e abre N sessões pelo mesmo
+websocket usado pelo navegador (``/_stcore/stream``). Cada sessão entra na
+Home e executa uma sequência aleatória de ações: troca de página e mudança de
+filtros (multiselects da barra lateral). A latência de cada rerun vai do envio
+do ``rerun_script`` até o ``script_finished`` do servidor.
+
+Para cada quantidade de sessões o servidor é reiniciado e o relatório traz
+p50/p95/p99 da latência, reruns por segundo, RSS do servidor (base, pico e
+acréscimo por sessão) e a comparação com o alvo de escala.
+
+O ``AppTest`` não serve aqui: ele troca estado global do Streamlit a cada
+execução e não suporta várias sessões em paralelo no mesmo processo.
+
+Uso:
+    python -m benchmarks.carga --sessoes 1,5,10,25
+    python -m benchmarks.carga --sessoes 10,50 --dados /tmp/hub_100k --alvo-p95-ms 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import websocket_connect
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+TIMEOUT_SERVIDOR_S = 60
+TIMEOUT_RERUN_S = 300
+INTERVALO_RSS_S = 0.2
+PROB_TROCAR_PAGINA = 0.25
+PROB_LIMPAR_FILTRO = 0.3
+
+
+# ============================================================
+# SERVIDOR
+# ============================================================
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def iniciar_servidor(porta, dados=None):
+    env = dict(os.environ, HUB_PERF_LOG="0", HUB_METRICS_PORT="0")
+    if dados:
+        env["HUB_DATA_DIR"] = dados
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "hub.py", "--server.headless", "true",
+         "--server.port", str(porta), "--browser.gatherUsageStats", "false"],
+        cwd=RAIZ, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + TIMEOUT_SERVIDOR_S
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor Streamlit encerrou durante a inicialização")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return processo
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError(f"O servidor não respondeu em {TIMEOUT_SERVIDOR_S}s")
+
+
+# ============================================================
+# SESSÃO SIMULADA
+# ============================================================
+class Sessao:
+    """Um navegador: mantém página atual, widgets visíveis e estados enviados"""
+
+    def __init__(self, porta, rng):
+        self.porta = porta
+        self.rng = rng
+        self.ws = None
+        self.paginas = []          # [(titulo, page_script_hash)]
+        self.pagina = ""
+        self.widgets = {}          # id -> proto do multiselect da última execução
+        self.estados = {}          # id -> lista de valores enviados
+        self.latencias = []        # [(pagina, segundos)]
+        self.pinturas = []         # [(pagina, segundos até o primeiro elemento)]
+        self.erros = 0
+
+    async def conectar(self):
+        requisicao = HTTPRequest(f"ws://127.0.0.1:{self.porta}/_stcore/stream",
+                                 headers={"Sec-WebSocket-Protocol": "streamlit"})
+        self.ws = await websocket_connect(requisicao, max_message_size=1 << 30)
+
+    def fechar(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, page_script_hash=None):
+        if page_script_hash is not None:
+            self.pagina, self.estados = page_script_hash, {}
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = self.pagina
+        for id_widget, valores in self.estados.items():
+            estado = msg.rerun_script.widget_states.widgets.add()
+            estado.id = id_widget
+            estado.string_array_value.data.extend(valores)
+
+        inicio = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        widgets, pintura = {}, None
+        while True:
+            bruto = await asyncio.wait_for(self.ws.read_message(), TIMEOUT_RERUN_S)
+            if bruto is None:
+                raise ConnectionError("Websocket fechado pelo servidor")
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(bruto)
+            tipo = fmsg.WhichOneof("type")
+            if tipo == "navigation":
+                self.paginas = [(p.page_name, p.page_script_hash) for p in fmsg.navigation.app_pages]
+            elif tipo == "delta" and fmsg.delta.WhichOneof("type") == "new_element":
+                elemento = fmsg.delta.new_element
+                if pintura is None:
+                    pintura = time.perf_counter() - inicio
+                tipo_elemento = elemento.WhichOneof("type")
+                if tipo_elemento == "multiselect" and elemento.multiselect.options:
+                    widgets[elemento.multiselect.id] = elemento.multiselect
+                elif tipo_elemento == "exception":
+                    self.erros += 1
+            elif tipo == "script_finished":
+                break
+        duracao = time.perf_counter() - inicio
+
+        self.widgets = widgets
+        # Widgets que sumiram (ex.: opções dependentes de outro filtro) deixam de ser enviados
+        self.estados = {i: v for i, v in self.estados.items() if i in widgets}
+        titulo = next((t for t, h in self.paginas if h == self.pagina), self.paginas[0][0] if self.paginas else "-")
+        self.latencias.append((titulo, duracao))
+        self.pinturas.append((titulo, duracao if pintura is None else pintura))
+
+    async def acao_aleatoria(self):
+        if not self.widgets or self.rng.random() < PROB_TROCAR_PAGINA:
+            outras = [h for _, h in self.paginas if h != self.pagina] or [self.pagina]
+            await self.rerun(self.rng.choice(outras))
+            return
+        widget = self.widgets[self.rng.choice(sorted(self.widgets))]
+        opcoes = list(widget.options)
+        if self.rng.random() < PROB_LIMPAR_FILTRO:
+            valores = []
+        else:
+            valores = self.rng.sample(opcoes, self.rng.randint(1, min(5, len(opcoes))))
+        self.estados[widget.id] = valores
+        await self.rerun()
+
+
+async def _executar_sessao(porta, acoes, pausa, semente, inicio_comum):
+    sessao = Sessao(porta, random.Random(semente))
+    await inicio_comum.wait()
+    try:
+        await sessao.conectar()
+        await sessao.rerun("")
+        for _ in range(acoes):
+            await asyncio.sleep(sessao.rng.uniform(0, pausa))
+            await sessao.acao_aleatoria()
+    except (ConnectionError, asyncio.TimeoutError, OSError):
+        sessao.erros += 1
+    finally:
+        sessao.fechar()
+    return sessao
+
+
+async def _aquecer(porta):
+    """Uma sessão visita todas as páginas antes da medição (snapshot e caches prontos)"""
+    sessao = Sessao(porta, random.Random(0))
+    await sessao.conectar()
+    try:
+        await sessao.rerun("")
+        for _, page_script_hash in list(sessao.paginas):
+            await sessao.rerun(page_script_hash)
+    finally:
+        sessao.fechar()
+
+
+async def _amostrar_rss(pid, amostras, parar):
+    while not parar.is_set():
+        valor = _rss_mb(pid)
+        if valor is not None:
+            amostras.append(valor)
+        await asyncio.sleep(INTERVALO_RSS_S)
+
+
+# ============================================================
+# RODADA POR QUANTIDADE DE SESSÕES
+# ============================================================
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, max(0, int(round(p / 100 * len(ordenados) + 0.5)) - 1))]
+
+
+def _resumir(latencias):
+    ordenados = sorted(latencias)
+    return {
+        "reruns": len(ordenados),
+        "p50_ms": round(_percentil(ordenados, 50) * 1000, 1),
+        "p95_ms": round(_percentil(ordenados, 95) * 1000, 1),
+        "p99_ms": round(_percentil(ordenados, 99) * 1000, 1),
+    }
+
+
+async def _rodada(porta, pid, n_sessoes, acoes, pausa, semente):
+    base = _rss_mb(pid)
+    amostras, parar, inicio_comum = [], asyncio.Event(), asyncio.Event()
+    amostrador = asyncio.create_task(_amostrar_rss(pid, amostras, parar))
+    tarefas = [asyncio.create_task(_executar_sessao(porta, acoes, pausa, semente + i, inicio_comum))
+               for i in range(n_sessoes)]
+    inicio = time.perf_counter()
+    inicio_comum.set()  # todas as sessões chegam juntas, como na segunda de manhã
+    sessoes = await asyncio.gather(*tarefas)
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await amostrador
+
+    todas = [d for s in sessoes for _, d in s.latencias]
+    por_pagina = {}
+    for s in sessoes:
+        for pagina, d in s.latencias:
+            por_pagina.setdefault(pagina, []).append(d)
+    pico = max(amostras, default=base)
+    resultado = {
+        "sessoes": n_sessoes,
+        **_resumir(todas),
+        "reruns_por_s": round(len(todas) / duracao, 2) if duracao else 0.0,
+        "duracao_s": round(duracao, 2),
+        "erros": sum(s.erros for s in sessoes),
+        "paginas": {p: _resumir(v) for p, v in sorted(por_pagina.items())},
+    }
+    if base is not None:
+        resultado.update({
+            "rss_base_mb": round(base, 1),
+            "rss_pico_mb": round(pico, 1),
+            "rss_por_sessao_mb": round((pico - base) / n_sessoes, 2),
+        })
+    return resultado
+
+
+def medir(n_sessoes, acoes, pausa, semente, dados=None, aquecer=True):
+    porta = _porta_livre()
+    servidor = iniciar_servidor(porta, dados)
+    try:
+        if aquecer:
+            asyncio.run(_aquecer(porta))
+        return asyncio.run(_rodada(porta, servidor.pid, n_sessoes, acoes, pausa, semente))
+    finally:
+        servidor.terminate()
+        try:
+            servidor.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            servidor.kill()
+
+
+def verificar_alvo(rodada, alvo_p95_ms, alvo_rss_mb):
+    """Lista de violações do alvo de escala nesta rodada"""
+    violacoes = []
+    if alvo_p95_ms and rodada["p95_ms"] > alvo_p95_ms:
+        violacoes.append(f"p95 {rodada['p95_ms']:.0f} ms > {alvo_p95_ms:.0f} ms")
+    if alvo_rss_mb and rodada.get("rss_por_sessao_mb", 0) > alvo_rss_mb:
+        violacoes.append(f"RSS/sessão {rodada['rss_por_sessao_mb']:.1f} MB > {alvo_rss_mb:.1f} MB")
+    if rodada["erros"]:
+        violacoes.append(f"{rodada['erros']} erro(s) nas sessões")
+    return violacoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões simultâneas")
+    parser.add_argument("--sessoes", default="1,5,10", help="quantidades de sessões, separadas por vírgula")
+    parser.add_argument("--acoes", type=int, default=8, help="ações (filtro ou troca de página) por sessão")
+    parser.add_argument("--pausa", type=float, default=1.0, help="tempo máximo de leitura entre ações (s)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dados", help="HUB_DATA_DIR do servidor (ex.: saída de benchmarks.gerar_dados)")
+    parser.add_argument("--sem-aquecimento", action="store_true", help="mede também a primeira carga dos dados")
+    parser.add_argument("--alvo-p95-ms", type=float, default=3000.0, help="p95 máximo aceito (0 desliga)")
+    parser.add_argument("--alvo-rss-mb-por-sessao", type=float, default=30.0,
+                        help="acréscimo de RSS máximo por sessão (0 desliga)")
+    args = parser.parse_args(argv)
+
+    relatorio = {
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "acoes_por_sessao": args.acoes,
+        "pausa_s": args.pausa,
+        "dados": args.dados or "padrão",
+        "alvo": {"p95_ms": args.alvo_p95_ms, "rss_por_sessao_mb": args.alvo_rss_mb_por_sessao},
+        "rodadas": [],
+    }
+    print(f"{'sessões':>8} {'reruns':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'reruns/s':>9} "
+          f"{'RSS pico':>9} {'MB/sessão':>10}  alvo")
+    falhou = False
+    for n_sessoes in (int(n) for n in args.sessoes.split(",")):
+        rodada = medir(n_sessoes, args.acoes, args.pausa, args.semente, args.dados, not args.sem_aquecimento)
+        violacoes = verificar_alvo(rodada, args.alvo_p95_ms, args.alvo_rss_mb_por_sessao)
+        rodada["violacoes"] = violacoes
+        relatorio["rodadas"].append(rodada)
+        falhou = falhou or bool(violacoes)
+        print(f"{n_sessoes:>8} {rodada['reruns']:>7} {rodada['p50_ms']:>9.0f} {rodada['p95_ms']:>9.0f} "
+              f"{rodada['p99_ms']:>9.0f} {rodada['reruns_por_s']:>9.2f} {rodada.get('rss_pico_mb', 0):>9.0f} "
+              f"{rodada.get('rss_por_sessao_mb', 0):>10.1f}  {'; '.join(violacoes) or 'ok'}", flush=True)
+
+    os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+    caminho = os.path.join(DIRETORIO_RESULTADOS, f"carga_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\nRelatório salvo em {caminho}")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Benchmark de escala: tempo de cada etapa das páginas por volume de dados.
+
+Para cada tamanho, gera (ou reaproveita) dados sintéticos com
+``benchmarks.gerar_dados`` e mede, num processo novo com ``HUB_DATA_DIR``
+apontando para eles:
+
+- construção do snapshot (leitura das fontes + tratamento + gravação)
+- cada página executada via ``AppTest``, com os tempos das seções da telemetria
+  (carregamento, filtros, KPIs, cada aba com agregações e gráficos, insights):
+  a primeira execução (``fria``) e a mediana de ``--repeticoes`` execuções
+  seguintes, com os filtros completos e com um recorte de período
+- RSS do processo ao final
+
+O resultado vai para ``benchmarks/resultados/`` e é comparado com
+``benchmarks/baseline.json``; seções que pioraram além da tolerância são
+listadas e o comando sai com código 1. Com ``--exigir-baseline`` a falta de
+baseline para algum tamanho medido também é erro (uso em CI).
+
+Uso:
+    python -m benchmarks.escala --tamanhos 1000,10000,100000
+    python -m benchmarks.escala --tamanhos 1000,100000,1000000,5000000 --formato parquet
+    python -m benchmarks.escala --tamanhos 1000,10000 --salvar-baseline
+    python -m benchmarks.escala --exigir-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import gerar_dados
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+ARQUIVO_BASELINE = os.path.join(RAIZ, "benchmarks", "baseline.json")
+PAGINAS = {
+    "Vendas": os.path.join(RAIZ, "pages", "Vendas.py"),
+    "Projetos": os.path.join(RAIZ, "pages", "Projetos.py"),
+}
+# Filtro de período usado no cenário "recorte" (mantém só as últimas opções)
+FILTRO_PERIODO = {"Vendas": ("Ano da Venda", 1), "Projetos": ("Período (Ano-Mês)", 3)}
+TIMEOUT_PAGINA_S = 900
+
+
+# ============================================================
+# MEDIÇÃO (processo filho, com HUB_DATA_DIR já definido)
+# ============================================================
+def _executar(at, eventos):
+    eventos.clear()
+    inicio = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    tempos = {}
+    for evento in eventos:
+        tempos[evento["secao"]] = tempos.get(evento["secao"], 0.0) + evento["duracao_s"]
+    tempos["total"] = total
+    return tempos
+
+
+def _mediana_ms(execucoes):
+    secoes = sorted({secao for tempos in execucoes for secao in tempos})
+    return {secao: round(statistics.median(t.get(secao, 0.0) for t in execucoes) * 1000, 2) for secao in secoes}
+
+
+def _medir_pagina(pagina, repeticoes, eventos):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGINAS[pagina], default_timeout=TIMEOUT_PAGINA_S)
+    medidas = {f"{pagina} (fria)": _mediana_ms([_executar(at, eventos)])}
+    medidas[f"{pagina} (completo)"] = _mediana_ms([_executar(at, eventos) for _ in range(repeticoes)])
+
+    rotulo, manter = FILTRO_PERIODO[pagina]
+    periodo = next(w for w in at.sidebar.multiselect if w.label == rotulo)
+    periodo.set_value(periodo.options[-manter:])
+    medidas[f"{pagina} (recorte)"] = _mediana_ms([_executar(at, eventos) for _ in range(repeticoes)])
+    return medidas
+
+
+def medir(repeticoes):
+    """Mede o diretório apontado por HUB_DATA_DIR; devolve {escopo: {etapa: ms}}"""
+    from core import metricas, snapshots, telemetria
+
+    eventos = []
+    telemetria.assinar(eventos.append)
+
+    construcao = {}
+    for dataset in snapshots.DATASETS:
+        inicio = time.perf_counter()
+        versao = snapshots.construir(dataset, forcar=True)
+        construcao[f"construir {dataset}"] = round((time.perf_counter() - inicio) * 1000, 2)
+        construcao[f"linhas {dataset}"] = snapshots.manifesto(dataset, versao)["linhas"]
+    medidas = {"dados": construcao}
+
+    for pagina in PAGINAS:
+        medidas.update(_medir_pagina(pagina, repeticoes, eventos))
+    medidas["processo"] = {"rss_mb": round(metricas.rss_bytes() / 2 ** 20, 1)}
+    return medidas
+
+
+# ============================================================
+# ORQUESTRAÇÃO
+# ============================================================
+def _preparar_dados(trabalho, tamanho, formato, regenerar):
+    destino = os.path.join(trabalho, f"{formato}_{tamanho}")
+    marcador = os.path.join(destino, f"{gerar_dados.ARQUIVO_VENDAS}.{formato}")
+    if regenerar or not os.path.exists(marcador):
+        print(f"Gerando {tamanho} linhas ({formato}) em {destino}...", flush=True)
+        gerar_dados.gravar(destino, tamanho, formato)
+    return destino
+
+
+def _medir_em_subprocesso(destino, repeticoes):
+    env = dict(os.environ, HUB_DATA_DIR=destino, HUB_PERF_LOG="0", HUB_METRICS_PORT="0",
+               HUB_SNAPSHOT_PAPEL="local", PYTHONPATH=RAIZ)
+    saida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.escala", "--medir", "--repeticoes", str(repeticoes)],
+        cwd=RAIZ, env=env, capture_output=True, text=True,
+    )
+    if saida.returncode != 0:
+        raise RuntimeError(f"Falha ao medir {destino}:\n{saida.stderr[-4000:]}")
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def comparar(atual, baseline, tolerancia, piso_ms):
+    """Lista (tamanho, escopo, etapa, base, atual) das etapas que pioraram além da tolerância"""
+    regressoes = []
+    for tamanho, escopos in atual["medidas"].items():
+        for escopo, etapas in escopos.items():
+            for etapa, valor in etapas.items():
+                base = baseline.get("medidas", {}).get(tamanho, {}).get(escopo, {}).get(etapa)
+                if base is None or etapa.startswith("linhas"):
+                    continue
+                if valor > base * (1 + tolerancia) and valor - base > piso_ms:
+                    regressoes.append((tamanho, escopo, etapa, base, valor))
+    return regressoes
+
+
+def _imprimir(resultado):
+    for tamanho, escopos in resultado["medidas"].items():
+        print(f"\n=== {int(tamanho):,} linhas ===".replace(",", "."))
+        for escopo, etapas in escopos.items():
+            print(f"  {escopo}")
+            for etapa, valor in etapas.items():
+                formato = ",d" if isinstance(valor, int) else ",.2f"
+                print(f"    {etapa:<45} {valor:>12{formato}}".replace(",", "X").replace(".", ",").replace("X", "."))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de escala do dashboard")
+    parser.add_argument("--tamanhos", default="1000,10000,100000",
+                        help="linhas por dataset, separadas por vírgula (1k a 5M)")
+    parser.add_argument("--formato", choices=gerar_dados.FORMATOS, default="parquet")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--trabalho", default=os.path.join(tempfile.gettempdir(), "hub_arv_bench"),
+                        help="onde ficam os dados sintéticos (reaproveitados entre execuções)")
+    parser.add_argument("--regenerar", action="store_true", help="gera os dados mesmo se já existirem")
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE)
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava o resultado como novo baseline")
+    parser.add_argument("--exigir-baseline", action="store_true",
+                        help="sai com código 1 se não houver baseline para algum tamanho medido")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    parser.add_argument("--piso-ms", type=float, default=10.0, help="diferença absoluta mínima para acusar regressão")
+    parser.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        print(json.dumps(medir(args.repeticoes), ensure_ascii=False))
+        return 0
+
+    resultado = {
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "maquina": platform.node(),
+        "formato": args.formato,
+        "repeticoes": args.repeticoes,
+        "medidas": {},
+    }
+    for tamanho in (int(t) for t in args.tamanhos.split(",")):
+        destino = _preparar_dados(args.trabalho, tamanho, args.formato, args.regenerar)
+        print(f"Medindo {tamanho} linhas...", flush=True)
+        resultado["medidas"][str(tamanho)] = _medir_em_subprocesso(destino, args.repeticoes)
+
+    os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+    caminho = os.path.join(DIRETORIO_RESULTADOS, f"escala_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    _imprimir(resultado)
+    print(f"\nResultado salvo em {caminho}")
+
+    if args.salvar_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"Baseline atualizado em {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Sem baseline para comparar (use --salvar-baseline).")
+        return 1 if args.exigir_baseline else 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    sem_baseline = [t for t in resultado["medidas"] if t not in baseline.get("medidas", {})]
+    if sem_baseline:
+        print(f"Sem baseline para {', '.join(sem_baseline)} linhas em {args.baseline}.")
+        if args.exigir_baseline:
+            return 1
+    regressoes = comparar(resultado, baseline, args.tolerancia, args.piso_ms)
+    if not regressoes:
+        print(f"Nenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.baseline}.")
+        return 0
+    print(f"\n⚠️ {len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}:")
+    for tamanho, escopo, etapa, base, valor in regressoes:
+        unidade = "MB" if etapa.endswith("_mb") else "ms"
+        print(f"  {tamanho} linhas | {escopo} | {etapa}: {base:.1f} -> {valor:.1f} {unidade} (+{valor / base - 1:.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Gerador de dados sintéticos com o mesmo layout das planilhas de origem.
+
+Produz vendas e tarefas com os nomes de coluna originais (``Data da Venda``,
+``Valor da Venda (R$)``, ``Dono``, ``Duração``, ``Equipe``...) e distribuições
+próximas das reais: poucos vendedores concentrando as vendas, clientes com
+cauda longa, valores log-normais, lead time assimétrico e ~40% de tarefas no
+prazo. O histórico cresce com o volume, de modo que mais linhas significam
+mais meses e mais clientes, não só mais repetições.
+
+Uso:
+    python -m benchmarks.gerar_dados --linhas 100000 --destino /tmp/hub_100k
+    python -m benchmarks.gerar_dados --linhas 5000000 --formato parquet --destino /tmp/hub_5m
+
+Para usar no dashboard, aponte ``HUB_DATA_DIR`` para o destino.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.dados import EQUIPES_PESSOAS, MESES_NOMES
+
+LIMITE_LINHAS_XLSX = 1_048_575
+FORMATOS = ("xlsx", "parquet")
+
+TIPOS_SOLUCAO = [
+    "Serviços técnicos de suporte e otimização",
+    "Revenda",
+    "Máquinas especiais para automação",
+    "Soluções em robótica (industriais e colaborativas)",
+    "Controle de qualidade automatizado (visão, testes, estanqueidade)",
+    "Consultoria para automação",
+    "Linhas de montagem automáticas",
+]
+PESOS_SOLUCAO = [64, 58, 25, 5, 3, 3, 3]
+
+NOMES_VENDEDORES = ["Lilian", "Mariana", "Rafael", "Beatriz", "Carlos", "Fernanda", "Marcos", "Juliana"]
+PREFIXOS_CLIENTE = ["METALÚRGICA", "INDÚSTRIA", "AUTOPEÇAS", "PLÁSTICOS", "ALIMENTOS", "EMBALAGENS", "USINAGEM"]
+SUFIXOS_CLIENTE = ["LTDA", "S.A.", "EIRELI", "INDÚSTRIA E COMÉRCIO LTDA"]
+ACOES = ["Instalação", "Ajuste", "Retrofit", "Manutenção", "Cadastro", "Projeto", "Montagem", "Teste"]
+OBJETOS = ["do robô", "da célula", "do painel elétrico", "da esteira", "do dispositivo", "da linha", "do CLP"]
+DURACOES = [0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 16.0, 24.0, 40.0, 60.0]
+PESOS_DURACAO = [229, 697, 40, 789, 128, 179, 36, 20, 108, 25, 12, 8, 4, 1]
+# Pessoas com carga real bem diferente (Compras e Elétrica concentram tarefas)
+PESOS_EQUIPE = {"Manufatura": 1.0, "Engenharia Mecânica": 1.2, "Engenharia Elétrica": 1.4,
+                "Compras": 2.5, "Terceiros": 0.5}
+
+ARQUIVO_VENDAS = "DADOS-VENDAS"
+ARQUIVOS_TAREFAS = ("TAREFAS-PROJETOS-JUN-AGOST", "TAREFAS-PROJETOS-SET-NOV")
+ABAS_VENDAS = ["Dashboard", "Planilha1", "Tabelas de Apoio", "Cadastro de Empresas - 1",
+               "Cadastro de Concorrentes ARV 2", "Histórico de Vendas 3 "]
+
+
+# ============================================================
+# DISTRIBUIÇÕES
+# ============================================================
+def _zipf(n, expoente=1.1):
+    """Pesos normalizados com cauda longa (rank 1 = mais frequente)"""
+    pesos = 1.0 / np.arange(1, n + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+def _meses_de_historico(linhas):
+    """Mais volume cobre mais tempo: de 6 meses (1k linhas) a 10 anos"""
+    return int(np.clip(linhas // 2_000, 6, 120))
+
+
+def _datas(rng, linhas, fim, meses):
+    inicio = fim - pd.DateOffset(months=meses)
+    dias = (fim - inicio).days
+    # Volume cresce ao longo do tempo, como uma empresa em expansão
+    deslocamento = (rng.beta(1.6, 1.0, linhas) * dias).astype("int64")
+    return inicio + pd.to_timedelta(deslocamento, unit="D")
+
+
+def _textos(rng, linhas, partes):
+    """Concatena escolhas aleatórias de cada lista em ``partes`` (vetorizado)"""
+    resultado = None
+    for opcoes in partes:
+        coluna = pd.Series(np.asarray(opcoes, dtype=object)[rng.integers(0, len(opcoes), linhas)])
+        resultado = coluna if resultado is None else resultado + " " + coluna
+    return resultado
+
+
+# ============================================================
+# GERAÇÃO
+# ============================================================
+def gerar_vendas(linhas, semente=0, fim="2025-10-31"):
+    rng = np.random.default_rng(semente)
+    fim = pd.Timestamp(fim)
+    meses = _meses_de_historico(linhas)
+
+    n_clientes = int(min(linhas, max(40, linhas ** 0.75)))
+    n_vendedores = int(np.clip(linhas // 20_000, 2, 50))
+    clientes = (pd.Series(np.asarray(PREFIXOS_CLIENTE, dtype=object)[np.arange(n_clientes) % len(PREFIXOS_CLIENTE)])
+                + " " + pd.Series(np.arange(n_clientes)).map("{:05d}".format)
+                + " " + pd.Series(np.asarray(SUFIXOS_CLIENTE, dtype=object)[np.arange(n_clientes) % len(SUFIXOS_CLIENTE)]))
+    vendedores = [NOMES_VENDEDORES[i % len(NOMES_VENDEDORES)] + ("" if i < len(NOMES_VENDEDORES) else f" {i}")
+                  for i in range(n_vendedores)]
+
+    data_venda = _datas(rng, linhas, fim, meses)
+    lead_time = np.rint(rng.gamma(0.9, 90, linhas)).astype("int64") - 10
+    data_nf = data_venda + pd.to_timedelta(lead_time, unit="D")
+    data_nf = data_nf.where(data_nf <= fim, fim)
+
+    pesos_solucao = np.asarray(PESOS_SOLUCAO, dtype=float)
+    valor = np.round(rng.lognormal(mean=np.log(16_000), sigma=1.9, size=linhas), 2).clip(80, 8_000_000)
+
+    return pd.DataFrame({
+        "Data da Venda": data_venda,
+        "Data de Emissão da NF": data_nf,
+        "Cliente": clientes.to_numpy()[rng.choice(n_clientes, linhas, p=_zipf(n_clientes))],
+        "Vendedor Responsável": np.asarray(vendedores, dtype=object)[
+            rng.choice(n_vendedores, linhas, p=_zipf(n_vendedores, 0.6))],
+        "Tipo de Solução": np.asarray(TIPOS_SOLUCAO, dtype=object)[
+            rng.choice(len(TIPOS_SOLUCAO), linhas, p=pesos_solucao / pesos_solucao.sum())],
+        "Descrição do Projeto": _textos(rng, linhas, [ACOES, OBJETOS]),
+        "Valor da Venda (R$)": valor,
+        "OS.": np.arange(1_000, 1_000 + linhas),
+        "Proposta": np.arange(2_000, 2_000 + linhas) + rng.integers(0, 5, linhas),
+    })
+
+
+def gerar_tarefas(linhas, semente=0, fim="2025-11-28"):
+    rng = np.random.default_rng(semente + 1)
+    fim = pd.Timestamp(fim)
+    meses = _meses_de_historico(linhas)
+
+    pessoas, equipes, pesos = [], [], []
+    for equipe, membros in EQUIPES_PESSOAS.items():
+        for membro in membros:
+            pessoas.append(membro)
+            equipes.append(equipe)
+            pesos.append(PESOS_EQUIPE.get(equipe, 1.0) * rng.uniform(0.3, 1.5))
+    pesos = np.asarray(pesos) / np.sum(pesos)
+    indice_pessoa = rng.choice(len(pessoas), linhas, p=pesos)
+
+    prazo = _datas(rng, linhas, fim, meses)
+    # ~40% no prazo; atrasos curtos são a maioria, com cauda de algumas semanas
+    atraso = np.where(rng.random(linhas) < 0.4,
+                      -rng.geometric(0.6, linhas) + 1,
+                      rng.geometric(0.35, linhas) + rng.poisson(0.3, linhas) * 7)
+    conclusao = prazo + pd.to_timedelta(atraso, unit="D")
+    pesos_duracao = np.asarray(PESOS_DURACAO, dtype=float)
+
+    return pd.DataFrame({
+        "Name": _textos(rng, linhas, [ACOES, OBJETOS]) + " " + pd.Series(rng.integers(1, 2_000, linhas)).astype(str),
+        "Dono": np.asarray(pessoas, dtype=object)[indice_pessoa],
+        "Status": "Feito",
+        "Prazo": prazo,
+        "Duração": np.asarray(DURACOES)[rng.choice(len(DURACOES), linhas, p=pesos_duracao / pesos_duracao.sum())],
+        "Data de Conclusão": conclusao,
+        "Equipe": np.asarray(equipes, dtype=object)[indice_pessoa],
+        "pontualidade": (atraso <= 0).astype("int64"),
+        "Mês": np.asarray([m.lower() for m in MESES_NOMES], dtype=object)[conclusao.month - 1],
+    })
+
+
+# ============================================================
+# GRAVAÇÃO
+# ============================================================
+def _gravar_xlsx_vendas(df, caminho):
+    with pd.ExcelWriter(caminho, engine="openpyxl") as escritor:
+        for aba in ABAS_VENDAS[:-1]:
+            pd.DataFrame().to_excel(escritor, sheet_name=aba)
+        df.to_excel(escritor, sheet_name=ABAS_VENDAS[-1], index=False)
+
+
+def gravar(destino, linhas, formato="xlsx", semente=0):
+    """Grava as planilhas sintéticas em ``destino`` com os nomes esperados por ``core.dados``"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    if formato == "xlsx" and linhas > LIMITE_LINHAS_XLSX:
+        raise ValueError(f"xlsx comporta até {LIMITE_LINHAS_XLSX} linhas por aba; use --formato parquet")
+    os.makedirs(destino, exist_ok=True)
+    # Remove fontes do outro formato para o carregamento não misturar gerações
+    for nome in (ARQUIVO_VENDAS, *ARQUIVOS_TAREFAS):
+        for extensao in FORMATOS:
+            caminho = os.path.join(destino, f"{nome}.{extensao}")
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+    vendas = gerar_vendas(linhas, semente)
+    tarefas = gerar_tarefas(linhas, semente)
+    # As tarefas ficam divididas em dois arquivos, como nas planilhas originais
+    corte = tarefas["Data de Conclusão"].sort_values().iloc[len(tarefas) // 2]
+    partes = [tarefas[tarefas["Data de Conclusão"] < corte], tarefas[tarefas["Data de Conclusão"] >= corte]]
+
+    if formato == "xlsx":
+        _gravar_xlsx_vendas(vendas, os.path.join(destino, f"{ARQUIVO_VENDAS}.xlsx"))
+        for nome, parte in zip(ARQUIVOS_TAREFAS, partes):
+            parte.to_excel(os.path.join(destino, f"{nome}.xlsx"), index=False)
+    else:
+        vendas.to_parquet(os.path.join(destino, f"{ARQUIVO_VENDAS}.parquet"), index=False)
+        for nome, parte in zip(ARQUIVOS_TAREFAS, partes):
+            parte.to_parquet(os.path.join(destino, f"{nome}.parquet"), index=False)
+    return destino
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera planilhas sintéticas de vendas e tarefas")
+    parser.add_argument("--linhas", type=int, required=True, help="linhas de vendas e de tarefas (1k a 5M)")
+    parser.add_argument("--destino", required=True, help="diretório a ser usado como HUB_DATA_DIR")
+    parser.add_argument("--formato", choices=FORMATOS, default="xlsx")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+    gravar(args.destino, args.linhas, args.formato, args.semente)
+    print(f"{args.linhas} linhas ({args.formato}) gravadas em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Benchmark de partida: custo de importação por página e tempo até a primeira pintura.
+
+Duas medições, sempre em processos novos (frios):
+
+- importação: os imports do topo de hub.py e de cada página (que roda dentro do
+  hub.py) executados num interpretador novo, depois do ``import streamlit`` que
+  o servidor já fez. Mede o tempo, lista os módulos de ``core.modulos.PESADOS``
+  carregados e os imports mais caros (``-X importtime``). Cada entrada tem um
+  orçamento em ms (``ORCAMENTO_MS``) e hub.py e a Home não podem carregar
+  nenhum módulo pesado;
+- primeira pintura: sobe ``streamlit run hub.py`` headless (como
+  ``benchmarks.carga``) e, numa sessão nova, mede o tempo até o servidor
+  responder, até o primeiro elemento e o fim da execução da Home e da primeira
+  visita a cada dashboard. A pintura da Home também tem orçamento.
+
+O resultado vai para ``benchmarks/resultados/``; se algum orçamento é estourado
+o comando sai com código 1.
+
+Uso:
+    python -m benchmarks.partida
+    python -m benchmarks.partida --repeticoes 5 --sem-servidor
+"""
+import argparse
+import ast
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import carga
+
+RAIZ = carga.RAIZ
+DIRETORIO_RESULTADOS = carga.DIRETORIO_RESULTADOS
+# Arquivos cujos imports cada entrada executa (as páginas rodam dentro do hub.py)
+ENTRADAS = {
+    "hub.py": ["hub.py"],
+    "Home": ["hub.py", "pages/Home.py"],
+    "Vendas": ["hub.py", "pages/Vendas.py"],
+    "Projetos": ["hub.py", "pages/Projetos.py"],
+}
+PARTIDA = ("hub.py", "Home")
+# Tempo de importação (além do streamlit) aceito por entrada, numa máquina de desenvolvimento
+ORCAMENTO_MS = {"hub.py": 60, "Home": 60, "Vendas": 1200, "Projetos": 1200}
+ORCAMENTO_PINTURA_HOME_MS = 600
+MARCADOR = "--- entrada ---"
+MAIORES = 5
+
+
+# ============================================================
+# IMPORTAÇÃO (processo filho)
+# ============================================================
+def _imports(arquivo):
+    """Só os imports do topo do arquivo, compilados (o resto da página não roda)"""
+    with open(os.path.join(RAIZ, arquivo), encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), arquivo)
+    corpo = [no for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+    return compile(ast.Module(body=corpo, type_ignores=[]), arquivo, "exec")
+
+
+def importar(entrada):
+    """Importa a entrada depois do streamlit; devolve tempo e módulos pesados carregados"""
+    from core.modulos import PESADOS
+
+    import streamlit  # noqa: F401  (já carregado pelo servidor antes de qualquer página)
+
+    codigos = [_imports(arquivo) for arquivo in ENTRADAS[entrada]]
+    antes = set(sys.modules)
+    print(MARCADOR, file=sys.stderr, flush=True)
+    inicio = time.perf_counter()
+    for codigo in codigos:
+        exec(codigo, {"__name__": "__entrada__"})
+    duracao = time.perf_counter() - inicio
+    novos = set(sys.modules) - antes
+    return {
+        "ms": round(duracao * 1000, 1),
+        "modulos": len(novos),
+        "pesados": [nome for nome in PESADOS if nome in novos],
+    }
+
+
+def _maiores(stderr):
+    """Imports de primeiro nível mais caros da entrada, pela saída do ``-X importtime``"""
+    linhas = stderr.split(MARCADOR, 1)[-1].splitlines()
+    custos = []
+    for linha in linhas:
+        if not linha.startswith("import time:"):
+            continue
+        _, acumulado, nome = linha.split("|")
+        if nome.startswith("  ") or not acumulado.strip().isdigit():
+            continue  # importado por outro módulo (ou o cabeçalho)
+        custos.append((int(acumulado) / 1000, nome.strip()))
+    return [f"{nome} {ms:.0f} ms" for ms, nome in sorted(custos, reverse=True)[:MAIORES]]
+
+
+def _medir_importacao(entrada, repeticoes):
+    env = dict(os.environ, HUB_PERF_LOG="0", HUB_METRICS_PORT="0", PYTHONPATH=RAIZ)
+    execucoes = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "benchmarks.partida", "--importar", entrada],
+            cwd=RAIZ, env=env, capture_output=True, text=True,
+        )
+        if saida.returncode != 0:
+            raise RuntimeError(f"Falha ao importar {entrada}:\n{saida.stderr[-4000:]}")
+        execucoes.append((json.loads(saida.stdout.strip().splitlines()[-1]), saida.stderr))
+    medida, stderr = sorted(execucoes, key=lambda e: e[0]["ms"])[len(execucoes) // 2]
+    return {**medida, "maiores": _maiores(stderr)}
+
+
+# ============================================================
+# PRIMEIRA PINTURA (servidor real)
+# ============================================================
+async def _visitar(porta):
+    sessao = carga.Sessao(porta, random.Random(0))
+    await sessao.conectar()
+    try:
+        await sessao.rerun("")
+        for _, page_script_hash in list(sessao.paginas[1:]):
+            await sessao.rerun(page_script_hash)
+    finally:
+        sessao.fechar()
+    if sessao.erros:
+        raise RuntimeError(f"{sessao.erros} erro(s) ao visitar as páginas")
+    medidas = {}
+    for (pagina, pintura), (_, total) in zip(sessao.pinturas, sessao.latencias):
+        medidas[f"{pagina} (primeira pintura)"] = pintura * 1000
+        medidas[f"{pagina} (total)"] = total * 1000
+    return medidas
+
+
+def _medir_pintura(dados):
+    porta = carga._porta_livre()
+    inicio = time.perf_counter()
+    servidor = carga.iniciar_servidor(porta, dados)
+    try:
+        medidas = {"servidor pronto": (time.perf_counter() - inicio) * 1000}
+        medidas.update(asyncio.run(_visitar(porta)))
+        return medidas
+    finally:
+        servidor.terminate()
+        try:
+            servidor.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            servidor.kill()
+
+
+def _mediana(execucoes):
+    return {chave: round(statistics.median(e[chave] for e in execucoes), 1) for chave in execucoes[0]}
+
+
+# ============================================================
+# ORÇAMENTO
+# ============================================================
+def verificar_orcamento(resultado, escala):
+    """Lista de violações do orçamento de partida (``escala`` multiplica os limites)"""
+    violacoes = []
+    for entrada, medida in resultado["importacao"].items():
+        limite = ORCAMENTO_MS[entrada] * escala
+        if medida["ms"] > limite:
+            violacoes.append(f"importação de {entrada}: {medida['ms']:.0f} ms > {limite:.0f} ms")
+        if entrada in PARTIDA and medida["pesados"]:
+            violacoes.append(f"{entrada} carrega {', '.join(medida['pesados'])} na partida")
+    pinturas = resultado.get("pintura", {})
+    home = next((v for k, v in pinturas.items() if k.endswith("(primeira pintura)")), None)
+    limite = ORCAMENTO_PINTURA_HOME_MS * escala
+    if home is not None and home > limite:
+        violacoes.append(f"primeira pintura da Home: {home:.0f} ms > {limite:.0f} ms")
+    return violacoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de partida do hub")
+    parser.add_argument("--repeticoes", type=int, default=3, help="processos frios por medida (vale a mediana)")
+    parser.add_argument("--dados", help="HUB_DATA_DIR do servidor (ex.: saída de benchmarks.gerar_dados)")
+    parser.add_argument("--sem-servidor", action="store_true", help="mede só a importação")
+    parser.add_argument("--escala-orcamento", type=float, default=1.0,
+                        help="multiplica os orçamentos (máquinas mais lentas que a de referência)")
+    parser.add_argument("--importar", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.importar:
+        print(json.dumps(importar(args.importar), ensure_ascii=False))
+        return 0
+
+    resultado = {"gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeticoes": args.repeticoes,
+                 "importacao": {}}
+    print(f"{'entrada':<10} {'ms':>8} {'orçamento':>10} {'módulos':>8}  pesados / imports mais caros")
+    for entrada in ENTRADAS:
+        medida = _medir_importacao(entrada, args.repeticoes)
+        resultado["importacao"][entrada] = medida
+        print(f"{entrada:<10} {medida['ms']:>8.0f} {ORCAMENTO_MS[entrada] * args.escala_orcamento:>10.0f} "
+              f"{medida['modulos']:>8}  {', '.join(medida['pesados']) or '-'} | {'; '.join(medida['maiores'])}",
+              flush=True)
+
+    if not args.sem_servidor:
+        resultado["pintura"] = _mediana([_medir_pintura(args.dados) for _ in range(args.repeticoes)])
+        print()
+        for etapa, ms in resultado["pintura"].items():
+            print(f"{etapa:<45} {ms:>10.0f} ms")
+
+    violacoes = verificar_orcamento(resultado, args.escala_orcamento)
+    resultado["violacoes"] = violacoes
+    os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+    caminho = os.path.join(DIRETORIO_RESULTADOS, f"partida_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\nResultado salvo em {caminho}")
+    if not violacoes:
+        print("Dentro do orçamento de partida.")
+        return 0
+    print(f"\n⚠️ {len(violacoes)} violação(ões) do orçamento:")
+    for violacao in violacoes:
+        print(f"  {violacao}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Módulos compartilhados pelas páginas do HUB de Dados ARV."""
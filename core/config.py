@@ -0,0 +1,34 @@
+"""Configurações do HUB lidas de variáveis de ambiente."""
+import os
+
+DATA_DIR = os.environ.get("HUB_DATA_DIR", "data")
+
+
+def env_bool(nome, padrao=False):
+    """Lê uma variável de ambiente como booleano (1/true/sim/on)"""
+    valor = os.environ.get(nome)
+    if valor is None:
+        return padrao
+    return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
+
+
+def env_int(nome, padrao):
+    """Lê uma variável de ambiente inteira, caindo no padrão se inválida"""
+    try:
+        return int(os.environ.get(nome, padrao))
+    except (TypeError, ValueError):
+        return padrao
+
+
+def acesso_autorizado(valor_param, variavel_token, exigir_token=False):
+    """Confere o valor de um query param contra o token da variável de ambiente.
+
+    Sem token configurado o recurso fica liberado apenas pela presença do
+    parâmetro, a menos que ``exigir_token`` seja verdadeiro.
+    """
+    if valor_param is None:
+        return False
+    token = os.environ.get(variavel_token)
+    if not token:
+        return not exigir_token
+    return valor_param == token
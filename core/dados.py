@@ -0,0 +1,152 @@
+"""Leitura e tratamento das planilhas de origem (vendas e tarefas)."""
+import os
+
+import pandas as pd
+
+from core.config import DATA_DIR
+
+
+def _fonte(nome):
+    """Caminho da planilha; sem o .xlsx, aceita o mesmo conteúdo em Parquet (dados sintéticos)"""
+    xlsx = os.path.join(DATA_DIR, nome + ".xlsx")
+    parquet = os.path.join(DATA_DIR, nome + ".parquet")
+    if not os.path.exists(xlsx) and os.path.exists(parquet):
+        return parquet
+    return xlsx
+
+
+ARQUIVO_VENDAS = _fonte("DADOS-VENDAS")
+ABA_VENDAS = 5
+ARQUIVOS_TAREFAS = [
+    _fonte("TAREFAS-PROJETOS-JUN-AGOST"),
+    _fonte("TAREFAS-PROJETOS-SET-NOV"),
+]
+
+# Mapeamento de pessoas por equipe
+EQUIPES_PESSOAS = {
+    "Manufatura": [
+        "Eduardo Ruiz Barrichielo",
+        "Almir",
+        "Thiago Verzinhace",
+        "Sergio da Silva Branco",
+        "Andre Magni",
+        "Felipe Amaral",
+        "Rodrigo Camargo Vieira",
+        "Gustavo Umebayashi sasagima",
+        "Alisson sabino"
+    ],
+    "Engenharia Mecânica": [
+        "Henrique Komoto",
+        "Pedro Julio Marques da Silva",
+        "Lucas Mantovani",
+        "Dario Pereira",
+        "Vinicius Correia",
+        "Mauricio Machado",
+    ],
+    "Engenharia Elétrica": [
+        "Jean Ribeiro",
+        "Ruan Gonçalves de Jesus",
+        "Jonatas Silva",
+        "Gabriel Marcondes de Siqueira",
+        "Fabricio Carvalho",
+        "Lucas Nascimento",
+        "Saulo",
+    ],
+    "Compras": [
+        "Viviane Domingues",
+        "Cintia Olívia",
+        "Kaique Gabriel"
+    ],
+    "Terceiros": [
+        "Terceiros Engenharia Elétrica",
+        "Terceiros Programação",
+        "Terceiros Instalação Mecânica",
+    ]
+}
+
+MESES_NOMES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+
+
+def tratar_vendas(df):
+    """Renomeia colunas da planilha de vendas e cria as colunas derivadas"""
+    df = df.rename(columns={
+        "Data da Venda": "data_venda",
+        "Data de Emissão da NF": "data_nf",
+        "Cliente": "cliente",
+        "Vendedor Responsável": "vendedor",
+        "Tipo de Solução": "tipo_solucao",
+        "Descrição do Projeto": "descricao_projeto",
+        "Valor da Venda (R$)": "valor_venda",
+        "OS.": "os",
+        "Proposta": "proposta",
+    })
+
+    df["data_venda"] = pd.to_datetime(df["data_venda"], errors="coerce")
+    df["data_nf"] = pd.to_datetime(df["data_nf"], errors="coerce")
+    df["valor_venda"] = pd.to_numeric(df["valor_venda"], errors="coerce")
+
+    df["ano"] = df["data_nf"].dt.year
+    df["mes"] = df["data_nf"].dt.month
+    df["ano_mes"] = df["data_nf"].dt.to_period("M").astype(str)
+    df["trimestre"] = df["data_nf"].dt.quarter
+    df["lead_time"] = (df["data_nf"] - df["data_venda"]).dt.days
+
+    # Faixa de valor
+    df["faixa_valor"] = pd.cut(df["valor_venda"],
+                               bins=[0, 10000, 50000, 100000, 500000, float('inf')],
+                               labels=['< R$ 10k', 'R$ 10k-50k', 'R$ 50k-100k',
+                                      'R$ 100k-500k', '> R$ 500k'])
+
+    return df
+
+
+def tratar_tarefas(df):
+    """Renomeia colunas das planilhas de tarefas e cria as colunas derivadas"""
+    df = df.rename(columns={
+        "Name": "tarefa",
+        "Dono": "responsavel",
+        "Status": "status",
+        "Prazo": "prazo",
+        "Duração": "duracao",
+        "Data de Conclusão": "data_conclusao",
+        "Equipe": "equipe",
+        "pontualidade": "pontualidade",
+        "Mês": "mes_raw"
+    })
+
+    df["duracao"] = df["duracao"].fillna(0).astype(float)
+    df["prazo"] = pd.to_datetime(df["prazo"], errors="coerce")
+    df["data_conclusao"] = pd.to_datetime(df["data_conclusao"], errors="coerce")
+    df["ano_mes"] = df["data_conclusao"].dt.to_period("M").astype(str)
+
+    df["mes_nome"] = df["data_conclusao"].dt.month.apply(lambda m: MESES_NOMES[int(m)-1] if pd.notna(m) else None)
+    df["ano"] = df["data_conclusao"].dt.year
+    df["dias_atraso"] = (df["data_conclusao"] - df["prazo"]).dt.days
+    df["status"] = df["status"].fillna("Feito")
+
+    # Novas métricas
+    df["semana_conclusao"] = df["data_conclusao"].dt.isocalendar().week
+    df["dia_semana"] = df["data_conclusao"].dt.day_name()
+    df["no_prazo"] = df["dias_atraso"] <= 0
+    df["faixa_duracao"] = pd.cut(df["duracao"], bins=[0, 2, 8, 24, 40, float('inf')],
+                                  labels=['< 2h', '2-8h', '8-24h', '24-40h', '> 40h'])
+
+    return df
+
+
+def _ler_planilha(caminho, aba=0):
+    if caminho.endswith(".parquet"):
+        return pd.read_parquet(caminho)
+    return pd.read_excel(caminho, sheet_name=aba)
+
+
+def ler_vendas_excel(caminho=ARQUIVO_VENDAS, aba=ABA_VENDAS):
+    return tratar_vendas(_ler_planilha(caminho, aba))
+
+
+def ler_tarefas_excel(caminhos=ARQUIVOS_TAREFAS):
+    partes = [_ler_planilha(caminho) for caminho in caminhos]
+    return tratar_tarefas(pd.concat(partes, ignore_index=True))
@@ -0,0 +1,145 @@
+"""Contagem de distintos que pode ser somada entre células da tabela mensal.
+
+Contagens de distintos (clientes únicos, pessoas) não se somam como as demais
+medidas: o mesmo cliente aparece em vários meses e vendedores. Cada célula da
+tabela mensal guarda um esboço dos valores que aparecem nela e a contagem de
+qualquer recorte sai da união dos esboços das células filtradas.
+
+O esboço é exato (hashes de 64 bits dos valores) até ``LIMITE_EXATO`` valores;
+acima disso vira HyperLogLog com ``2 ** PRECISAO`` registradores, do mesmo
+tamanho em bytes. A união de esboços exatos continua exata; basta um esboço
+aproximado no recorte para o resultado ser uma estimativa, com erro padrão
+relativo de ``ERRO_PADRAO``.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from core.config import env_int
+
+PRECISAO = 12
+REGISTRADORES = 1 << PRECISAO
+# Mesmo tamanho em bytes dos registradores: acima disso o exato ocupa mais
+LIMITE_EXATO = env_int("HUB_DISTINTOS_EXATO", REGISTRADORES // 8)
+ERRO_PADRAO = 1.04 / math.sqrt(REGISTRADORES)
+
+_EXATO = b"E"
+_APROXIMADO = b"H"
+_BITS_RESTO = np.uint64(64 - PRECISAO)
+
+
+class Contagem:
+    """Quantidade de distintos; ``exata`` falso indica estimativa com erro ``erro`` (relativo)"""
+
+    def __init__(self, valor, exata=True):
+        self.valor = int(valor)
+        self.exata = exata
+        self.erro = 0.0 if exata else ERRO_PADRAO
+
+    def __int__(self):
+        return self.valor
+
+    def __repr__(self):
+        return f"Contagem({self.valor}, exata={self.exata})"
+
+    def formatar(self):
+        return f"{self.valor}" if self.exata else f"≈ {self.valor}"
+
+    def margem(self):
+        """Texto do intervalo de ±2 erros padrão (≈95%), vazio se a contagem é exata"""
+        if self.exata:
+            return ""
+        delta = round(2 * self.erro * self.valor)
+        return f"Estimativa: entre {self.valor - delta} e {self.valor + delta} (±{2 * self.erro:.1%}, 95%)"
+
+
+# ============================================================
+# CONSTRUÇÃO (na tabela mensal)
+# ============================================================
+def hashes(serie):
+    """Hash de 64 bits de cada valor não nulo (o mesmo valor tem o mesmo hash em qualquer processo)"""
+    serie = serie.dropna()
+    return pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64)
+
+
+def _comprimento_bits(valores):
+    comprimento = np.zeros(valores.shape, dtype=np.uint8)
+    for passo in (32, 16, 8, 4, 2, 1):
+        maior = valores >= (np.uint64(1) << np.uint64(passo))
+        comprimento += np.where(maior, passo, 0).astype(np.uint8)
+        valores = np.where(maior, valores >> np.uint64(passo), valores)
+    return comprimento + (valores > 0)
+
+
+def _registradores(hashes_):
+    """Registradores HyperLogLog: maior posição do primeiro bit 1 por balde"""
+    registradores = np.zeros(REGISTRADORES, dtype=np.uint8)
+    if len(hashes_) > 0:
+        baldes = (hashes_ >> _BITS_RESTO).astype(np.intp)
+        resto = hashes_ & ((np.uint64(1) << _BITS_RESTO) - np.uint64(1))
+        posicao = (int(_BITS_RESTO) + 1 - _comprimento_bits(resto)).astype(np.uint8)
+        np.maximum.at(registradores, baldes, posicao)
+    return registradores
+
+
+def esboco(hashes_):
+    """Esboço serializado dos hashes (função de agregação das células da tabela mensal)"""
+    unicos = np.unique(np.asarray(hashes_, dtype=np.uint64))
+    if len(unicos) <= LIMITE_EXATO:
+        return _EXATO + unicos.tobytes()
+    return _APROXIMADO + _registradores(unicos).tobytes()
+
+
+# ============================================================
+# UNIÃO E ESTIMATIVA
+# ============================================================
+def _sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        anterior, z = z, z + x * y
+        y += y
+        if z == anterior:
+            return z
+
+
+def _tau(x):
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        anterior = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == anterior:
+            return z / 3
+
+
+def _estimar(registradores):
+    """Estimador de Ertl (2017) sobre o histograma dos registradores: sem viés em toda a faixa"""
+    maximo = int(_BITS_RESTO) + 1
+    histograma = np.bincount(registradores, minlength=maximo + 1)
+    z = REGISTRADORES * _tau(1 - histograma[maximo] / REGISTRADORES)
+    for k in range(maximo - 1, 0, -1):
+        z = 0.5 * (z + histograma[k])
+    z += REGISTRADORES * _sigma(histograma[0] / REGISTRADORES)
+    return round(REGISTRADORES ** 2 / (2 * math.log(2)) / z)
+
+
+def contar(esbocos):
+    """``Contagem`` de distintos na união dos esboços"""
+    exatos, aproximados = [], []
+    for item in esbocos:
+        if item is None:
+            continue
+        dados = np.frombuffer(item, dtype=np.uint8 if item[:1] == _APROXIMADO else np.uint64, offset=1)
+        (aproximados if item[:1] == _APROXIMADO else exatos).append(dados)
+    unicos = np.unique(np.concatenate(exatos)) if exatos else np.empty(0, dtype=np.uint64)
+    if not aproximados:
+        return Contagem(len(unicos))
+    registradores = np.maximum.reduce([_registradores(unicos), *aproximados])
+    return Contagem(_estimar(registradores), exata=False)
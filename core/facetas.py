@@ -0,0 +1,99 @@
+"""Índice de facetas: valores de cada dimensão e co-ocorrência entre elas.
+
+Construído junto do snapshot (agregado ``facetas``) e carregado uma vez por
+processo. As opções dependentes dos filtros (responsáveis das equipes e meses
+selecionados, clientes do vendedor selecionado) saem de consultas ao índice,
+sem varrer as linhas a cada interação com os widgets.
+
+Cada dependência ``alvo <- condicao`` guarda, para cada valor da condição, a
+lista ordenada dos códigos do alvo que aparecem com ele em alguma linha.
+"""
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from core import metricas, snapshots
+
+
+# ============================================================
+# CONSTRUÇÃO (no snapshot)
+# ============================================================
+def _valor_json(valor):
+    if isinstance(valor, pd.Timestamp):
+        return valor.date().isoformat()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def construir(df, dimensoes, dependencias):
+    """Índice serializável em JSON.
+
+    ``dimensoes``: {nome: função(df) -> Series}; ``dependencias``: pares
+    ``(alvo, condicao)`` entre nomes de ``dimensoes``.
+    """
+    codigos, valores = {}, {}
+    for nome, extrair in dimensoes.items():
+        codigos[nome], unicos = pd.factorize(extrair(df), sort=True)
+        valores[nome] = [_valor_json(v) for v in unicos]
+
+    coocorrencia = {}
+    for alvo, condicao in dependencias:
+        cod_alvo, cod_cond = codigos[alvo], codigos[condicao]
+        validos = (cod_alvo >= 0) & (cod_cond >= 0)
+        pares = np.unique(cod_cond[validos].astype(np.int64) * len(valores[alvo]) + cod_alvo[validos])
+        # Pares ordenados por condição e alvo: cada condição é uma fatia contígua
+        limites = np.searchsorted(pares // len(valores[alvo]), np.arange(len(valores[condicao]) + 1))
+        coocorrencia[f"{alvo}|{condicao}"] = [
+            (pares[inicio:fim] % len(valores[alvo])).tolist() for inicio, fim in zip(limites[:-1], limites[1:])
+        ]
+    return {"valores": valores, "coocorrencia": coocorrencia}
+
+
+# ============================================================
+# CONSULTA
+# ============================================================
+class IndiceFacetas:
+    def __init__(self, dados):
+        self._valores = dados["valores"]
+        self._posicoes = {dim: {v: i for i, v in enumerate(vals)} for dim, vals in self._valores.items()}
+        self._listas = {
+            tuple(chave.split("|")): [np.asarray(lista, dtype=np.int64) for lista in listas]
+            for chave, listas in dados["coocorrencia"].items()
+        }
+
+    def valores(self, dimensao):
+        """Todos os valores da dimensão, em ordem"""
+        return list(self._valores[dimensao])
+
+    def _decodificar(self, alvo, condicao, posicoes):
+        listas = self._listas[(alvo, condicao)]
+        if len(posicoes) == 0:
+            return []
+        codigos = np.unique(np.concatenate([listas[i] for i in posicoes]))
+        nomes = self._valores[alvo]
+        return [nomes[i] for i in codigos]
+
+    def opcoes(self, alvo, condicao, selecionados):
+        """Valores de ``alvo`` que aparecem com algum dos ``selecionados`` da condição.
+
+        Sem seleção, a condição não restringe e todos os valores do alvo voltam.
+        """
+        if len(selecionados) == 0:
+            return self.valores(alvo)
+        posicao = self._posicoes[condicao]
+        return self._decodificar(alvo, condicao, [posicao[v] for v in selecionados if v in posicao])
+
+    def opcoes_no_intervalo(self, alvo, condicao, inicio, fim):
+        """Valores de ``alvo`` que aparecem com a condição entre ``inicio`` e ``fim`` (inclusive)"""
+        valores = self._valores[condicao]
+        primeira = bisect.bisect_left(valores, inicio)
+        ultima = bisect.bisect_right(valores, fim)
+        return self._decodificar(alvo, condicao, range(primeira, ultima))
+
+
+@metricas.cache_resource_medido(max_entries=4)
+def indice(dataset, versao):
+    """Índice de facetas do snapshot, compartilhado pelas sessões do processo"""
+    return IndiceFacetas(snapshots.agregado(dataset, versao, "facetas"))
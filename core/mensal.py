@@ -0,0 +1,82 @@
+"""Tabelas mensais materializadas (mês × dimensões principais) dos datasets.
+
+Gravadas junto do snapshot (agregado ``mensal``) com medidas aditivas (somas,
+contagens e esboços de contagem de distintos), de modo que qualquer recorte por mês e pelas dimensões do grão é
+reagregado a partir de uma tabela pequena, sem voltar às linhas.
+
+A atualização é incremental: cada mês guarda a assinatura das suas linhas
+(soma dos hashes, independente da ordem). Ao construir uma versão nova, os
+meses com a mesma assinatura da versão anterior são copiados e só os meses
+afetados são reagregados.
+"""
+import logging
+
+import pandas as pd
+
+from core import distintos
+
+COLUNA_ASSINATURA = "_assinatura"
+
+logger = logging.getLogger(__name__)
+
+
+def _base(df, espec):
+    """Colunas do grão (incluindo as derivadas) e das medidas"""
+    base = pd.DataFrame(index=df.index)
+    for nome in espec["dimensoes"]:
+        derivada = espec.get("derivadas", {}).get(nome)
+        base[nome] = derivada(df) if derivada is not None else df[nome]
+    colunas = {coluna for coluna, _ in espec["medidas"].values()} | set(espec.get("distintos", {}).values())
+    for coluna in colunas:
+        if coluna not in base:
+            base[coluna] = df[coluna]
+    return base
+
+
+def _agregar(base, espec):
+    dimensoes = espec["dimensoes"]
+    tabela = base.groupby(dimensoes, observed=True, dropna=False, sort=False).agg(**espec["medidas"])
+    for nome, coluna in espec.get("distintos", {}).items():
+        validos = base[coluna].notna()
+        hashes = pd.Series(distintos.hashes(base[coluna]), index=base.index[validos])
+        esbocos = hashes.groupby([base.loc[validos, d] for d in dimensoes], observed=True, dropna=False,
+                                 sort=False).agg(distintos.esboco)
+        # Células sem nenhum valor não nulo ficam sem esboço
+        tabela[nome] = esbocos.reindex(tabela.index).astype(object).where(lambda e: e.notna(), None)
+    return tabela.reset_index()
+
+
+def construir(df, espec, anterior=None):
+    """Tabela mensal do dataset; reaproveita de ``anterior`` os meses que não mudaram.
+
+    ``espec``: ``dimensoes`` (a primeira é o mês), ``medidas`` no formato de
+    agregação nomeada do pandas e, opcionalmente, ``derivadas`` ({nome:
+    função(df) -> Series}) para dimensões que não são colunas do snapshot e
+    ``distintos`` ({nome: coluna}), esboços de contagem de distintos da coluna
+    em cada célula (ver core/distintos.py).
+    """
+    mes = espec["dimensoes"][0]
+    base = _base(df, espec)
+    assinaturas = (
+        pd.util.hash_pandas_object(base, index=False)
+        .groupby(base[mes].astype(object), dropna=False).sum()
+    )
+
+    reaproveitados = None
+    afetados = assinaturas
+    colunas = [*espec["medidas"], *espec.get("distintos", {}), COLUNA_ASSINATURA]
+    if anterior is not None and all(coluna in anterior for coluna in colunas):
+        anteriores = anterior.groupby(anterior[mes].astype(object), dropna=False)[COLUNA_ASSINATURA].first()
+        iguais = assinaturas.index[assinaturas.eq(anteriores.reindex(assinaturas.index))]
+        reaproveitados = anterior[anterior[mes].astype(object).isin(iguais)]
+        afetados = assinaturas.drop(iguais)
+
+    logger.info("Tabela mensal: %d de %d meses reagregados", len(afetados), len(assinaturas))
+    linhas = base[base[mes].astype(object).isin(afetados.index)]
+    novos = _agregar(linhas, espec)
+    novos[COLUNA_ASSINATURA] = novos[mes].astype(object).map(afetados).astype("uint64")
+
+    partes = [novos] if reaproveitados is None else [reaproveitados, novos]
+    tabela = pd.concat([p.astype({d: object for d in espec["dimensoes"]}) for p in partes], ignore_index=True)
+    return tabela.sort_values(espec["dimensoes"], na_position="last", ignore_index=True)
+
@@ -0,0 +1,290 @@
+"""Métricas do processo no formato texto do Prometheus.
+
+Um servidor HTTP auxiliar (thread daemon no mesmo processo do Streamlit) expõe
+``/metrics`` na porta ``HUB_METRICS_PORT`` (padrão 9464; ``0`` desliga), no
+endereço ``HUB_METRICS_HOST`` (padrão 127.0.0.1; ``0.0.0.0`` para o Prometheus
+coletar de fora do contêiner). As métricas cobrem latência de rerun por
+página, acertos/falhas dos caches (funções decoradas com
+``cache_resource_medido``) e tamanho dos caches do Streamlit, versão e idade
+dos datasets, RSS, sessões ativas e bytes enviados por rerun.
+
+Só ``st.cache_resource`` tem versão medida: o app não usa mais ``st.cache_data``.
+"""
+import functools
+import inspect
+import logging
+import os
+import resource
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+from core import telemetria
+from core.config import env_int
+
+PORTA = env_int("HUB_METRICS_PORT", 9464)
+ENDERECO = os.environ.get("HUB_METRICS_HOST", "127.0.0.1")
+BUCKETS_DURACAO = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BUCKETS_BYTES = (16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# TIPOS DE MÉTRICA
+# ============================================================
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(nomes, valores, extra=""):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class Contador:
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *valores_rotulos, valor=1):
+        with self._lock:
+            self._valores[valores_rotulos] = self._valores.get(valores_rotulos, 0) + valor
+
+    def valor(self, *valores_rotulos):
+        return self._valores.get(valores_rotulos, 0)
+
+    def exportar(self):
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} counter"]
+        with self._lock:
+            for chave, valor in sorted(self._valores.items()):
+                linhas.append(f"{self.nome}{_rotulos(self.rotulos, chave)} {valor}")
+        return linhas
+
+
+class Histograma:
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_DURACAO):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, tuple(rotulos)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, *valores_rotulos):
+        with self._lock:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                serie = self._series[valores_rotulos] = [[0] * len(self.buckets), 0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self):
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} histogram"]
+        with self._lock:
+            for chave, (contagens, soma, total) in sorted(self._series.items()):
+                for limite, contagem in zip(self.buckets, contagens):
+                    le = 'le="%s"' % limite
+                    linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {contagem}")
+                le = 'le="+Inf"'
+                linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {total}")
+                linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, chave)} {soma}")
+                linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, chave)} {total}")
+        return linhas
+
+
+def _serie(nome, ajuda, amostras, tipo="gauge"):
+    """Linhas de uma métrica calculada na coleta, a partir de (dict_rotulos, valor)"""
+    linhas = [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}"]
+    for rotulos, valor in amostras:
+        linhas.append(f"{nome}{_rotulos(rotulos.keys(), rotulos.values())} {valor}")
+    return linhas
+
+
+# ============================================================
+# REGISTRO
+# ============================================================
+rerun_duracao = Histograma("hub_rerun_duracao_segundos", "Duração de cada rerun por página", ("pagina",))
+secao_duracao = Histograma("hub_secao_duracao_segundos", "Duração de cada seção instrumentada",
+                           ("pagina", "secao"))
+rerun_bytes = Histograma("hub_rerun_bytes_enviados", "Bytes enviados ao navegador por rerun",
+                         ("pagina",), buckets=BUCKETS_BYTES)
+cache_chamadas = Contador("hub_cache_chamadas_total", "Chamadas a funções com cache_resource_medido", ("funcao",))
+cache_falhas = Contador("hub_cache_falhas_total", "Chamadas que não acharam entrada no cache (miss)", ("funcao",))
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+@telemetria.assinar
+def _observar_evento(evento):
+    if "interrompido" in evento:
+        # Execução cortada por st.stop()/rerun: fora dos histogramas de latência
+        return
+    if evento["evento"] == "rerun":
+        rerun_duracao.observar(evento["duracao_s"], evento["pagina"])
+        if "bytes_enviados" in evento:
+            rerun_bytes.observar(evento["bytes_enviados"], evento["pagina"])
+    else:
+        secao_duracao.observar(evento["duracao_s"], evento["pagina"], evento["secao"])
+
+
+def registrar_dataset(nome, versao, atualizado_em, linhas=None):
+    """Informa a versão do dataset carregado e o instante (epoch) em que foi gerado"""
+    with _datasets_lock:
+        _datasets[nome] = {"versao": str(versao), "atualizado_em": atualizado_em, "linhas": linhas}
+
+
+def _cache_medido(cache_st, func, kwargs_cache):
+    def decorar(f):
+        arquivo = os.path.basename(inspect.getsourcefile(f) or "")
+        nome = f"{arquivo}:{f.__qualname__}" if arquivo else f.__qualname__
+
+        @functools.wraps(f)
+        def calcular(*args, **kwargs):
+            cache_falhas.inc(nome)
+            return f(*args, **kwargs)
+
+        cacheada = cache_st(**kwargs_cache)(calcular)
+
+        @functools.wraps(f)
+        def chamar(*args, **kwargs):
+            cache_chamadas.inc(nome)
+            return cacheada(*args, **kwargs)
+
+        chamar.clear = cacheada.clear
+        return chamar
+
+    return decorar(func) if func is not None else decorar
+
+
+def cache_resource_medido(func=None, **kwargs_cache):
+    """Equivalente a ``st.cache_resource`` que conta chamadas e falhas para o /metrics"""
+    return _cache_medido(st.cache_resource, func, kwargs_cache)
+
+
+# ============================================================
+# COLETA E EXPORTAÇÃO
+# ============================================================
+def rss_bytes():
+    """Memória residente do processo atual, em bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _sessoes_ativas():
+    # ``_session_mgr`` é interno do Streamlit: se mudar, a métrica some do /metrics
+    # em vez de derrubar a coleta
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return None
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return None
+
+
+def _estatisticas_cache():
+    """Entradas e bytes por função em cache, vindos do StatsManager do Streamlit"""
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return {}
+        estatisticas = Runtime.instance().stats_mgr.get_stats()
+    except Exception:
+        return {}
+    agrupado = {}
+    for stat in estatisticas:
+        chave = (stat.category_name, stat.cache_name)
+        entradas, total = agrupado.get(chave, (0, 0))
+        agrupado[chave] = (entradas + 1, total + stat.byte_length)
+    return agrupado
+
+
+def exportar():
+    """Texto completo do /metrics"""
+    linhas = []
+    for metrica in (rerun_duracao, secao_duracao, rerun_bytes, cache_chamadas, cache_falhas):
+        linhas.extend(metrica.exportar())
+
+    with cache_chamadas._lock:
+        funcoes = sorted(cache_chamadas._valores)
+    linhas.extend(_serie("hub_cache_acertos_total", "Chamadas atendidas pelo cache (hit)",
+                         [({"funcao": f[0]}, cache_chamadas.valor(*f) - cache_falhas.valor(*f)) for f in funcoes],
+                         tipo="counter"))
+
+    cache = _estatisticas_cache()
+    linhas.extend(_serie("hub_cache_entradas", "Entradas em cache por função",
+                         [({"tipo": t, "cache": c}, v[0]) for (t, c), v in sorted(cache.items())]))
+    linhas.extend(_serie("hub_cache_bytes", "Memória ocupada pelas entradas em cache",
+                         [({"tipo": t, "cache": c}, v[1]) for (t, c), v in sorted(cache.items())]))
+
+    agora = time.time()
+    with _datasets_lock:
+        datasets = sorted(_datasets.items())
+    linhas.extend(_serie("hub_dataset_info", "Versão do snapshot de dados carregado",
+                         [({"dataset": n, "versao": d["versao"]}, 1) for n, d in datasets]))
+    linhas.extend(_serie("hub_dataset_idade_segundos", "Idade do snapshot de dados carregado",
+                         [({"dataset": n}, round(agora - d["atualizado_em"], 3)) for n, d in datasets]))
+    linhas.extend(_serie("hub_dataset_linhas", "Linhas do dataset carregado",
+                         [({"dataset": n}, d["linhas"]) for n, d in datasets if d["linhas"] is not None]))
+
+    linhas.extend(_serie("hub_processo_rss_bytes", "Memória residente do processo", [({}, rss_bytes())]))
+    sessoes = _sessoes_ativas()
+    if sessoes is not None:
+        linhas.extend(_serie("hub_sessoes_ativas", "Sessões Streamlit ativas no processo", [({}, sessoes)]))
+    return "\n".join(linhas) + "\n"
+
+
+# ============================================================
+# SERVIDOR AUXILIAR
+# ============================================================
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corpo = exportar().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servidor = None
+_servidor_tentado = False
+_servidor_lock = threading.Lock()
+
+
+def iniciar_servidor():
+    """Sobe o servidor de /metrics uma única vez por processo"""
+    global _servidor, _servidor_tentado
+    if PORTA <= 0 or _servidor_tentado:
+        return _servidor
+    with _servidor_lock:
+        if _servidor_tentado:
+            return _servidor
+        _servidor_tentado = True
+        try:
+            _servidor = ThreadingHTTPServer((ENDERECO, PORTA), _HandlerMetricas)
+        except OSError:
+            logger.warning("Porta %s:%s indisponível; /metrics não será servido", ENDERECO, PORTA)
+            return None
+        _servidor.daemon_threads = True
+        threading.Thread(target=_servidor.serve_forever, name="hub-metricas", daemon=True).start()
+    return _servidor
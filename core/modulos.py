@@ -0,0 +1,29 @@
+"""Importação sob demanda dos módulos pesados.
+
+A partida do hub (hub.py e a Home) não carrega nenhum dos ``PESADOS``: o
+``import streamlit`` do servidor já traz o plotly.graph_objects, mas pandas,
+numpy, pyarrow e plotly.express custam segundos num processo frio. As páginas
+de dashboard carregam pandas ao abrir; o plotly.express só é importado quando
+um gráfico é montado na thread do script (os trabalhadores do pool já nascem
+com ele). ``benchmarks.partida`` mede o custo de importação de cada página e
+cobra o orçamento.
+"""
+import importlib
+
+PESADOS = ("pandas", "numpy", "pyarrow", "plotly.express")
+
+
+class _SobDemanda:
+    def __init__(self, nome):
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        return getattr(importlib.import_module(self._nome), atributo)
+
+    def __repr__(self):
+        return f"<módulo {self._nome} (sob demanda)>"
+
+
+def sob_demanda(nome):
+    """Módulo importado no primeiro acesso a um atributo: ``px = sob_demanda("plotly.express")``"""
+    return _SobDemanda(nome)
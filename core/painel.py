@@ -0,0 +1,280 @@
+"""Painéis declarativos: especificação das consultas e plano de execução compartilhado.
+
+Uma página declara num dicionário (``PAINEL_VENDAS`` em core/vendas.py,
+``PAINEL_PROJETOS`` em core/projetos.py) as medidas, os filtros, as consultas
+(dimensões + medidas) que alimentam KPIs e gráficos, e os gráficos. ``compilar``
+transforma as consultas num plano:
+
+- consultas com as mesmas dimensões viram um único groupby com a união das medidas;
+- medidas decomponíveis (soma, contagem, média) de um grão mais grosso são
+  reagregadas a partir do resultado de um grão mais fino do plano, sem varrer as
+  linhas de novo; distintos de uma coluna que é dimensão do grão fino também;
+- quando os filtros cabem no grão da tabela mensal (``mensal`` na especificação),
+  o que ela cobre é lido dela, inclusive distintos pelos esboços (core/distintos.py).
+
+Painéis novos declaram a especificação e ganham o plano sem código de agregação.
+"""
+import numpy as np
+import pandas as pd
+
+from core import distintos
+
+DECOMPONIVEIS = {"sum", "size", "count"}
+
+# Agregações parciais de cada medida; as parciais decomponíveis se somam entre grupos
+_PARCIAIS = {
+    "sum": lambda coluna: [(coluna, "sum")],
+    "size": lambda coluna: [(None, "size")],
+    "count": lambda coluna: [(coluna, "count")],
+    "mean": lambda coluna: [(coluna, "sum"), (coluna, "count")],
+    "nunique": lambda coluna: [(coluna, "nunique")],
+}
+
+_planos = {}
+
+
+def _nome(parcial):
+    coluna, funcao = parcial
+    return f"{funcao}({coluna or ''})"
+
+
+# ============================================================
+# FILTROS
+# ============================================================
+def _ativos(espec, selecoes):
+    """Filtros que restringem algo: ``opcoes`` vazio não filtra; ``periodo`` e ``intervalo`` sempre"""
+    return {
+        coluna: valor for coluna, valor in selecoes.items()
+        if espec["filtros"][coluna] != "opcoes" or len(valor) > 0
+    }
+
+
+def no_intervalo(datas, inicio, fim):
+    """Máscara das ``datas`` entre os dias ``inicio`` e ``fim``, com o dia final inteiro.
+
+    Mesma fronteira do índice de facetas (``opcoes_no_intervalo`` por dia).
+    """
+    inicio = pd.Timestamp(inicio).normalize()
+    fim = pd.Timestamp(fim).normalize() + pd.Timedelta(days=1)
+    return (datas >= inicio) & (datas < fim)
+
+
+def filtrar(df, espec, selecoes):
+    """Linhas (ou tabela mensal) que passam pelas ``selecoes`` ({coluna: valores ou (início, fim)})"""
+    mascara = pd.Series(True, index=df.index)
+    for coluna, valor in _ativos(espec, selecoes).items():
+        if espec["filtros"][coluna] == "intervalo":
+            mascara &= no_intervalo(df[coluna], *valor)
+        else:
+            mascara &= df[coluna].isin(valor)
+    return df[mascara]
+
+
+def cabe_no_mensal(espec, selecoes):
+    """Se todos os filtros ativos são dimensões da tabela mensal"""
+    return set(_ativos(espec, selecoes)) <= set(espec["mensal"]["dimensoes"])
+
+
+# ============================================================
+# COMPILAÇÃO
+# ============================================================
+def _no_mensal(mensal, parcial):
+    """Como a tabela mensal fornece a parcial: ``(operação, coluna)`` ou ``None``"""
+    coluna, funcao = parcial
+    if funcao == "nunique":
+        for nome, origem in mensal.get("distintos", {}).items():
+            if origem == coluna:
+                return "esbocos", nome
+        return ("nunique", coluna) if coluna in mensal["dimensoes"] else None
+    for nome, (origem, agregacao) in mensal["medidas"].items():
+        if agregacao == funcao and (funcao == "size" or origem == coluna):
+            return "sum", nome
+    return None
+
+
+def _derivavel(parcial, dimensoes_pai):
+    coluna, funcao = parcial
+    return funcao in DECOMPONIVEIS or (funcao == "nunique" and coluna in dimensoes_pai)
+
+
+class Plano:
+    """Passos de agregação de uma especificação, do grão mais fino ao mais grosso.
+
+    Para cada grão (tupla de dimensões): ``varrer`` são as parciais calculadas
+    sobre as linhas, ``derivar`` o grão mais fino e as parciais reagregadas dele
+    e ``mensal`` as parciais lidas da tabela mensal.
+    """
+
+    def __init__(self, espec, com_mensal):
+        self.espec = espec
+        mensal = espec.get("mensal") if com_mensal else None
+        graos = {}
+        for consulta in espec["consultas"].values():
+            parciais = graos.setdefault(tuple(consulta.get("por", ())), set())
+            for medida in consulta["medidas"]:
+                coluna, funcao = espec["medidas"][medida]
+                parciais.update(_PARCIAIS[funcao](coluna))
+
+        # Origem: grão coberto pela tabela mensal sai dela; senão decomponíveis vêm
+        # das linhas e distintos continuam na tabela mensal quando ela os tem
+        self.mensal, self.varrer, self.derivar = {}, {}, {}
+        for dimensoes, parciais in graos.items():
+            cobertas = set()
+            if mensal is not None and set(dimensoes) <= set(mensal["dimensoes"]):
+                cobertas = {p for p in parciais if _no_mensal(mensal, p) is not None}
+            if cobertas != parciais:
+                cobertas = {p for p in cobertas if p[1] not in DECOMPONIVEIS}
+                self.varrer[dimensoes] = parciais - cobertas
+            self.mensal[dimensoes] = cobertas
+
+        # Reagregação: do grão mais grosso ao mais fino, as parciais derivaveis sobem
+        # para o grão mais fino que também lê as linhas e que cobre mais delas
+        for dimensoes in sorted(self.varrer, key=len):
+            pais = [outro for outro in self.varrer if set(dimensoes) < set(outro)]
+            if not pais:
+                continue
+            pai = max(pais, key=lambda outro: (
+                sum(_derivavel(p, outro) for p in self.varrer[dimensoes]), -len(outro)))
+            subir = {p for p in self.varrer[dimensoes] if _derivavel(p, pai)}
+            if subir:
+                self.varrer[dimensoes] -= subir
+                self.varrer[pai] |= {p for p in subir if p[1] in DECOMPONIVEIS}
+                self.derivar[dimensoes] = (pai, subir)
+        self.graos = sorted(graos, key=len, reverse=True)
+
+
+def compilar(espec, com_mensal=False):
+    """Plano da especificação (em cache por nome do painel)"""
+    chave = (espec["nome"], com_mensal)
+    if chave not in _planos:
+        _planos[chave] = Plano(espec, com_mensal)
+    return _planos[chave]
+
+
+# ============================================================
+# EXECUÇÃO
+# ============================================================
+def _agregar(frame, dimensoes, colunas):
+    """Parciais por grupo de ``frame``; ``colunas`` é {nome: (coluna de origem, função)}.
+
+    Uma chamada ao groupby por função. Sem dimensões, listas de um valor (o total).
+    """
+    por_funcao = {}
+    for nome, (coluna, funcao) in colunas.items():
+        por_funcao.setdefault(funcao, []).append((nome, coluna))
+    grupos = frame.groupby(list(dimensoes), observed=True, dropna=False) if dimensoes else None
+    resultado = {}
+    for funcao, itens in por_funcao.items():
+        if grupos is None:
+            for nome, coluna in itens:
+                resultado[nome] = [len(frame) if funcao == "size" else frame[coluna].agg(funcao)]
+        elif funcao == "size":
+            tamanhos = grupos.size()
+            resultado.update((nome, tamanhos) for nome, _ in itens)
+        else:
+            valores = grupos[list(dict.fromkeys(coluna for _, coluna in itens))].agg(funcao)
+            resultado.update((nome, valores[coluna]) for nome, coluna in itens)
+    return resultado
+
+
+def _das_linhas(parciais):
+    return {_nome(p): p for p in parciais}
+
+
+def _reagregadas(parciais):
+    return {_nome(p): (p[0], "nunique") if p[1] == "nunique" else (_nome(p), "sum") for p in parciais}
+
+
+def _da_mensal(espec_mensal, parciais):
+    colunas = {}
+    for p in parciais:
+        operacao, coluna = _no_mensal(espec_mensal, p)
+        colunas[_nome(p)] = (coluna, distintos.contar if operacao == "esbocos" else operacao)
+    return colunas
+
+
+def _medidas(espec, consulta, tabela):
+    """Medidas da consulta a partir das parciais: {medida: Series}"""
+    valores = {}
+    for medida in consulta["medidas"]:
+        coluna, funcao = espec["medidas"][medida]
+        if funcao == "mean":
+            valores[medida] = tabela[_nome((coluna, "sum"))] / tabela[_nome((coluna, "count"))]
+        else:
+            valores[medida] = tabela[_nome(_PARCIAIS[funcao](coluna)[0])]
+    return valores
+
+
+def _montar(espec, consulta, tabela, df):
+    """Tabela final da consulta: medidas, ordem e nomes de exibição"""
+    dimensoes = list(consulta.get("por", ()))
+    valores = _medidas(espec, consulta, tabela)
+    distintas = [m for m in consulta["medidas"] if espec["medidas"][m][1] == "nunique"]
+
+    if not dimensoes:
+        # Consulta sem dimensões: dicionário de valores; distintos como ``Contagem``
+        valores = {medida: serie.iloc[0] for medida, serie in valores.items()}
+        for medida in distintas:
+            if not isinstance(valores[medida], distintos.Contagem):
+                valores[medida] = distintos.Contagem(valores[medida])
+        return valores
+
+    nomes = consulta.get("nomes", {})
+    colunas, nulos = {}, np.zeros(len(tabela), dtype=bool)
+    for posicao, dimensao in enumerate(dimensoes):
+        nivel = tabela.index.get_level_values(posicao)
+        if nivel.hasnans:
+            nulos |= nivel.isna()
+        colunas[nomes.get(dimensao, dimensao)] = nivel
+    for medida, serie in valores.items():
+        colunas[nomes.get(medida, medida)] = (serie.map(int) if medida in distintas else serie).to_numpy()
+    saida = pd.DataFrame(colunas)
+    if nulos.any():
+        # Grupos com dimensão nula ficam de fora, como no groupby padrão do pandas
+        saida = saida[~nulos].reset_index(drop=True)
+
+    if consulta.get("todas_categorias"):
+        dimensao = nomes.get(dimensoes[0], dimensoes[0])
+        categorias = df[dimensoes[0]].cat.categories
+        saida = saida.set_index(dimensao).reindex(categorias, fill_value=0).rename_axis(dimensao).reset_index()
+    if "ordem" in consulta:
+        coluna, crescente = consulta["ordem"]
+        saida = saida.sort_values(nomes.get(coluna, coluna), ascending=crescente, ignore_index=True)
+    return saida
+
+
+def executar(espec, df_f, mensal_f=None):
+    """Tabelas de todas as consultas da especificação: {nome da consulta: DataFrame}.
+
+    ``df_f`` são as linhas filtradas; ``mensal_f``, a tabela mensal com os
+    mesmos filtros, ou ``None`` se os filtros não cabem no grão dela. Consultas
+    sem dimensões devolvem um dicionário {medida: valor}.
+    """
+    plano = compilar(espec, mensal_f is not None)
+    resultados = {}
+    for dimensoes in plano.graos:
+        colunas = {}
+        if plano.varrer.get(dimensoes):
+            colunas.update(_agregar(df_f, dimensoes, _das_linhas(plano.varrer[dimensoes])))
+        if dimensoes in plano.derivar:
+            pai, parciais = plano.derivar[dimensoes]
+            colunas.update(_agregar(resultados[pai].reset_index(), dimensoes, _reagregadas(parciais)))
+        if plano.mensal.get(dimensoes):
+            da_mensal = _agregar(mensal_f, dimensoes, _da_mensal(espec["mensal"], plano.mensal[dimensoes]))
+            if dimensoes and colunas:
+                # Mesmos grupos, mas o índice vindo da tabela mensal pode ter outro tipo
+                indice = next(iter(colunas.values())).index
+                da_mensal = {nome: serie.reindex(indice) for nome, serie in da_mensal.items()}
+            colunas.update(da_mensal)
+        resultados[dimensoes] = pd.DataFrame(colunas)
+
+    return {
+        nome: _montar(espec, consulta, resultados[tuple(consulta.get("por", ()))], df_f)
+        for nome, consulta in espec["consultas"].items()
+    }
+
+
+def grafico(espec, tabelas, nome):
+    """``(função, tabela)`` do gráfico ``nome`` da especificação, para ``Esteira.plotly_chart``"""
+    consulta, funcao = espec["graficos"][nome]
+    return funcao, tabelas[consulta]
@@ -0,0 +1,121 @@
+"""Captura sob demanda de perfil de execução de uma página.
+
+Com ``HUB_PROFILE_TOKEN`` definido, acessar a página com ``?profile=<token>``
+arma o profiler para a sessão; a próxima execução da página selecionada roda sob
+o profiler e o resultado é gravado em ``<HUB_DATA_DIR>/perfis``. Sem o token
+configurado o hook não faz nada.
+
+Modos (``&profile_mode=``):
+- ``deterministico`` (padrão): cProfile, gera ``.prof`` e o top-N em ``.txt``
+- ``amostragem``: pyinstrument, gera o flame graph em ``.html`` e o top-N em ``.txt``
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from core.config import DATA_DIR, acesso_autorizado, env_int
+
+TOKEN = os.environ.get("HUB_PROFILE_TOKEN")
+DIRETORIO_PERFIS = os.path.join(DATA_DIR, "perfis")
+TOP_N = env_int("HUB_PROFILE_TOP", 30)
+CHAVE_SESSAO = "_perfil_armado"
+MODOS = ("deterministico", "amostragem")
+
+
+def _armar_se_solicitado():
+    """Consome o query param ?profile e arma a próxima execução da sessão"""
+    param = st.query_params.get("profile")
+    if param is None:
+        return
+    modo = st.query_params.get("profile_mode", "deterministico")
+    del st.query_params["profile"]
+    if "profile_mode" in st.query_params:
+        del st.query_params["profile_mode"]
+
+    if not acesso_autorizado(param, "HUB_PROFILE_TOKEN", exigir_token=True):
+        return
+    st.session_state[CHAVE_SESSAO] = modo if modo in MODOS else "deterministico"
+    st.toast("🔬 Profiler armado: a próxima execução desta página será perfilada.")
+
+
+def _nome_base(pagina, modo):
+    slug = re.sub(r"[^0-9A-Za-z]+", "-", pagina).strip("-").lower() or "pagina"
+    return os.path.join(DIRETORIO_PERFIS, f"{time.strftime('%Y%m%d_%H%M%S')}_{slug}_{modo}")
+
+
+def _salvar_cprofile(perfil, base):
+    perfil.dump_stats(base + ".prof")
+    saida = io.StringIO()
+    stats = pstats.Stats(perfil, stream=saida)
+    saida.write(f"=== Top {TOP_N} por tempo próprio (tottime) ===\n")
+    stats.sort_stats("tottime").print_stats(TOP_N)
+    saida.write(f"\n=== Top {TOP_N} por tempo acumulado (cumtime) ===\n")
+    stats.sort_stats("cumulative").print_stats(TOP_N)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(saida.getvalue())
+    return [base + ".prof", base + ".txt"]
+
+
+def _salvar_pyinstrument(perfil, base):
+    with open(base + ".html", "w", encoding="utf-8") as f:
+        f.write(perfil.output_html())
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(perfil.output_text(unicode=True, color=False, show_all=False))
+    return [base + ".html", base + ".txt"]
+
+
+@contextmanager
+def _perfilar(pagina, modo):
+    os.makedirs(DIRETORIO_PERFIS, exist_ok=True)
+    base = _nome_base(pagina, modo)
+
+    perfil = None
+    if modo == "amostragem":
+        try:
+            from pyinstrument import Profiler
+            perfil = Profiler(interval=0.001)
+        except ImportError:
+            modo = "deterministico"
+            base = _nome_base(pagina, modo)
+
+    if perfil is not None:
+        perfil.start()
+        try:
+            yield
+        finally:
+            perfil.stop()
+            arquivos = _salvar_pyinstrument(perfil, base)
+            st.sidebar.success("🔬 Perfil salvo:\n\n" + "\n\n".join(f"`{a}`" for a in arquivos))
+        return
+
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield
+    finally:
+        perfil.disable()
+        arquivos = _salvar_cprofile(perfil, base)
+        st.sidebar.success("🔬 Perfil salvo:\n\n" + "\n\n".join(f"`{a}`" for a in arquivos))
+
+
+@contextmanager
+def capturar_se_solicitado(pagina):
+    """Executa o bloco sob o profiler se a sessão estiver armada"""
+    if not TOKEN:
+        yield
+        return
+
+    modo = st.session_state.pop(CHAVE_SESSAO, None)
+    _armar_se_solicitado()
+    if modo is None:
+        yield
+        return
+
+    with _perfilar(pagina, modo):
+        yield
@@ -0,0 +1,356 @@
+"""Pool de processos para o cálculo pesado das páginas.
+
+O trabalho com pandas/plotly de uma página roda num pool limitado de processos
+(``HUB_WORKERS``, padrão núcleos - 1, até 4; ``0`` calcula na própria thread do script), para
+que uma sessão com um filtro caro não segure o GIL do servidor e atrase as
+outras. Os trabalhadores abrem o mesmo snapshot Arrow por memory-map, então os
+dados não são copiados entre processos: só os filtros vão e só os resultados
+pequenos (tabelas agregadas e especificações dos gráficos) voltam.
+
+Cancelamento: cada lote de tarefas (``Lote``) ocupa uma vaga com um contador de
+geração em memória compartilhada. Quando a sessão muda um filtro durante o
+cálculo, o Streamlit interrompe o script que está aguardando e a vaga é
+invalidada; o trabalhador percebe no próximo ``ponto_de_cancelamento()`` e
+abandona o cálculo antigo.
+"""
+import contextlib
+import functools
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturoPendente
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core.config import env_int
+
+# Um núcleo fica para o servidor; em máquina de um núcleo só, calcula inline
+TRABALHADORES = env_int("HUB_WORKERS", min(4, (os.cpu_count() or 1) - 1))
+MAX_PENDENTES = env_int("HUB_WORKERS_FILA", 2 * max(TRABALHADORES, 1))
+INTERVALO_ESPERA_S = 0.05
+# Espera máxima por uma vaga na fila; depois disso o lote calcula na thread do script
+ESPERA_VAGA_S = env_int("HUB_WORKERS_ESPERA_S", 10)
+CHAVE_SESSAO = "_processamento"
+CHAVE_EXECUCAO = "_processamento_execucao"
+MODULOS_PRE_CARREGADOS = ["pandas", "plotly.express", "core.graficos", "core.projetos", "core.vendas"]
+
+logger = logging.getLogger(__name__)
+
+
+class Cancelado(Exception):
+    """O cálculo foi abandonado porque a sessão pediu outro"""
+
+
+# ============================================================
+# LADO DO TRABALHADOR
+# ============================================================
+_geracoes = None          # geração vigente de cada vaga (memória compartilhada)
+_tarefa_atual = None      # (vaga, geracao) da tarefa em execução neste processo
+
+
+def _iniciar_trabalhador(geracoes):
+    global _geracoes
+    _geracoes = geracoes
+
+
+def _ceder_ao_streamlit():
+    # Acessar o session_state é um ponto de interrupção do Streamlit: se a sessão
+    # pediu rerun/stop, a exceção de controle é levantada aqui.
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        _ = CHAVE_SESSAO in st.session_state
+
+
+def _rodar(vaga, geracao, funcao, args):
+    global _tarefa_atual
+    _tarefa_atual = (vaga, geracao)
+    try:
+        ponto_de_cancelamento()
+        return funcao(*args)
+    finally:
+        _tarefa_atual = None
+
+
+def em_trabalhador():
+    return _geracoes is not None
+
+
+def ponto_de_cancelamento():
+    """Chamado entre etapas do cálculo: interrompe se a tarefa foi cancelada.
+
+    No trabalhador confere a geração da vaga; calculando na thread do script,
+    cede ao Streamlit, que interrompe o script se houver rerun pendente.
+    """
+    if _tarefa_atual is not None:
+        vaga, geracao = _tarefa_atual
+        if _geracoes[vaga] != geracao:
+            raise Cancelado()
+    else:
+        _ceder_ao_streamlit()
+
+
+@functools.lru_cache(maxsize=4)
+def _carregar_no_trabalhador(dataset, versao, colunas):
+    from core import snapshots
+
+    return snapshots.tabela_para_pandas(snapshots.ler_tabela(dataset, versao), colunas)
+
+
+def carregar(dataset, versao, colunas=None):
+    """DataFrame do snapshot, somente leitura, no processo em que o cálculo roda"""
+    from core import snapshots
+
+    colunas = tuple(colunas) if colunas is not None else None
+    if em_trabalhador():
+        return _carregar_no_trabalhador(dataset, versao, colunas)
+    return snapshots.carregar(dataset, versao, colunas)
+
+
+@functools.lru_cache(maxsize=8)
+def _agregado_no_trabalhador(dataset, versao, nome):
+    from core import snapshots
+
+    return snapshots.ler_agregado(dataset, versao, nome)
+
+
+def agregado(dataset, versao, nome):
+    """Agregado do snapshot (ex.: tabela mensal) no processo em que o cálculo roda"""
+    from core import snapshots
+
+    if em_trabalhador():
+        return _agregado_no_trabalhador(dataset, versao, nome)
+    return snapshots.agregado(dataset, versao, nome)
+
+
+# ============================================================
+# LADO DO SERVIDOR
+# ============================================================
+_pool = None
+_pool_lock = threading.Lock()
+_main_lock = threading.Lock()
+_vagas = queue.Queue()
+_geracoes_servidor = None
+
+
+def _contexto():
+    """``forkserver`` onde houver (trabalhadores nascem com pandas/plotly já
+    importados pelo servidor de fork); senão, ``spawn``."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    contexto = multiprocessing.get_context("forkserver")
+    contexto.set_forkserver_preload(MODULOS_PRE_CARREGADOS)
+    return contexto
+
+
+@contextlib.contextmanager
+def _main_neutro():
+    """Troca o ``__main__`` por um módulo vazio enquanto processos podem nascer.
+
+    Durante o script o Streamlit coloca a página em ``sys.modules["__main__"]``,
+    e o multiprocessing reexecutaria a página inteira em cada trabalhador novo.
+    O ProcessPoolExecutor só cria processos na construção e no ``submit``.
+    """
+    with _main_lock:
+        original = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = original
+
+
+def _obter_pool():
+    global _pool, _geracoes_servidor
+    with _pool_lock:
+        if _pool is None:
+            contexto = _contexto()
+            if _geracoes_servidor is None:
+                _geracoes_servidor = contexto.Array("L", MAX_PENDENTES, lock=False)
+                for vaga in range(MAX_PENDENTES):
+                    _vagas.put(vaga)
+            with _main_neutro():
+                _pool = ProcessPoolExecutor(max_workers=TRABALHADORES, mp_context=contexto,
+                                            initializer=_iniciar_trabalhador, initargs=(_geracoes_servidor,))
+        return _pool
+
+
+def pool_dedicado(trabalhadores):
+    """Pool próprio para uso fora do servidor (relatórios em lote, ``core.relatorios``).
+
+    Mesmos trabalhadores do pool das páginas (pré-carregados, snapshot por
+    memory-map, ``carregar`` em cache por processo), sem vagas nem cancelamento.
+    """
+    # Sem vagas: as gerações só são consultadas por tarefas enviadas via ``Lote``
+    return ProcessPoolExecutor(max_workers=trabalhadores, mp_context=_contexto(),
+                               initializer=_iniciar_trabalhador, initargs=((),))
+
+
+def _descartar_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Tarefa:
+    def __init__(self, vaga, execucao):
+        self.vaga = vaga
+        self.execucao = execucao
+        self.ativa = True
+        self.futuros = []
+        _geracoes_servidor[vaga] += 1
+        self.geracao = _geracoes_servidor[vaga]
+
+    def cancelar(self):
+        if not self.ativa:
+            return
+        self.ativa = False
+        for futuro in self.futuros:
+            futuro.cancel()
+        _geracoes_servidor[self.vaga] += 1
+        _vagas.put(self.vaga)
+
+
+def _reservar_vaga():
+    """Espera uma vaga livre no pool (fila limitada), cedendo ao Streamlit enquanto isso.
+
+    Devolve ``None`` se nenhuma vaga abrir em ``ESPERA_VAGA_S``.
+    """
+    limite = time.monotonic() + ESPERA_VAGA_S
+    while True:
+        try:
+            return _vagas.get(timeout=INTERVALO_ESPERA_S)
+        except queue.Empty:
+            if time.monotonic() >= limite:
+                return None
+            _ceder_ao_streamlit()
+
+
+def nova_execucao():
+    """Marca o início de uma execução do script na sessão (hub.py, a cada rerun).
+
+    Tarefas de execuções anteriores que ainda ocupem vagas são canceladas pelo
+    próximo ``Lote`` da sessão.
+    """
+    st.session_state[CHAVE_EXECUCAO] = st.session_state.get(CHAVE_EXECUCAO, 0) + 1
+
+
+def _execucao_atual():
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(CHAVE_EXECUCAO)
+
+
+def _tarefas_da_sessao():
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return set()
+    if CHAVE_SESSAO not in st.session_state:
+        st.session_state[CHAVE_SESSAO] = set()
+    return st.session_state[CHAVE_SESSAO]
+
+
+class Lote:
+    """Cálculos de uma execução do script enviados juntos ao pool.
+
+    O lote ocupa uma vaga da fila e suas chamadas rodam em paralelo nos
+    trabalhadores; cancelá-lo abandona todas. Use como gerenciador de contexto:
+    ao sair, o que não terminou é cancelado e a vaga é devolvida.
+    """
+
+    def __init__(self):
+        self._chamadas = []      # (funcao, args, futuro); sem futuro calcula inline
+        self._pool = None
+        self._tarefa = None
+        self._pendentes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _iniciar(self):
+        # Sobras de um script anterior da mesma sessão não têm mais quem as espere
+        self._pendentes = _tarefas_da_sessao()
+        execucao = _execucao_atual()
+        for antiga in [t for t in self._pendentes if t.execucao != execucao]:
+            antiga.cancelar()
+            self._pendentes.discard(antiga)
+
+        self._pool = _obter_pool()
+        vaga = _reservar_vaga()
+        if vaga is None:
+            # Fila cheia por tempo demais: este lote segue na thread do script
+            logger.warning("Nenhuma vaga no pool em %ss; calculando na thread do script", ESPERA_VAGA_S)
+            self._pool = False
+            return
+        self._tarefa = _Tarefa(vaga, execucao)
+        self._pendentes.add(self._tarefa)
+
+    def enviar(self, funcao, *args):
+        """Agenda ``funcao(*args)`` e devolve o índice para ``resultado()``.
+
+        ``funcao`` precisa ser importável (definida em módulo) e os argumentos e o
+        resultado, serializáveis.
+        """
+        futuro = None
+        if TRABALHADORES > 0 and self._pool is not False and self._tarefa is None:
+            self._iniciar()
+        if self._pool:
+            try:
+                with _main_neutro():
+                    futuro = self._pool.submit(_rodar, self._tarefa.vaga, self._tarefa.geracao, funcao, args)
+                self._tarefa.futuros.append(futuro)
+            except BrokenProcessPool:
+                self._pool_quebrado(funcao)
+        self._chamadas.append((funcao, args, futuro))
+        return len(self._chamadas) - 1
+
+    def resultado(self, indice):
+        """Espera o resultado da chamada ``indice``, atendendo reruns da sessão"""
+        funcao, args, futuro = self._chamadas[indice]
+        if futuro is None:
+            return funcao(*args)
+        try:
+            while True:
+                try:
+                    return futuro.result(timeout=INTERVALO_ESPERA_S)
+                except FuturoPendente:
+                    _ceder_ao_streamlit()
+        except BrokenProcessPool:
+            self._pool_quebrado(funcao)
+            return funcao(*args)
+
+    def _pool_quebrado(self, funcao):
+        # Um trabalhador morreu (ex.: falta de memória): o pool é recriado no
+        # próximo lote e o restante deste segue na thread do script
+        if self._pool:
+            _descartar_pool(self._pool)
+            logger.warning("Pool de processos quebrado; calculando %s na thread do script",
+                           getattr(funcao, "__qualname__", funcao))
+        self._pool = False
+
+    def fechar(self):
+        # Concluído ou não (rerun/stop da sessão, erro), a vaga é liberada e
+        # qualquer cálculo ainda em andamento nela é abandonado
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+            self._pendentes.discard(self._tarefa)
+
+
+def executar(funcao, *args):
+    """Roda ``funcao(*args)`` no pool e devolve o resultado.
+
+    Enquanto espera, a thread do script continua atendendo pedidos de rerun da
+    sessão; nesse caso a tarefa é cancelada.
+    """
+    with Lote() as lote:
+        return lote.resultado(lote.enviar(funcao, *args))
@@ -0,0 +1,464 @@
+"""Cálculos da página de Projetos: cadeia de filtros, KPIs, agregações e gráficos.
+
+Funções puras sobre o snapshot de tarefas, sem Streamlit: rodam num processo do
+pool (``core.processamento``) ou na thread do script quando o pool está
+desligado. Os filtros chegam como dicionário simples e o resultado traz só
+valores e tabelas pequenas; os gráficos são montados a partir delas pelas
+funções ``grafico_*``, em paralelo (``core.graficos.Esteira``).
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from core import modulos, painel, processamento, ranking
+from core.dados import EQUIPES_PESSOAS
+from core.snapshots import MENSAL_TAREFAS
+
+px = modulos.sob_demanda("plotly.express")
+
+HORAS_MES_REFERENCIA = 176
+COLUNAS_ANALISE = ("tarefa", "responsavel", "duracao", "data_conclusao", "equipe",
+                   "ano_mes", "dias_atraso", "no_prazo", "faixa_duracao")
+
+
+# ============================================================
+# FILTROS
+# ============================================================
+def filtros_padrao(**valores):
+    """Dicionário de filtros da página; chaves omitidas ficam sem filtro"""
+    filtros = {
+        "equipes": [],
+        "meses": [],
+        "intervalo": None,        # (data_inicio, data_fim) quando o período é por datas
+        "responsaveis": [],
+        "apenas_atrasadas": False,
+        "faixas_duracao": [],
+    }
+    filtros.update(valores)
+    return filtros
+
+
+def _pessoas_das_equipes(equipes):
+    pessoas = []
+    for eq in equipes:
+        pessoas.extend(EQUIPES_PESSOAS[eq])
+    return pessoas
+
+
+def filtrar_periodo(df, filtros):
+    if filtros["intervalo"] is not None:
+        return df[painel.no_intervalo(df["data_conclusao"], *filtros["intervalo"])]
+    if len(filtros["meses"]) > 0:
+        return df[df["ano_mes"].isin(filtros["meses"])]
+    return df
+
+
+def responsaveis_disponiveis(indice, filtros):
+    """Responsáveis com tarefas no período, restritos às equipes selecionadas.
+
+    Consulta o índice de facetas do snapshot (``core.facetas``), sem varrer as linhas.
+    """
+    if filtros["intervalo"] is not None:
+        inicio, fim = (pd.Timestamp(d).date().isoformat() for d in filtros["intervalo"])
+        pessoas = indice.opcoes_no_intervalo("responsavel", "dia", inicio, fim)
+    else:
+        pessoas = indice.opcoes("responsavel", "ano_mes", filtros["meses"])
+    if len(filtros["equipes"]) == 0:
+        return pessoas
+    pessoas_equipes_sel = set(_pessoas_das_equipes(filtros["equipes"]))
+    return [u for u in pessoas if u in pessoas_equipes_sel]
+
+
+def filtrar(df, filtros):
+    df_f = filtrar_periodo(df, filtros)
+
+    # Filtro por equipe (usando o mapeamento)
+    if len(filtros["equipes"]) > 0:
+        df_f = df_f[df_f["responsavel"].isin(_pessoas_das_equipes(filtros["equipes"]))]
+
+    # Filtro por pessoas específicas
+    if len(filtros["responsaveis"]) > 0:
+        df_f = df_f[df_f["responsavel"].isin(filtros["responsaveis"])]
+
+    # Outros filtros
+    if filtros["apenas_atrasadas"]:
+        df_f = df_f[df_f["dias_atraso"] > 0]
+    if len(filtros["faixas_duracao"]) > 0:
+        df_f = df_f[df_f["faixa_duracao"].isin(filtros["faixas_duracao"])]
+    return df_f
+
+
+def filtrar_mensal(mensal, filtros):
+    """Os filtros de ``filtrar`` aplicados à tabela mensal (ver core/mensal.py).
+
+    Devolve ``None`` quando o período é um intervalo de datas, que não cabe no grão mensal.
+    """
+    if filtros["intervalo"] is not None:
+        return None
+    m = mensal
+    if len(filtros["meses"]) > 0:
+        m = m[m["ano_mes"].isin(filtros["meses"])]
+    if len(filtros["equipes"]) > 0:
+        m = m[m["responsavel"].isin(_pessoas_das_equipes(filtros["equipes"]))]
+    if len(filtros["responsaveis"]) > 0:
+        m = m[m["responsavel"].isin(filtros["responsaveis"])]
+    if filtros["apenas_atrasadas"]:
+        m = m[m["atrasada"]]
+    if len(filtros["faixas_duracao"]) > 0:
+        m = m[m["faixa_duracao"].isin(filtros["faixas_duracao"])]
+    return m
+
+
+# ============================================================
+# KPIs E BLOCOS DE CADA ABA
+# ============================================================
+def kpis(indicadores):
+    total_tarefas = indicadores["linhas"]
+    total_horas = indicadores["horas"]
+    capacidade_total = int(indicadores["pessoas"]) * int(indicadores["meses"]) * HORAS_MES_REFERENCIA
+    return {
+        "total_tarefas": total_tarefas,
+        "total_horas": total_horas,
+        "pessoas": indicadores["pessoas"],
+        "atraso_medio": indicadores["atraso_medio"],
+        "taxa_pontualidade": (indicadores["no_prazo"] / total_tarefas * 100) if total_tarefas > 0 else 0,
+        "ocupacao_global": (total_horas / capacidade_total * 100) if capacidade_total > 0 else np.nan,
+    }
+
+
+def _visao_geral(df_f, tabelas, estado):
+    # Horas por equipe
+    prod_eq = tabelas["equipe"].sort_values("duracao", ascending=False, ignore_index=True)
+
+    # Evolução mensal
+    evolucao = tabelas["mes"][["ano_mes", "duracao", "tarefas"]].rename(columns={"tarefas": "qtd_tarefas"})
+
+    # Distribuição por faixa de duração
+    return {"prod_eq": prod_eq[["equipe", "duracao", "qtd_tarefas"]], "evolucao": evolucao,
+            "dist_duracao": tabelas["faixa_duracao"]}
+
+
+def ranking_pessoas(df_f, n=15):
+    """Top ``n`` colaboradores por horas, por tarefas e por horas/tarefa"""
+    por_pessoa = df_f.groupby("responsavel", observed=True).agg(
+        duracao=("duracao", "sum"), tarefas=("tarefa", "count"), linhas=("responsavel", "size"),
+    )
+    horas_user = ranking.top_n(por_pessoa["duracao"], n).reset_index()
+    horas_user.columns = ["Responsável", "Total de Horas"]
+    tasks_user = ranking.top_n(por_pessoa["linhas"], n).reset_index()
+    tasks_user.columns = ["Responsável", "Total de Tarefas"]
+
+    # Eficiência (horas/tarefa)
+    horas_por_tarefa = por_pessoa["duracao"] / por_pessoa["tarefas"]
+    eficiencia = por_pessoa.loc[ranking.top_n(horas_por_tarefa, n).index, ["duracao", "tarefas"]].reset_index()
+    eficiencia.columns = ["Responsável", "Total de Horas", "Total de Tarefas"]
+    eficiencia["Horas por Tarefa"] = eficiencia["Total de Horas"] / eficiencia["Total de Tarefas"]
+    return {"horas_user": horas_user, "tasks_user": tasks_user, "eficiencia": eficiencia}
+
+
+def ranking_pontualidade(df_f, n=10, minimo_tarefas=5):
+    """Top ``n`` colaboradores por taxa de pontualidade (com ao menos ``minimo_tarefas``)"""
+    por_pessoa = df_f.groupby("responsavel", observed=True).agg(
+        no_prazo=("no_prazo", "sum"), linhas=("no_prazo", "size"), tarefas=("tarefa", "count"),
+    )
+    por_pessoa = por_pessoa[por_pessoa["tarefas"] >= minimo_tarefas]
+    taxa = por_pessoa["no_prazo"] / por_pessoa["linhas"] * 100
+    pont_user = pd.DataFrame({"Taxa de Pontualidade (%)": taxa, "Total de Tarefas": por_pessoa["tarefas"]})
+    pont_user = pont_user.loc[ranking.top_n(taxa, n).index].rename_axis("Responsável").reset_index()
+    return {"pont_user": pont_user}
+
+
+def _analise_por_pessoa(df_f, tabelas, estado):
+    rankings = ranking.em_cache("pessoas", estado, lambda: ranking_pessoas(df_f))
+    horas_user = rankings["horas_user"]
+    return {
+        "horas_user": horas_user, "tasks_user": rankings["tasks_user"], "eficiencia": rankings["eficiencia"],
+        "mais_produtivo": (horas_user["Responsável"].iloc[0], horas_user["Total de Horas"].iloc[0]),
+    }
+
+
+def _tempo_e_prazo(df_f, tabelas, estado):
+    # Distribuição de atraso (o histograma precisa das linhas)
+    atrasos = df_f[["dias_atraso"]]
+
+    # Taxa de pontualidade por equipe
+    por_equipe = tabelas["equipe"]
+    pont_eq = pd.DataFrame({
+        "Equipe": por_equipe["equipe"],
+        "Taxa de Pontualidade (%)": por_equipe["no_prazo"] / por_equipe["qtd_tarefas"] * 100,
+    })
+
+    # Top 10 pessoas mais pontuais
+    pont_user = ranking.em_cache("pontualidade", estado, lambda: ranking_pontualidade(df_f))["pont_user"]
+
+    melhor_pont = pont_eq.sort_values("Taxa de Pontualidade (%)", ascending=False).iloc[0]
+    return {
+        "atrasos": atrasos, "pont_eq": pont_eq, "pont_user": pont_user,
+        "melhor_pont": (melhor_pont["Equipe"], melhor_pont["Taxa de Pontualidade (%)"]),
+    }
+
+
+def _carga_de_trabalho(df_f, tabelas, estado):
+    # Heatmap
+    user_month = tabelas["carga"]
+    pivot_carga = (
+        user_month.pivot(index="responsavel", columns="ano_mes", values="duracao")
+        .fillna(0).sort_index().sort_index(axis=1)
+    )
+
+    # Ocupação da capacidade
+    user_month = user_month.copy()
+    user_month["ocupacao_mes"] = user_month["duracao"] / HORAS_MES_REFERENCIA * 100
+    ocupacao_user = user_month.groupby("responsavel", observed=True)["ocupacao_mes"].mean().reset_index()
+    ocupacao_user.columns = ["Responsável", "Ocupação Média (%)"]
+    ocupacao_user = ocupacao_user.sort_values("Ocupação Média (%)", ascending=False)
+
+    return {
+        "pivot_carga": pivot_carga, "ocupacao_user": ocupacao_user,
+        "qtd_sobrecarga": int((ocupacao_user["Ocupação Média (%)"] > 120).sum()),
+    }
+
+
+def _tendencias(df_f, tabelas, estado):
+    por_mes = tabelas["mes"]
+    # Evolução da pontualidade
+    pont_mes = pd.DataFrame({
+        "Período": por_mes["ano_mes"],
+        "Taxa de Pontualidade (%)": por_mes["no_prazo"] / por_mes["linhas"] * 100,
+    })
+
+    # Produtividade média (tarefas por pessoa por mês)
+    prod_mes = por_mes[["ano_mes", "tarefas", "pessoas"]].copy()
+    prod_mes["tarefas_por_pessoa"] = prod_mes["tarefas"] / prod_mes["pessoas"]
+    prod_mes.columns = ["Período", "Total de Tarefas", "Total de Pessoas", "Tarefas por Pessoa"]
+
+    # Correlação: duração x atraso (a dispersão precisa das linhas)
+    return {
+        "pont_mes": pont_mes, "prod_mes": prod_mes,
+        "dispersao": df_f[["duracao", "dias_atraso", "equipe"]],
+        "correlacao": df_f[["duracao", "dias_atraso"]].corr().iloc[0, 1],
+    }
+
+
+BLOCOS = {
+    "aba Visão Geral": _visao_geral,
+    "aba Análise por Pessoa": _analise_por_pessoa,
+    "aba Tempo & Prazo": _tempo_e_prazo,
+    "aba Carga de Trabalho": _carga_de_trabalho,
+    "aba Tendências": _tendencias,
+}
+
+
+# ============================================================
+# GRÁFICOS (montados a partir das tabelas dos blocos, ver core/graficos.py)
+# ============================================================
+def grafico_producao_equipe(prod_eq):
+    fig_eq = make_subplots(specs=[[{"secondary_y": True}]])
+    fig_eq.add_trace(go.Bar(x=prod_eq["equipe"], y=prod_eq["duracao"],
+                            name="Horas Produzidas", marker_color='lightblue'))
+    fig_eq.add_trace(go.Scatter(x=prod_eq["equipe"], y=prod_eq["qtd_tarefas"],
+                                name="Quantidade de Tarefas",
+                                mode='lines+markers', marker_color='orange'), secondary_y=True)
+    fig_eq.update_layout(title="Produção por Equipe", height=400, hovermode='x unified')
+    fig_eq.update_xaxes(title_text="Equipe")
+    fig_eq.update_yaxes(title_text="Horas Produzidas", secondary_y=False)
+    fig_eq.update_yaxes(title_text="Quantidade de Tarefas", secondary_y=True)
+    return fig_eq
+
+
+def grafico_evolucao_mensal(evolucao):
+    fig_ev = make_subplots(specs=[[{"secondary_y": True}]])
+    fig_ev.add_trace(go.Bar(x=evolucao["ano_mes"], y=evolucao["duracao"],
+                            name="Horas Produzidas", marker_color='lightgreen'))
+    fig_ev.add_trace(go.Scatter(x=evolucao["ano_mes"], y=evolucao["qtd_tarefas"],
+                                name="Quantidade de Tarefas",
+                                mode='lines+markers', marker_color='red'), secondary_y=True)
+    fig_ev.update_layout(title="Evolução Mensal da Produção", height=400, hovermode='x unified')
+    fig_ev.update_xaxes(title_text="Período (Ano-Mês)")
+    fig_ev.update_yaxes(title_text="Horas Produzidas", secondary_y=False)
+    fig_ev.update_yaxes(title_text="Quantidade de Tarefas", secondary_y=True)
+    return fig_ev
+
+
+def grafico_faixa_duracao(dist_duracao):
+    return px.pie(dist_duracao, values="quantidade", names="faixa_duracao",
+                  title="Tarefas por Faixa de Duração",
+                  labels={"faixa_duracao": "Faixa de Duração", "quantidade": "Quantidade de Tarefas"})
+
+
+def grafico_horas_por_pessoa(horas_user):
+    fig_hu = px.bar(horas_user, y="Responsável", x="Total de Horas", orientation="h",
+                    title="Top 15 - Horas Produzidas", color="Total de Horas",
+                    color_continuous_scale="Blues",
+                    labels={"Total de Horas": "Horas Produzidas", "Responsável": "Colaborador"})
+    fig_hu.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_hu
+
+
+def grafico_tarefas_por_pessoa(tasks_user):
+    fig_tu = px.bar(tasks_user, y="Responsável", x="Total de Tarefas", orientation="h",
+                    title="Top 15 - Quantidade de Tarefas", color="Total de Tarefas",
+                    color_continuous_scale="Greens",
+                    labels={"Total de Tarefas": "Tarefas Concluídas", "Responsável": "Colaborador"})
+    fig_tu.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_tu
+
+
+def grafico_eficiencia(eficiencia):
+    fig_ef = px.bar(eficiencia, y="Responsável", x="Horas por Tarefa", orientation="h",
+                    title="Média de Horas por Tarefa (Top 15)", color="Horas por Tarefa",
+                    color_continuous_scale="Oranges",
+                    labels={"Horas por Tarefa": "Média de Horas/Tarefa", "Responsável": "Colaborador"})
+    fig_ef.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_ef
+
+
+def grafico_distribuicao_atraso(atrasos):
+    fig_hist = px.histogram(atrasos, x="dias_atraso", nbins=30,
+                           title="Distribuição de Atraso nas Entregas",
+                           color_discrete_sequence=['indianred'],
+                           labels={"dias_atraso": "Dias de Atraso (negativo = adiantado)",
+                                   "count": "Quantidade de Tarefas"})
+    fig_hist.add_vline(x=0, line_dash="dash", line_color="green",
+                      annotation_text="Prazo Exato", annotation_position="top")
+    return fig_hist
+
+
+def grafico_pontualidade_equipe(pont_eq):
+    fig_pont = px.bar(pont_eq, x="Equipe", y="Taxa de Pontualidade (%)",
+                     title="Taxa de Pontualidade por Equipe",
+                     color="Taxa de Pontualidade (%)", color_continuous_scale="RdYlGn",
+                     labels={"Equipe": "Equipe", "Taxa de Pontualidade (%)": "Pontualidade (%)"})
+    fig_pont.add_hline(y=80, line_dash="dash", line_color="orange",
+                      annotation_text="Meta: 80%", annotation_position="right")
+    return fig_pont
+
+
+def grafico_mais_pontuais(pont_user):
+    fig_top_pont = px.bar(pont_user, y="Responsável", x="Taxa de Pontualidade (%)",
+                         orientation="h", title="Top 10 Mais Pontuais",
+                         color="Taxa de Pontualidade (%)", color_continuous_scale="Greens",
+                         labels={"Taxa de Pontualidade (%)": "Pontualidade (%)",
+                                "Responsável": "Colaborador"})
+    fig_top_pont.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_top_pont
+
+
+def grafico_heatmap_carga(pivot_carga):
+    return px.imshow(pivot_carga, aspect="auto",
+                     labels=dict(x="Período (Ano-Mês)", y="Colaborador", color="Horas Trabalhadas"),
+                     title="Heatmap de Carga de Trabalho (Horas por Colaborador x Mês)",
+                     color_continuous_scale="YlOrRd")
+
+
+def grafico_ocupacao(ocupacao_user):
+    fig_oc = px.bar(ocupacao_user, y="Responsável", x="Ocupação Média (%)", orientation="h",
+                   title="Ocupação Média da Capacidade por Colaborador",
+                   color="Ocupação Média (%)", color_continuous_scale="RdYlGn_r",
+                   labels={"Ocupação Média (%)": "Ocupação (%)", "Responsável": "Colaborador"})
+    fig_oc.add_vline(x=100, line_dash="dash", line_color="red",
+                    annotation_text="100% Capacidade", annotation_position="top")
+    fig_oc.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_oc
+
+
+def grafico_tendencia_pontualidade(pont_mes):
+    fig_tend_pont = px.line(pont_mes, x="Período", y="Taxa de Pontualidade (%)",
+                           title="Evolução da Pontualidade ao Longo do Tempo",
+                           markers=True,
+                           labels={"Período": "Período (Ano-Mês)",
+                                  "Taxa de Pontualidade (%)": "Pontualidade (%)"})
+    fig_tend_pont.add_hline(y=80, line_dash="dash", line_color="green",
+                           annotation_text="Meta: 80%", annotation_position="right")
+    return fig_tend_pont
+
+
+def grafico_produtividade(prod_mes):
+    return px.line(prod_mes, x="Período", y="Tarefas por Pessoa",
+                   title="Produtividade Média (Tarefas por Pessoa por Mês)",
+                   markers=True,
+                   labels={"Período": "Período (Ano-Mês)",
+                          "Tarefas por Pessoa": "Média de Tarefas/Pessoa"})
+
+
+def grafico_duracao_atraso(dispersao):
+    fig_scatter = px.scatter(dispersao, x="duracao", y="dias_atraso",
+                            color="equipe", size="duracao",
+                            title="Relação entre Duração da Tarefa e Dias de Atraso",
+                            opacity=0.6,
+                            labels={"duracao": "Duração da Tarefa (horas)",
+                                   "dias_atraso": "Dias de Atraso",
+                                   "equipe": "Equipe"})
+    fig_scatter.add_hline(y=0, line_dash="dash", line_color="gray",
+                         annotation_text="Sem Atraso", annotation_position="left")
+    return fig_scatter
+
+
+# ============================================================
+# PAINEL
+# ============================================================
+PAINEL_PROJETOS = {
+    "nome": "projetos",
+    "mensal": MENSAL_TAREFAS,
+    "medidas": {
+        "linhas": ("no_prazo", "size"),
+        "tarefas": ("tarefa", "count"),
+        "horas": ("duracao", "sum"),
+        "no_prazo": ("no_prazo", "sum"),
+        "atraso_medio": ("dias_atraso", "mean"),
+        "pessoas": ("responsavel", "nunique"),
+        "meses": ("ano_mes", "nunique"),
+    },
+    "consultas": {
+        "kpis": {"medidas": ["linhas", "horas", "no_prazo", "atraso_medio", "pessoas", "meses"]},
+        "mes": {
+            "por": ["ano_mes"], "medidas": ["horas", "tarefas", "linhas", "no_prazo", "pessoas"],
+            "nomes": {"horas": "duracao"},
+        },
+        "equipe": {
+            "por": ["equipe"], "medidas": ["horas", "linhas", "no_prazo"],
+            "nomes": {"horas": "duracao", "linhas": "qtd_tarefas"},
+        },
+        "faixa_duracao": {
+            "por": ["faixa_duracao"], "medidas": ["linhas"], "todas_categorias": True,
+            "nomes": {"linhas": "quantidade"},
+        },
+        "carga": {"por": ["responsavel", "ano_mes"], "medidas": ["horas"], "nomes": {"horas": "duracao"}},
+    },
+}
+
+
+# ============================================================
+# CÁLCULO COMPLETO
+# ============================================================
+def calcular(versao, filtros):
+    """Filtra o snapshot e calcula KPIs e todos os blocos das abas.
+
+    Devolve ``{"vazio": True}`` se nada passar pelos filtros; senão os KPIs,
+    um dicionário de tabelas por bloco e ``tempos`` com a duração de cada etapa.
+    """
+    tempos = []
+    inicio = time.perf_counter()
+    df_f = filtrar(processamento.carregar("tarefas", versao, COLUNAS_ANALISE), filtros)
+    tempos.append(("filtros", time.perf_counter() - inicio))
+    if df_f.empty:
+        return {"vazio": True, "tempos": tempos}
+
+    # Agregações do painel num plano só: da tabela mensal do snapshot quando os filtros cabem nela
+    inicio = time.perf_counter()
+    mensal_f = filtrar_mensal(processamento.agregado("tarefas", versao, "mensal"), filtros)
+    tabelas = painel.executar(PAINEL_PROJETOS, df_f, mensal_f)
+    resultado = {"vazio": False, "kpis": kpis(tabelas["kpis"]), "tempos": tempos}
+    tempos.append(("agregacoes", time.perf_counter() - inicio))
+
+    # Rankings ficam em cache por estado de filtro (core/ranking.py)
+    estado = ranking.chave(versao, filtros)
+    for nome, bloco in BLOCOS.items():
+        processamento.ponto_de_cancelamento()
+        inicio = time.perf_counter()
+        resultado[nome] = bloco(df_f, tabelas, estado)
+        tempos.append((nome, time.perf_counter() - inicio))
+    return resultado
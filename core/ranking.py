@@ -0,0 +1,94 @@
+"""Rankings das páginas: top-N por seleção parcial, curva ABC vetorizada e cache.
+
+Os gráficos de ranking mostram poucas linhas (top 10/15) de tabelas que podem
+ter dezenas de milhares de entidades (clientes, colaboradores). ``top_n``
+separa os N maiores com ``np.argpartition`` e só ordena esses; empates são
+desfeitos pela ordem do índice (a ordem dos grupos), de forma estável.
+
+Os rankings dependem só dos dados filtrados, então ficam num cache LRU por
+estado de filtro (``em_cache``), compartilhado pelas sessões do processo.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.config import env_int
+
+MAX_RANKINGS = env_int("HUB_RANKING_CACHE", 256)
+LIMITES_ABC = (80, 95)
+CLASSES_ABC = ("A (0-80%)", "B (80-95%)", "C (95-100%)")
+
+
+# ============================================================
+# TOP-N E CURVA ABC
+# ============================================================
+def top_n(valores, n, crescente=False):
+    """Os ``n`` maiores (ou menores) de ``valores``, em ordem; NaN ficam por último"""
+    chave = valores.to_numpy(dtype=float, na_value=np.nan)
+    chave = chave if crescente else -chave
+    chave = np.where(np.isnan(chave), np.inf, chave)
+    if n < len(chave):
+        # Candidatos: tudo que empata com o n-ésimo entra, para o desempate ser estável
+        limite = np.partition(chave, n - 1)[n - 1]
+        candidatos = np.flatnonzero(chave <= limite)
+    else:
+        candidatos = np.arange(len(chave))
+    ordem = candidatos[np.argsort(chave[candidatos], kind="stable")][:n]
+    return valores.iloc[ordem]
+
+
+def curva_abc(valores):
+    """Quantidade de entidades em cada classe da curva ABC de ``valores``.
+
+    Classe pela participação acumulada (em ordem decrescente): A até 80%, B até
+    95%, C o restante. Devolve só as classes presentes, da maior para a menor.
+    """
+    ordenados = np.sort(valores.to_numpy(dtype=float))[::-1]
+    acumulado = np.cumsum(ordenados / ordenados.sum() * 100)
+    if (ordenados >= 0).all():
+        # Acumulado não decrescente: os cortes saem por busca binária
+        cortes = np.searchsorted(acumulado, LIMITES_ABC, side="right")
+    else:
+        cortes = [np.count_nonzero(acumulado <= limite) for limite in LIMITES_ABC]
+    quantidades = np.diff([0, *cortes, len(acumulado)])
+    contagem = pd.DataFrame({"Classificação": CLASSES_ABC, "Quantidade de Clientes": quantidades})
+    contagem = contagem[contagem["Quantidade de Clientes"] > 0]
+    return contagem.sort_values("Quantidade de Clientes", ascending=False, kind="stable", ignore_index=True)
+
+
+# ============================================================
+# CACHE POR ESTADO DE FILTRO
+# ============================================================
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def chave(*partes):
+    """Chave hashable de um estado de filtro (listas viram tuplas, dicionários viram itens ordenados)"""
+    def congelar(valor):
+        if isinstance(valor, dict):
+            return tuple(sorted((k, congelar(v)) for k, v in valor.items()))
+        if isinstance(valor, (list, tuple, set)):
+            return tuple(congelar(v) for v in valor)
+        return valor
+    return congelar(partes)
+
+
+def em_cache(nome, chave_filtros, calcular):
+    """Resultado de ``calcular()`` para o ranking ``nome`` no estado de filtro dado.
+
+    O resultado é compartilhado entre sessões: somente leitura.
+    """
+    item = (nome, chave_filtros)
+    with _cache_lock:
+        if item in _cache:
+            _cache.move_to_end(item)
+            return _cache[item]
+    resultado = calcular()
+    with _cache_lock:
+        _cache[item] = resultado
+        while len(_cache) > MAX_RANKINGS:
+            _cache.popitem(last=False)
+    return resultado
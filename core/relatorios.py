@@ -0,0 +1,486 @@
+"""Relatórios estáticos das páginas (HTML e JSON), gerados em lote fora do servidor.
+
+Quem só acompanha o resumo da semana não precisa de uma sessão interativa: o
+comando ``gerar`` calcula um conjunto de presets de filtro (tudo, por equipe,
+por vendedor, por mês...) com as mesmas funções das páginas
+(``projetos.calcular``, ``vendas.calcular`` e os ``grafico_*``) e grava, por
+preset, um HTML com KPIs, gráficos e destaques e um JSON com as tabelas.
+
+Os presets rodam em paralelo num pool de processos dedicado
+(``processamento.pool_dedicado``). Todos usam a mesma versão de cada snapshot,
+aberta por memory-map e carregada uma vez por trabalhador. Cada geração vai
+para um diretório novo em ``DATA_DIR/relatorios`` e só é publicada no ponteiro
+``ATUAL`` ao final, como os snapshots; as ``HUB_RELATORIOS_MANTIDOS`` gerações
+mais recentes são mantidas.
+
+Presets: ``DATA_DIR/relatorios.json`` (ou ``--presets``), uma lista de
+``{"pagina": "projetos" | "vendas", "nome": ..., "filtros": {...}, "por": ..., "ultimos": N}``.
+``filtros`` usa as chaves de ``projetos.filtros_padrao`` ou as colunas de
+``PAINEL_VENDAS["filtros"]`` (datas em ISO) sobre os filtros com que a página
+abre; ``por`` gera um preset por valor (ver ``POR``), só os ``ultimos`` N se
+indicado.
+
+Uso:
+    python -m core.relatorios gerar
+    python -m core.relatorios gerar --presets presets.json --trabalhadores 4
+    python -m core.relatorios gerar --intervalo 604800     # serviço: uma geração por semana
+"""
+import argparse
+import html
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import time
+import unicodedata
+import uuid
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from core import distintos, painel, processamento, projetos, snapshots, vendas
+from core.config import DATA_DIR, env_int
+from core.dados import EQUIPES_PESSOAS
+
+DIRETORIO_RELATORIOS = os.path.join(DATA_DIR, "relatorios")
+ARQUIVO_PRESETS = os.path.join(DATA_DIR, "relatorios.json")
+ARQUIVO_PONTEIRO = "ATUAL"
+ARQUIVO_INDICE = "indice.json"
+ARQUIVO_PLOTLY = "plotly.min.js"
+GERACOES_MANTIDAS = env_int("HUB_RELATORIOS_MANTIDOS", 8)
+# Serviço leitor subindo antes do construtor publicar: nova tentativa em pouco tempo
+ESPERA_SNAPSHOT_S = 60
+# Página do relatório: (dataset do snapshot, título)
+PAGINAS = {"projetos": ("tarefas", "Engenharia"), "vendas": ("vendas", "Vendas")}
+PRESETS_PADRAO = [
+    {"pagina": "projetos"},
+    {"pagina": "projetos", "por": "equipe"},
+    {"pagina": "projetos", "por": "mes", "ultimos": 3},
+    {"pagina": "vendas"},
+    {"pagina": "vendas", "por": "vendedor"},
+    {"pagina": "vendas", "por": "mes", "ultimos": 3},
+]
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# PRESETS
+# ============================================================
+def _meses_vendas(opcoes):
+    return [str(p) for p in pd.period_range(opcoes["data_min"][:10], opcoes["data_max"][:10], freq="M")]
+
+
+def _intervalo_do_mes(mes):
+    periodo = pd.Period(mes, freq="M")
+    return (periodo.start_time.date().isoformat(), periodo.end_time.date().isoformat())
+
+
+# Presets gerados por valor: {página: {por: (valores a partir das opções, filtros de um valor)}}
+POR = {
+    "projetos": {
+        "equipe": (lambda opcoes: list(EQUIPES_PESSOAS), lambda equipe: {"equipes": [equipe]}),
+        "mes": (lambda opcoes: opcoes["meses"], lambda mes: {"meses": [mes]}),
+    },
+    "vendas": {
+        "vendedor": (lambda opcoes: opcoes["vendedores"], lambda vendedor: {"vendedor": [vendedor]}),
+        "tipo": (lambda opcoes: opcoes["tipos"], lambda tipo: {"tipo_solucao": [tipo]}),
+        "ano": (lambda opcoes: opcoes["anos"], lambda ano: {"ano": [ano]}),
+        "mes": (_meses_vendas, lambda mes: {"data_nf": _intervalo_do_mes(mes)}),
+    },
+}
+
+
+def _filtros_iniciais(pagina, opcoes):
+    """Filtros com que a página abre: todos os períodos (e equipes) selecionados"""
+    if pagina == "projetos":
+        return projetos.filtros_padrao(equipes=list(EQUIPES_PESSOAS), meses=opcoes["meses"])
+    return {"ano": opcoes["anos"], "vendedor": [], "tipo_solucao": [], "cliente": [], "faixa_valor": []}
+
+
+def _combinar(pagina, filtros, novos):
+    combinados = {**filtros, **novos}
+    # Período por datas substitui o período por ano/mês, como na barra lateral
+    if pagina == "projetos" and combinados.get("intervalo") is not None:
+        combinados["meses"] = []
+    if pagina == "vendas" and "data_nf" in novos:
+        combinados.pop("ano", None)
+    return combinados
+
+
+def _slug(nome):
+    texto = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", texto.lower()).strip("-") or "relatorio"
+
+
+def expandir(presets, opcoes):
+    """Presets concretos ``{"pagina", "nome", "arquivo", "filtros"}``; ``opcoes`` por página"""
+    concretos = []
+    for preset in presets:
+        pagina = preset["pagina"]
+        if pagina not in PAGINAS:
+            raise ValueError(f"Página desconhecida no preset: {pagina!r} (use {', '.join(PAGINAS)})")
+        titulo = preset.get("nome", PAGINAS[pagina][1])
+        filtros = _combinar(pagina, _filtros_iniciais(pagina, opcoes[pagina]), preset.get("filtros", {}))
+        if "por" not in preset:
+            concretos.append((pagina, titulo if "nome" in preset else f"{titulo} - Geral", filtros))
+            continue
+        if preset["por"] not in POR[pagina]:
+            raise ValueError(f"'por' inválido para {pagina}: {preset['por']!r} (use {', '.join(POR[pagina])})")
+        valores_de, filtros_de = POR[pagina][preset["por"]]
+        valores = valores_de(opcoes[pagina])
+        if preset.get("ultimos"):
+            valores = valores[-preset["ultimos"]:]
+        for valor in valores:
+            concretos.append((pagina, f"{titulo} - {valor}", _combinar(pagina, filtros, filtros_de(valor))))
+
+    arquivos = set()
+    resultado = []
+    for pagina, nome, filtros in concretos:
+        arquivo, n = _slug(nome), 1
+        while arquivo in arquivos:
+            n += 1
+            arquivo = f"{_slug(nome)}-{n}"
+        arquivos.add(arquivo)
+        resultado.append({"pagina": pagina, "nome": nome, "arquivo": arquivo, "filtros": filtros})
+    return resultado
+
+
+def ler_presets(caminho=None):
+    """Presets do arquivo (``ARQUIVO_PRESETS`` por padrão); sem arquivo, ``PRESETS_PADRAO``"""
+    caminho = caminho or ARQUIVO_PRESETS
+    if not os.path.exists(caminho):
+        return PRESETS_PADRAO
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================
+# CONTEÚDO DE CADA PÁGINA (roda no trabalhador)
+# ============================================================
+# Gráficos do relatório de Projetos, na ordem das abas: (aba, [(função, tabela do bloco)])
+GRAFICOS_PROJETOS = [
+    ("aba Visão Geral", [(projetos.grafico_producao_equipe, "prod_eq"),
+                         (projetos.grafico_evolucao_mensal, "evolucao"),
+                         (projetos.grafico_faixa_duracao, "dist_duracao")]),
+    ("aba Análise por Pessoa", [(projetos.grafico_horas_por_pessoa, "horas_user"),
+                                (projetos.grafico_tarefas_por_pessoa, "tasks_user"),
+                                (projetos.grafico_eficiencia, "eficiencia")]),
+    ("aba Tempo & Prazo", [(projetos.grafico_distribuicao_atraso, "atrasos"),
+                           (projetos.grafico_pontualidade_equipe, "pont_eq"),
+                           (projetos.grafico_mais_pontuais, "pont_user")]),
+    ("aba Carga de Trabalho", [(projetos.grafico_heatmap_carga, "pivot_carga"),
+                               (projetos.grafico_ocupacao, "ocupacao_user")]),
+    ("aba Tendências", [(projetos.grafico_tendencia_pontualidade, "pont_mes"),
+                        (projetos.grafico_produtividade, "prod_mes"),
+                        (projetos.grafico_duracao_atraso, "dispersao")]),
+]
+# Tabelas de Projetos que são linhas (histograma, dispersão): ficam fora do JSON
+LINHAS_PROJETOS = {"atrasos", "dispersao"}
+
+# Gráficos do relatório de Vendas, na ordem das abas: nomes de PAINEL_VENDAS["graficos"]
+# ou (função, ranking de clientes)
+GRAFICOS_VENDAS = [
+    ("Visão Geral", ["faturamento_mensal", "quantidade_mensal", "faturamento_faixa", "quantidade_faixa"]),
+    ("Vendedores", ["faturamento_vendedor", "quantidade_vendedor", "ticket_vendedor", "ciclo_vendedor"]),
+    ("Clientes", [(vendas.grafico_top_clientes, "top_faturamento"),
+                  (vendas.grafico_clientes_recorrentes, "top_recorrencia"),
+                  (vendas.grafico_curva_abc, "curva_abc")]),
+    ("Produtos/Soluções", ["faturamento_tipo", "quantidade_tipo", "evolucao_tipo"]),
+]
+
+
+def _conteudo_projetos(versao, filtros):
+    resultado = projetos.calcular(versao, filtros)
+    if resultado["vazio"]:
+        return {"vazio": True}
+    indicadores = resultado["kpis"]
+    ocupacao = indicadores["ocupacao_global"]
+    nome_produtivo, horas_produtivo = resultado["aba Análise por Pessoa"]["mais_produtivo"]
+    equipe_pontual, taxa_equipe = resultado["aba Tempo & Prazo"]["melhor_pont"]
+    qtd_sobrecarga = resultado["aba Carga de Trabalho"]["qtd_sobrecarga"]
+    return {
+        "vazio": False,
+        "kpis": [
+            ("Tarefas Concluídas", f"{indicadores['total_tarefas']}"),
+            ("Horas Produzidas", f"{indicadores['total_horas']:.1f} h"),
+            ("Atraso Médio", f"{indicadores['atraso_medio']:.1f} dias"),
+            ("Taxa de Pontualidade", f"{indicadores['taxa_pontualidade']:.1f}%"),
+            ("Ocupação Global", f"{ocupacao:.1f}%" if not math.isnan(ocupacao) else "N/A"),
+        ],
+        "secoes": [
+            (aba.removeprefix("aba "), [funcao(resultado[aba][chave]) for funcao, chave in graficos])
+            for aba, graficos in GRAFICOS_PROJETOS
+        ],
+        "destaques": [
+            f"Colaborador mais produtivo: {nome_produtivo} ({horas_produtivo:.1f} horas)",
+            f"Equipe mais pontual: {equipe_pontual} ({taxa_equipe:.1f}% de pontualidade)",
+            f"{qtd_sobrecarga} colaborador(es) acima de 120% da capacidade" if qtd_sobrecarga > 0
+            else "Nenhum colaborador em sobrecarga crítica (>120%)",
+        ],
+        "dados": {
+            "kpis": indicadores,
+            **{aba.removeprefix("aba "): {chave: valor for chave, valor in resultado[aba].items()
+                                          if chave not in LINHAS_PROJETOS}
+               for aba in projetos.BLOCOS},
+        },
+    }
+
+
+def _conteudo_vendas(versao, selecoes):
+    resultado = vendas.calcular(versao, selecoes)
+    if resultado["vazio"]:
+        return {"vazio": True}
+    tabelas, clientes = resultado["tabelas"], resultado["clientes"]
+    indicadores = tabelas["kpis"]
+    qtd_vendas = indicadores["vendas"]
+    ticket_medio = indicadores["faturamento"] / qtd_vendas if qtd_vendas > 0 else 0
+    ciclo_medio = indicadores["ciclo"]
+
+    secoes = []
+    for aba, graficos in GRAFICOS_VENDAS:
+        figuras = []
+        for grafico in graficos:
+            if isinstance(grafico, str):
+                funcao, tabela = painel.grafico(vendas.PAINEL_VENDAS, tabelas, grafico)
+            else:
+                funcao, tabela = grafico[0], clientes[grafico[1]]
+            figuras.append(funcao(tabela))
+        secoes.append((aba, figuras))
+
+    melhor_vendedor = tabelas["vendedor_faturamento"].iloc[0]
+    melhor_cliente = clientes["top_faturamento"].iloc[0]
+    melhor_tipo = tabelas["tipo_faturamento"].iloc[0]
+    return {
+        "vazio": False,
+        "kpis": [
+            ("Faturamento Total", vendas.formatar_reais(indicadores["faturamento"])),
+            ("Número de Vendas", f"{qtd_vendas}"),
+            ("Ticket Médio", vendas.formatar_reais(ticket_medio)),
+            ("Ciclo Médio", f"{ciclo_medio:.0f} dias" if not pd.isna(ciclo_medio) else "N/A"),
+            ("Clientes Únicos", indicadores["clientes"].formatar()),
+        ],
+        "secoes": secoes,
+        "destaques": [
+            f"Melhor vendedor: {melhor_vendedor['Vendedor']} "
+            f"({vendas.formatar_reais(melhor_vendedor['Faturamento Total'])})",
+            f"Maior cliente: {melhor_cliente['Cliente']} "
+            f"({vendas.formatar_reais(melhor_cliente['Faturamento Total'])})",
+            f"Solução mais vendida: {melhor_tipo['Tipo de Solução']} "
+            f"({vendas.formatar_reais(melhor_tipo['Faturamento Total'])})",
+        ],
+        "dados": {**tabelas, "clientes": clientes},
+    }
+
+
+CONTEUDO = {"projetos": _conteudo_projetos, "vendas": _conteudo_vendas}
+
+
+# ============================================================
+# GRAVAÇÃO (roda no trabalhador)
+# ============================================================
+def _para_json(valor):
+    """Tabelas e valores do pandas/numpy em tipos do JSON (NaN vira ``null``)"""
+    if isinstance(valor, dict):
+        return {str(chave): _para_json(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_para_json(v) for v in valor]
+    if isinstance(valor, pd.DataFrame):
+        if not isinstance(valor.index, pd.RangeIndex):
+            valor = valor.reset_index()
+        return json.loads(valor.to_json(orient="records", date_format="iso", force_ascii=False))
+    if isinstance(valor, distintos.Contagem):
+        return {"valor": valor.valor, "exata": valor.exata}
+    if isinstance(valor, pd.Timestamp):
+        return valor.isoformat()
+    if hasattr(valor, "item"):
+        valor = valor.item()
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    return valor if isinstance(valor, (str, int, float, bool, type(None))) else str(valor)
+
+
+_ESTILO = """
+body { font-family: system-ui, sans-serif; margin: 2rem auto; max-width: 1200px; color: #262730; }
+.filtros, .rodape { color: #6b6f76; font-size: 0.9rem; }
+.kpis { display: flex; gap: 1rem; flex-wrap: wrap; margin: 1.5rem 0; }
+.kpi { flex: 1; min-width: 160px; border: 1px solid #e6e8eb; border-radius: 8px; padding: 0.8rem 1rem; }
+.kpi span { display: block; color: #6b6f76; font-size: 0.85rem; }
+.kpi strong { font-size: 1.5rem; }
+.graficos { display: grid; grid-template-columns: repeat(auto-fit, minmax(520px, 1fr)); gap: 1rem; }
+"""
+
+
+def _descrever_filtros(filtros):
+    partes = []
+    for chave, valor in filtros.items():
+        if valor in (None, False, [], ()):
+            continue
+        if isinstance(valor, (list, tuple)):
+            valor = ", ".join(str(v) for v in valor) if len(valor) <= 12 else f"{len(valor)} selecionados"
+        partes.append(f"{chave}: {valor}")
+    return " | ".join(partes) or "sem filtros"
+
+
+def _html(preset, versao, conteudo, gerado_em):
+    titulo = html.escape(preset["nome"])
+    corpo = [f"<h1>{titulo}</h1>",
+             f'<p class="filtros">{html.escape(_descrever_filtros(preset["filtros"]))}</p>']
+    if conteudo["vazio"]:
+        corpo.append("<p>Nenhum dado encontrado com os filtros selecionados.</p>")
+    else:
+        cartoes = "".join(f'<div class="kpi"><span>{html.escape(rotulo)}</span><strong>{html.escape(texto)}</strong></div>'
+                          for rotulo, texto in conteudo["kpis"])
+        corpo.append(f'<div class="kpis">{cartoes}</div>')
+        for aba, figuras in conteudo["secoes"]:
+            graficos = "".join(f"<div>{fig.to_html(full_html=False, include_plotlyjs=False)}</div>" for fig in figuras)
+            corpo.append(f'<h2>{html.escape(aba)}</h2><div class="graficos">{graficos}</div>')
+        itens = "".join(f"<li>{html.escape(texto)}</li>" for texto in conteudo["destaques"])
+        corpo.append(f"<h2>Destaques</h2><ul>{itens}</ul>")
+    corpo.append(f'<p class="rodape">Gerado em {gerado_em} a partir do snapshot {html.escape(versao)}.</p>')
+    return (f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>{titulo}</title>'
+            f'<script src="{ARQUIVO_PLOTLY}"></script><style>{_ESTILO}</style></head>'
+            f'<body>{"".join(corpo)}</body></html>')
+
+
+def renderizar(preset, versao, destino, gerado_em):
+    """Calcula o preset e grava ``<arquivo>.html`` e ``<arquivo>.json`` em ``destino``.
+
+    Devolve a entrada do índice da geração.
+    """
+    inicio = time.perf_counter()
+    conteudo = CONTEUDO[preset["pagina"]](versao, preset["filtros"])
+    base = os.path.join(destino, preset["arquivo"])
+    with open(f"{base}.html", "w", encoding="utf-8") as f:
+        f.write(_html(preset, versao, conteudo, gerado_em))
+    dados = {
+        "nome": preset["nome"], "pagina": preset["pagina"], "filtros": preset["filtros"],
+        "snapshot": versao, "gerado_em": gerado_em, "vazio": conteudo["vazio"],
+        "kpis": dict(conteudo.get("kpis", [])), "destaques": conteudo.get("destaques", []),
+        "tabelas": conteudo.get("dados", {}),
+    }
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump(_para_json(dados), f, ensure_ascii=False, indent=1)
+    return {
+        "nome": preset["nome"], "pagina": preset["pagina"], "vazio": conteudo["vazio"],
+        "html": f"{preset['arquivo']}.html", "json": f"{preset['arquivo']}.json",
+        "duracao_s": round(time.perf_counter() - inicio, 3),
+    }
+
+
+# ============================================================
+# GERAÇÃO (processo principal)
+# ============================================================
+def _gravar_ponteiro(geracao):
+    temporario = os.path.join(DIRETORIO_RELATORIOS, f".{ARQUIVO_PONTEIRO}.{uuid.uuid4().hex}")
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(geracao)
+    os.replace(temporario, os.path.join(DIRETORIO_RELATORIOS, ARQUIVO_PONTEIRO))
+
+
+def _limpar_geracoes_antigas(geracao_atual):
+    geracoes = sorted(
+        nome for nome in os.listdir(DIRETORIO_RELATORIOS)
+        if os.path.isdir(os.path.join(DIRETORIO_RELATORIOS, nome)) and not nome.startswith(".")
+    )
+    for nome in geracoes[:-GERACOES_MANTIDAS]:
+        if nome != geracao_atual:
+            shutil.rmtree(os.path.join(DIRETORIO_RELATORIOS, nome), ignore_errors=True)
+
+
+def _gravar_indice(destino, indice):
+    with open(os.path.join(destino, ARQUIVO_INDICE), "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    linhas = "".join(
+        f'<li><a href="{html.escape(item["html"])}">{html.escape(item["nome"])}</a>'
+        f'{" (sem dados)" if item["vazio"] else ""} · <a href="{html.escape(item["json"])}">json</a></li>'
+        for item in indice["relatorios"]
+    )
+    with open(os.path.join(destino, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>Relatórios ARV</title>'
+                f'<style>{_ESTILO}</style></head><body><h1>Relatórios ARV</h1>'
+                f'<p class="rodape">Gerado em {indice["gerado_em"]}.</p><ul>{linhas}</ul></body></html>')
+
+
+def gerar(presets, trabalhadores=processamento.TRABALHADORES):
+    """Gera os relatórios dos presets numa geração nova e a publica; devolve o diretório"""
+    from plotly.offline import get_plotlyjs
+
+    # Uma versão de cada snapshot para a geração inteira
+    versoes = {pagina: snapshots.versao_vigente(dataset) for pagina, (dataset, _) in PAGINAS.items()}
+    opcoes = {pagina: snapshots.ler_agregado(PAGINAS[pagina][0], versao, "opcoes")
+              for pagina, versao in versoes.items()}
+    concretos = expandir(presets, opcoes)
+
+    gerado_em = time.strftime("%Y-%m-%dT%H:%M:%S")
+    # Sufixo aleatório: duas gerações no mesmo segundo não colidem; o prefixo
+    # de data mantém a ordem cronológica usada na limpeza
+    geracao = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    os.makedirs(DIRETORIO_RELATORIOS, exist_ok=True)
+    temporario = os.path.join(DIRETORIO_RELATORIOS, f".{geracao}")
+    os.makedirs(temporario)
+    with open(os.path.join(temporario, ARQUIVO_PLOTLY), "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+
+    inicio = time.perf_counter()
+    argumentos = [(preset, versoes[preset["pagina"]], temporario, gerado_em) for preset in concretos]
+    if trabalhadores > 0:
+        with processamento.pool_dedicado(trabalhadores) as pool:
+            futuros = [pool.submit(renderizar, *args) for args in argumentos]
+            for futuro in as_completed(futuros):
+                logger.info("Relatório %s em %.2fs", futuro.result()["nome"], futuro.result()["duracao_s"])
+            relatorios = [futuro.result() for futuro in futuros]
+    else:
+        relatorios = [renderizar(*args) for args in argumentos]
+
+    _gravar_indice(temporario, {
+        "gerado_em": gerado_em,
+        "snapshots": {PAGINAS[pagina][0]: versao for pagina, versao in versoes.items()},
+        "duracao_s": round(time.perf_counter() - inicio, 2),
+        "relatorios": relatorios,
+    })
+    destino = os.path.join(DIRETORIO_RELATORIOS, geracao)
+    os.replace(temporario, destino)
+    _gravar_ponteiro(geracao)
+    _limpar_geracoes_antigas(geracao)
+    logger.info("%d relatórios publicados em %s (%.1fs)", len(relatorios), destino, time.perf_counter() - inicio)
+    return destino
+
+
+# ============================================================
+# LINHA DE COMANDO (SERVIÇO DE RELATÓRIOS)
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera relatórios estáticos (HTML/JSON) dos dashboards")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    cmd = sub.add_parser("gerar", help="Gera os relatórios dos presets e publica a geração")
+    cmd.add_argument("--presets", help=f"Arquivo JSON de presets (padrão: {ARQUIVO_PRESETS}, se existir)")
+    cmd.add_argument("--trabalhadores", type=int, default=max(processamento.TRABALHADORES, 1),
+                     help="Processos em paralelo; 0 gera no próprio processo")
+    cmd.add_argument("--intervalo", type=int, default=0,
+                     help="Segundos entre gerações; 0 gera uma vez e sai")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    while True:
+        try:
+            gerar(ler_presets(args.presets), args.trabalhadores)
+        except snapshots.SnapshotIndisponivel as erro:
+            if args.intervalo <= 0:
+                raise
+            logger.warning("%s; nova tentativa em %ss", erro, ESPERA_SNAPSHOT_S)
+            time.sleep(ESPERA_SNAPSHOT_S)
+            continue
+        except Exception:
+            logger.exception("Falha ao gerar os relatórios")
+            if args.intervalo <= 0:
+                raise
+        if args.intervalo <= 0:
+            return
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""Snapshots versionados e imutáveis dos datasets no volume compartilhado.
+
+Um construtor lê as planilhas uma única vez e grava, em
+``<HUB_DATA_DIR>/snapshots/<dataset>/<versao>/``, a tabela tratada em Arrow IPC
+e os agregados pré-calculados; o arquivo ``ATUAL`` aponta para a versão
+vigente e é trocado de forma atômica. As réplicas apenas leem o ponteiro e
+fazem memory-map dos arquivos, sem reprocessar as planilhas.
+
+O arquivo da tabela é o formato canônico dos dados: IPC sem compressão, colunas
+de largura fixa e textos codificados em dicionário (categorias em ordem
+alfabética). Abrir o arquivo não lê nada do disco; só as colunas pedidas em
+``carregar`` são materializadas, e o cache de páginas do sistema operacional é
+compartilhado entre os processos que mapeiam o mesmo snapshot.
+
+Papéis (``HUB_SNAPSHOT_PAPEL``):
+- ``local`` (padrão): a própria réplica constrói o snapshot quando as planilhas mudam
+- ``leitor``: nunca lê planilhas; depende do serviço construtor
+- ``construtor``: usado por ``python -m core.snapshots construir``
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+import streamlit as st
+
+from core import dados, facetas, mensal, metricas
+from core.config import DATA_DIR, env_int
+
+DIRETORIO_SNAPSHOTS = os.path.join(DATA_DIR, "snapshots")
+PAPEL = os.environ.get("HUB_SNAPSHOT_PAPEL", "local")
+VERSOES_MANTIDAS = env_int("HUB_SNAPSHOT_VERSOES", 3)
+ARQUIVO_PONTEIRO = "ATUAL"
+ARQUIVO_TABELA = "tabela.arrow"
+ARQUIVO_MANIFESTO = "manifesto.json"
+# Entra no cálculo da versão: mudar o layout dos arquivos gera uma versão nova
+FORMATO_SNAPSHOT = 6
+
+logger = logging.getLogger(__name__)
+_construcao_lock = threading.Lock()
+_fontes_conferidas = {}
+
+
+class SnapshotIndisponivel(RuntimeError):
+    """Não há snapshot publicado para o dataset e esta réplica não pode construí-lo"""
+
+
+# ============================================================
+# AGREGADOS PRÉ-CALCULADOS
+# ============================================================
+def _opcoes_vendas(df):
+    return {
+        "anos": sorted(df["ano"].dropna().unique().tolist()),
+        "vendedores": sorted(df["vendedor"].dropna().unique().tolist()),
+        "tipos": sorted(df["tipo_solucao"].dropna().unique().tolist()),
+        "clientes": sorted(df["cliente"].dropna().unique().tolist()),
+        "faixas_valor": df["faixa_valor"].dropna().unique().tolist(),
+        "data_min": df["data_nf"].min().isoformat(),
+        "data_max": df["data_nf"].max().isoformat(),
+    }
+
+
+def _opcoes_tarefas(df):
+    return {
+        "meses": sorted(df["ano_mes"].dropna().unique().tolist()),
+        "faixas_duracao": df["faixa_duracao"].dropna().unique().tolist(),
+        "data_min": df["data_conclusao"].min().isoformat(),
+        "data_max": df["data_conclusao"].max().isoformat(),
+    }
+
+
+def _facetas_vendas(df):
+    return facetas.construir(
+        df,
+        {"vendedor": lambda d: d["vendedor"], "cliente": lambda d: d["cliente"]},
+        [("cliente", "vendedor")],
+    )
+
+
+def _facetas_tarefas(df):
+    return facetas.construir(
+        df,
+        {
+            "responsavel": lambda d: d["responsavel"],
+            "ano_mes": lambda d: d["ano_mes"],
+            "dia": lambda d: d["data_conclusao"].dt.normalize(),
+        },
+        [("responsavel", "ano_mes"), ("responsavel", "dia")],
+    )
+
+
+# Tabelas mensais (ver core/mensal.py): o grão cobre os filtros das páginas que
+# não descem ao nível da linha (cliente e intervalo de datas voltam às linhas)
+MENSAL_VENDAS = {
+    "dimensoes": ["ano_mes", "ano", "vendedor", "tipo_solucao", "faixa_valor"],
+    "medidas": {
+        "valor_venda": ("valor_venda", "sum"),
+        "vendas": ("valor_venda", "size"),
+        "com_valor": ("valor_venda", "count"),
+    },
+    "distintos": {"clientes": "cliente"},
+}
+MENSAL_TAREFAS = {
+    "dimensoes": ["ano_mes", "responsavel", "faixa_duracao", "atrasada"],
+    "derivadas": {"atrasada": lambda d: d["dias_atraso"] > 0},
+    "medidas": {
+        "duracao": ("duracao", "sum"),
+        "tarefas": ("tarefa", "count"),
+        "linhas": ("no_prazo", "size"),
+        "no_prazo": ("no_prazo", "sum"),
+    },
+    "distintos": {"pessoas": "responsavel"},
+}
+
+# Cada dataset declara como ler as fontes e quais agregados acompanham o snapshot.
+# Agregados que retornam DataFrame são gravados em Arrow; os demais, em JSON.
+# A tabela mensal (``mensal``) é atualizada a partir da versão anterior.
+DATASETS = {
+    "vendas": {
+        "fontes": lambda: [dados.ARQUIVO_VENDAS],
+        "ler": lambda: dados.ler_vendas_excel(),
+        "agregados": {"opcoes": _opcoes_vendas, "facetas": _facetas_vendas},
+        "mensal": MENSAL_VENDAS,
+    },
+    "tarefas": {
+        "fontes": lambda: list(dados.ARQUIVOS_TAREFAS),
+        "ler": lambda: dados.ler_tarefas_excel(),
+        "agregados": {"opcoes": _opcoes_tarefas, "facetas": _facetas_tarefas},
+        "mensal": MENSAL_TAREFAS,
+    },
+}
+
+
+# ============================================================
+# CONSTRUÇÃO
+# ============================================================
+def _diretorio(dataset, versao=None):
+    base = os.path.join(DIRETORIO_SNAPSHOTS, dataset)
+    return os.path.join(base, versao) if versao else base
+
+
+def _assinatura_fontes(caminhos):
+    """(tamanho, mtime) de cada fonte; barato o bastante para checar a cada rerun"""
+    return [[os.path.basename(c), os.path.getsize(c), os.stat(c).st_mtime_ns] for c in caminhos]
+
+
+def _versao_do_conteudo(caminhos):
+    hash_ = hashlib.sha256(f"formato={FORMATO_SNAPSHOT}".encode())
+    for caminho in caminhos:
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                hash_.update(bloco)
+    return hash_.hexdigest()[:16]
+
+
+def _codificar_textos(tabela):
+    """Colunas de texto viram dicionário com as categorias ordenadas (groupby/sort seguem a ordem alfabética)"""
+    for i, campo in enumerate(tabela.schema):
+        if not (pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type)):
+            continue
+        coluna = tabela.column(i).combine_chunks()
+        categorias = pc.unique(coluna).drop_null()
+        categorias = categorias.take(pc.array_sort_indices(categorias))
+        indices = pc.index_in(coluna, value_set=categorias).cast(pa.int32())
+        tabela = tabela.set_column(i, campo.name, pa.DictionaryArray.from_arrays(indices, categorias))
+    return tabela
+
+
+def _para_arrow(df):
+    """Converte para Arrow; colunas de texto com tipos misturados viram texto"""
+    df = df.copy(deep=False)
+    for coluna in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[coluna], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[coluna] = df[coluna].map(lambda v: v if v is None or v != v else str(v))
+    return _codificar_textos(pa.Table.from_pandas(df, preserve_index=False))
+
+
+def _gravar_tabela(tabela, caminho):
+    opcoes = pa.ipc.IpcWriteOptions(compression=None)
+    with pa.OSFile(caminho, "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema, options=opcoes) as escritor:
+            escritor.write_table(tabela)
+
+
+def _gravar_ponteiro(dataset, versao):
+    destino = os.path.join(_diretorio(dataset), ARQUIVO_PONTEIRO)
+    temporario = f"{destino}.{uuid.uuid4().hex}.tmp"
+    with open(temporario, "w") as f:
+        f.write(versao)
+    os.replace(temporario, destino)
+
+
+def _limpar_versoes_antigas(dataset, versao_atual):
+    """Remove versões além das N mais recentes; quem já mapeou um arquivo removido continua lendo"""
+    base = _diretorio(dataset)
+    versoes = []
+    for nome in os.listdir(base):
+        caminho = os.path.join(base, nome, ARQUIVO_MANIFESTO)
+        if os.path.isfile(caminho):
+            versoes.append((os.path.getmtime(caminho), nome))
+    for _, nome in sorted(versoes, reverse=True)[VERSOES_MANTIDAS:]:
+        if nome != versao_atual:
+            shutil.rmtree(os.path.join(base, nome), ignore_errors=True)
+
+
+def _mensal_anterior(dataset, versao):
+    """Tabela mensal da versão publicada, base da atualização incremental"""
+    anterior = _ler_ponteiro(dataset)
+    if anterior is None or anterior == versao:
+        return None
+    try:
+        return ler_agregado(dataset, anterior, "mensal")
+    except (OSError, KeyError, ValueError):
+        # Versão removida ou de um formato sem tabela mensal: reagrega tudo
+        return None
+
+
+def construir(dataset, forcar=False):
+    """Gera (se preciso) o snapshot do dataset e publica a versão no ponteiro"""
+    definicao = DATASETS[dataset]
+    fontes = definicao["fontes"]()
+    versao = _versao_do_conteudo(fontes)
+    final = _diretorio(dataset, versao)
+
+    if forcar or not os.path.isfile(os.path.join(final, ARQUIVO_MANIFESTO)):
+        inicio = time.perf_counter()
+        df = definicao["ler"]()
+        temporario = _diretorio(dataset, f".tmp-{versao}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(os.path.join(temporario, "agregados"))
+
+        tabela = _para_arrow(df)
+        _gravar_tabela(tabela, os.path.join(temporario, ARQUIVO_TABELA))
+        agregados = {}
+        calculos = dict(definicao["agregados"])
+        calculos["mensal"] = lambda d: mensal.construir(d, definicao["mensal"], _mensal_anterior(dataset, versao))
+        for nome, funcao in calculos.items():
+            resultado = funcao(df)
+            if isinstance(resultado, pd.DataFrame):
+                _gravar_tabela(_para_arrow(resultado), os.path.join(temporario, "agregados", f"{nome}.arrow"))
+                agregados[nome] = "arrow"
+            else:
+                with open(os.path.join(temporario, "agregados", f"{nome}.json"), "w", encoding="utf-8") as f:
+                    json.dump(resultado, f, ensure_ascii=False, default=str)
+                agregados[nome] = "json"
+
+        info = {
+            "dataset": dataset,
+            "versao": versao,
+            "formato": FORMATO_SNAPSHOT,
+            "criado_em": time.time(),
+            "linhas": tabela.num_rows,
+            "fontes": _assinatura_fontes(fontes),
+            "agregados": agregados,
+        }
+        with open(os.path.join(temporario, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=1)
+
+        if forcar and os.path.isdir(final):
+            shutil.rmtree(final, ignore_errors=True)
+        try:
+            os.rename(temporario, final)
+        except OSError:
+            # Outro construtor publicou a mesma versão primeiro
+            shutil.rmtree(temporario, ignore_errors=True)
+        logger.info("Snapshot %s/%s construído em %.2fs", dataset, versao, time.perf_counter() - inicio)
+
+    _gravar_ponteiro(dataset, versao)
+    _limpar_versoes_antigas(dataset, versao)
+    _fontes_conferidas[dataset] = (versao, _assinatura_fontes(fontes))
+    return versao
+
+
+# ============================================================
+# LEITURA
+# ============================================================
+def _ler_ponteiro(dataset):
+    try:
+        with open(os.path.join(_diretorio(dataset), ARQUIVO_PONTEIRO)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _fontes_mudaram(dataset, versao):
+    """Compara tamanho/mtime das planilhas com os da versão publicada (ou da última conferência).
+
+    Uma versão gravada em outro ``FORMATO_SNAPSHOT`` também conta como mudança.
+    """
+    try:
+        assinatura = _assinatura_fontes(DATASETS[dataset]["fontes"]())
+        if _fontes_conferidas.get(dataset) == (versao, assinatura):
+            return False
+        info = _ler_manifesto(dataset, versao)
+        return info.get("formato") != FORMATO_SNAPSHOT or info["fontes"] != assinatura
+    except (FileNotFoundError, KeyError):
+        return True
+
+
+def versao_vigente(dataset):
+    """Versão publicada no ponteiro; no papel local, reconstrói se as planilhas mudaram"""
+    versao = _ler_ponteiro(dataset)
+    if PAPEL == "leitor":
+        if versao is None:
+            raise SnapshotIndisponivel(f"Nenhum snapshot publicado para '{dataset}' em {DIRETORIO_SNAPSHOTS}")
+        return versao
+    if versao is None or _fontes_mudaram(dataset, versao):
+        with _construcao_lock:
+            versao = _ler_ponteiro(dataset)
+            if versao is None or _fontes_mudaram(dataset, versao):
+                versao = construir(dataset)
+    return versao
+
+
+def exigir_versao(dataset):
+    """``versao_vigente`` para páginas: mostra o erro e interrompe se não houver snapshot"""
+    try:
+        return versao_vigente(dataset)
+    except SnapshotIndisponivel as erro:
+        st.error(f"Dados ainda não disponíveis: {erro}. Aguarde o serviço construtor publicar o snapshot.")
+        st.stop()
+
+
+def _ler_manifesto(dataset, versao):
+    with open(os.path.join(_diretorio(dataset, versao), ARQUIVO_MANIFESTO), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@metricas.cache_resource_medido(max_entries=8)
+def manifesto(dataset, versao):
+    return _ler_manifesto(dataset, versao)
+
+
+def ler_tabela(dataset, versao):
+    """Tabela Arrow mapeada em memória, sem cache (usada também pelos processos do pool).
+
+    Nenhum dado é lido aqui: os buffers apontam para o arquivo mapeado e as
+    páginas só entram na memória quando uma coluna é acessada.
+    """
+    caminho = os.path.join(_diretorio(dataset, versao), ARQUIVO_TABELA)
+    return pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+
+
+def tabela_para_pandas(tabela, colunas=None):
+    if colunas is not None:
+        tabela = tabela.select(list(colunas))
+    return tabela.to_pandas(split_blocks=True, self_destruct=False)
+
+
+@metricas.cache_resource_medido(max_entries=4)
+def abrir_tabela(dataset, versao):
+    """Tabela Arrow mapeada em memória (somente leitura), compartilhada pelas sessões do processo"""
+    tabela = ler_tabela(dataset, versao)
+    info = manifesto(dataset, versao)
+    metricas.registrar_dataset(dataset, versao, info["criado_em"], info["linhas"])
+    return tabela
+
+
+@metricas.cache_resource_medido(max_entries=8)
+def carregar(dataset, versao, colunas=None):
+    """DataFrame com as colunas pedidas (todas se ``None``), compartilhado entre as sessões.
+
+    O resultado é somente leitura: colunas numéricas sem nulos são visões
+    diretas do arquivo mapeado e textos chegam como ``Categorical``.
+    """
+    return tabela_para_pandas(abrir_tabela(dataset, versao), colunas)
+
+
+def ler_agregado(dataset, versao, nome):
+    """Agregado gravado junto do snapshot, sem cache (ver ``agregado``)"""
+    formato = _ler_manifesto(dataset, versao)["agregados"][nome]
+    caminho = os.path.join(_diretorio(dataset, versao), "agregados", f"{nome}.{formato}")
+    if formato == "arrow":
+        return pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all().to_pandas()
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@metricas.cache_resource_medido(max_entries=16)
+def agregado(dataset, versao, nome):
+    """Agregado pré-calculado gravado junto do snapshot"""
+    return ler_agregado(dataset, versao, nome)
+
+
+# ============================================================
+# LINHA DE COMANDO (SERVIÇO CONSTRUTOR)
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Constrói e publica snapshots dos datasets do HUB")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    cmd = sub.add_parser("construir", help="Constrói os snapshots cujas planilhas mudaram")
+    cmd.add_argument("datasets", nargs="*", default=sorted(DATASETS), help="Datasets (padrão: todos)")
+    cmd.add_argument("--forcar", action="store_true", help="Reconstrói mesmo sem mudança nas fontes")
+    cmd.add_argument("--intervalo", type=int, default=0,
+                     help="Segundos entre verificações; 0 constrói uma vez e sai")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    while True:
+        for dataset in args.datasets:
+            try:
+                versao = _ler_ponteiro(dataset)
+                if args.forcar or versao is None or _fontes_mudaram(dataset, versao):
+                    logger.info("Publicado %s/%s", dataset, construir(dataset, forcar=args.forcar))
+            except Exception:
+                logger.exception("Falha ao construir o snapshot de %s", dataset)
+        if args.intervalo <= 0:
+            return
+        args.forcar = False
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Instrumentação de tempo por seção dos dashboards.
+
+Cada rerun de página abre um registro na sessão (``rerun``) e cada etapa da
+página é delimitada por ``secao``. As durações vão para o log em JSON, para uma
+janela móvel compartilhada entre sessões (p50/p95/p99) e para quem assinar os
+eventos via ``assinar``.
+
+Execuções e seções cortadas por ``st.stop()`` ou por um rerun pedido pela
+sessão saem marcadas com ``interrompido`` ("stop" ou "rerun") e ficam fora dos
+percentis: a duração delas não é a de uma página completa.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import RerunException, StopException, add_script_run_ctx, get_script_run_ctx
+
+from core.config import acesso_autorizado, env_bool, env_int
+
+JANELA_PERCENTIS = env_int("HUB_PERF_JANELA", 500)
+CHAVE_SESSAO = "_telemetria_rerun"
+
+logger = logging.getLogger("hub_arv.perf")
+if env_bool("HUB_PERF_LOG", True) and not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+# ============================================================
+# AGREGAÇÃO ENTRE SESSÕES
+# ============================================================
+def _percentil(ordenados, p):
+    """Percentil por posição mais próxima sobre uma lista já ordenada"""
+    if not ordenados:
+        return float("nan")
+    idx = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[idx]
+
+
+class _Agregador:
+    """Janela móvel de durações por (página, seção), comum a todas as sessões do processo"""
+
+    def __init__(self, janela):
+        self._janela = janela
+        self._amostras = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, pagina, secao, duracao):
+        with self._lock:
+            chave = (pagina, secao)
+            if chave not in self._amostras:
+                self._amostras[chave] = deque(maxlen=self._janela)
+            self._amostras[chave].append(duracao)
+
+    def resumo(self):
+        """Lista de dicts com contagem e p50/p95/p99 (em ms) por seção"""
+        with self._lock:
+            copia = {chave: sorted(valores) for chave, valores in self._amostras.items()}
+        linhas = []
+        for (pagina, secao), valores in sorted(copia.items()):
+            linhas.append({
+                "pagina": pagina,
+                "secao": secao,
+                "amostras": len(valores),
+                "p50_ms": _percentil(valores, 50) * 1000,
+                "p95_ms": _percentil(valores, 95) * 1000,
+                "p99_ms": _percentil(valores, 99) * 1000,
+            })
+        return linhas
+
+
+agregador = _Agregador(JANELA_PERCENTIS)
+_ouvintes = []
+
+
+def assinar(callback):
+    """Registra uma função chamada com o dict de cada seção/rerun finalizado"""
+    _ouvintes.append(callback)
+    return callback
+
+
+def _emitir(evento):
+    if "interrompido" not in evento:
+        agregador.registrar(evento["pagina"], evento["secao"], evento["duracao_s"])
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(evento, ensure_ascii=False))
+    for callback in list(_ouvintes):
+        try:
+            callback(evento)
+        except Exception:
+            logging.getLogger(__name__).exception("Falha em ouvinte de telemetria")
+
+
+# ============================================================
+# REGISTRO POR RERUN
+# ============================================================
+def _registro_atual():
+    registro = st.session_state.get(CHAVE_SESSAO)
+    if registro is None:
+        registro = {"pagina": "-", "secoes": [], "pilha": []}
+        st.session_state[CHAVE_SESSAO] = registro
+    return registro
+
+
+@contextmanager
+def _contar_bytes_enviados(registro):
+    """Soma o tamanho das mensagens enviadas ao navegador durante o bloco.
+
+    Depende de ``ScriptRunContext._enqueue``, interno do Streamlit (1.52): se
+    o atributo sumir numa versão futura, os bytes simplesmente não são medidos.
+    """
+    ctx = get_script_run_ctx()
+    if not hasattr(ctx, "_enqueue"):
+        yield
+        return
+    original = ctx._enqueue
+
+    registro["bytes_enviados"] = 0
+
+    def _enqueue_contando(msg):
+        registro["bytes_enviados"] += msg.ByteSize()
+        original(msg)
+
+    ctx._enqueue = _enqueue_contando
+    try:
+        yield
+    finally:
+        ctx._enqueue = original
+
+
+def _interrupcao(erro):
+    return "stop" if isinstance(erro, StopException) else "rerun"
+
+
+def _fora_da_thread_do_script(funcao, *args):
+    """Roda ``funcao`` numa thread auxiliar com o contexto do script e espera.
+
+    Depois de um ``st.stop()`` toda chamada ``st.*`` na thread do script levanta
+    ``StopException`` de novo; vindos de outra thread, os elementos ainda são
+    entregues à sessão.
+    """
+    thread = threading.Thread(target=funcao, args=args, name="hub-painel-perf")
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    thread.join()
+
+
+@contextmanager
+def rerun(pagina):
+    """Delimita a execução completa de uma página e registra tempo total e bytes enviados.
+
+    O painel de performance é desenhado ao final, inclusive quando a página
+    interrompe a execução com ``st.stop()``; execuções cortadas por um rerun
+    não o desenham (a próxima desenha).
+    """
+    registro = {"pagina": pagina, "secoes": [], "pilha": []}
+    st.session_state[CHAVE_SESSAO] = registro
+    inicio = time.perf_counter()
+    try:
+        with _contar_bytes_enviados(registro):
+            yield registro
+    except (RerunException, StopException) as erro:
+        registro["interrompido"] = _interrupcao(erro)
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        registro["total_s"] = duracao
+        evento = {"evento": "rerun", "pagina": pagina, "secao": "total", "duracao_s": duracao}
+        if "bytes_enviados" in registro:
+            evento["bytes_enviados"] = registro["bytes_enviados"]
+        if "interrompido" in registro:
+            evento["interrompido"] = registro["interrompido"]
+        _emitir(evento)
+        if registro.get("interrompido") != "rerun" and painel_habilitado():
+            if registro.get("interrompido") == "stop":
+                _fora_da_thread_do_script(renderizar_painel, registro)
+            else:
+                renderizar_painel(registro)
+
+
+@contextmanager
+def secao(nome):
+    """Mede uma etapa da página; seções aninhadas recebem o prefixo da seção pai"""
+    registro = _registro_atual()
+    nome_completo = " > ".join(registro["pilha"] + [nome])
+    registro["pilha"].append(nome)
+    inicio = time.perf_counter()
+    interrompido = None
+    try:
+        yield
+    except (RerunException, StopException) as erro:
+        interrompido = _interrupcao(erro)
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        registro["pilha"].pop()
+        _registrar(registro, nome_completo, duracao, interrompido)
+
+
+def _registrar(registro, nome_completo, duracao, interrompido=None):
+    registro["secoes"].append((nome_completo, duracao))
+    evento = {"evento": "secao", "pagina": registro["pagina"], "secao": nome_completo, "duracao_s": duracao}
+    if interrompido is not None:
+        evento["interrompido"] = interrompido
+    _emitir(evento)
+
+
+def registrar(nome, duracao):
+    """Registra uma etapa medida fora da thread do script (ex.: no pool de processos)"""
+    registro = _registro_atual()
+    _registrar(registro, " > ".join(registro["pilha"] + [nome]), duracao)
+
+
+# ============================================================
+# PAINEL DE PERFORMANCE (OCULTO)
+# ============================================================
+def painel_habilitado():
+    """Painel liberado por HUB_PERF_PANEL=1 ou pelo query param ?perf=<HUB_PERF_TOKEN>"""
+    if env_bool("HUB_PERF_PANEL"):
+        return True
+    return acesso_autorizado(st.query_params.get("perf"), "HUB_PERF_TOKEN", exigir_token=True)
+
+
+def renderizar_painel(registro):
+    """Mostra na barra lateral o detalhamento do rerun e os percentis acumulados"""
+    import pandas as pd
+
+    with st.sidebar.expander("⏱ Performance", expanded=False):
+        total = registro.get("total_s")
+        if total is not None:
+            enviados = registro.get("bytes_enviados")
+            extra = f" · {enviados / 1024:.0f} KiB enviados" if enviados is not None else " · bytes não medidos"
+            if registro.get("interrompido") == "stop":
+                extra += " · interrompido por st.stop()"
+            st.caption(f"Rerun de **{registro['pagina']}**: {total * 1000:.0f} ms{extra}")
+        secoes = pd.DataFrame(registro["secoes"], columns=["Seção", "Duração (ms)"])
+        secoes["Duração (ms)"] = secoes["Duração (ms)"] * 1000
+        st.dataframe(secoes, hide_index=True, use_container_width=True)
+
+        st.caption("Percentis entre sessões (janela móvel)")
+        resumo = pd.DataFrame(agregador.resumo())
+        if not resumo.empty:
+            resumo = resumo[resumo["pagina"] == registro["pagina"]]
+        st.dataframe(resumo, hide_index=True, use_container_width=True)
@@ -0,0 +1,304 @@
+"""Painel e gráficos da página de Vendas.
+
+``PAINEL_VENDAS`` declara filtros, medidas, consultas e gráficos da página; as
+agregações saem do plano compartilhado de ``core.painel`` (da tabela mensal do
+snapshot quando os filtros cabem no grão dela). Os gráficos são funções puras,
+sem Streamlit, que a ``core.graficos.Esteira`` roda em paralelo no pool.
+``calcular`` faz o mesmo cálculo da página fora dela (relatórios em lote).
+"""
+from core import modulos, painel, processamento, ranking
+from core.snapshots import MENSAL_VENDAS
+
+px = modulos.sob_demanda("plotly.express")
+
+COLUNAS_ANALISE = ("data_nf", "ano", "ano_mes", "cliente", "vendedor", "tipo_solucao",
+                   "valor_venda", "lead_time", "faixa_valor")
+
+
+def formatar_reais(valor):
+    """Formata valores em reais com separadores brasileiros"""
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def formatar_eixo_reais(fig, eixo='y'):
+    """Aplica formatação brasileira aos eixos de gráficos Plotly"""
+    if eixo == 'y':
+        fig.update_yaxes(tickformat=",.0f", tickprefix="R$ ", separatethousands=True)
+    else:
+        fig.update_xaxes(tickformat=",.0f", tickprefix="R$ ", separatethousands=True)
+    return fig
+
+
+def ranking_clientes(df_filtrado, n=10):
+    """Top clientes por faturamento e por recorrência e a contagem da curva ABC"""
+    por_cliente = df_filtrado.groupby("cliente", observed=True)["valor_venda"].agg(["sum", "size"])
+    df_cliente = ranking.top_n(por_cliente["sum"], n).reset_index()
+    df_cliente.columns = ["Cliente", "Faturamento Total"]
+    df_recorrencia_top = ranking.top_n(por_cliente["size"], n).reset_index()
+    df_recorrencia_top.columns = ["Cliente", "Número de Compras"]
+    return {
+        "top_faturamento": df_cliente,
+        "top_recorrencia": df_recorrencia_top,
+        "curva_abc": ranking.curva_abc(por_cliente["sum"]),
+    }
+
+
+# ============================================================
+# VISÃO GERAL
+# ============================================================
+def grafico_faturamento_mensal(df_mes):
+    fig_mes = px.line(df_mes, x="Período", y="Faturamento", markers=True,
+                      title="Evolução Mensal do Faturamento",
+                      labels={"Período": "Período (Ano-Mês)",
+                             "Faturamento": "Faturamento (R$)"})
+    fig_mes.update_traces(line_color='#1f77b4', line_width=3,
+                         hovertemplate='<b>%{x}</b><br>Faturamento: R$ %{y:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_mes, 'y')
+
+
+def grafico_quantidade_mensal(df_qtd_mes):
+    return px.bar(df_qtd_mes, x="Período", y="Quantidade de Vendas",
+                  title="Quantidade de Vendas por Mês",
+                  labels={"Período": "Período (Ano-Mês)",
+                         "Quantidade de Vendas": "Nº de Vendas"},
+                  color="Quantidade de Vendas",
+                  color_continuous_scale="Greens")
+
+
+def grafico_faturamento_faixa(dist_faixa):
+    fig_pizza = px.pie(dist_faixa, values="Faturamento Total", names="Faixa de Valor",
+                       title="Faturamento por Faixa de Valor",
+                       labels={"Faixa de Valor": "Faixa", "Faturamento Total": "Faturamento (R$)"})
+    fig_pizza.update_traces(textposition='inside',
+                           textinfo='percent+label',
+                           hovertemplate='<b>%{label}</b><br>R$ %{value:,.2f}<br>%{percent}<extra></extra>')
+    return fig_pizza
+
+
+def grafico_quantidade_faixa(dist_faixa):
+    return px.bar(dist_faixa, x="Faixa de Valor", y="Quantidade",
+                  title="Quantidade de Vendas por Faixa",
+                  labels={"Faixa de Valor": "Faixa de Valor", "Quantidade": "Nº de Vendas"},
+                  color="Quantidade",
+                  color_continuous_scale="Blues")
+
+
+# ============================================================
+# VENDEDORES
+# ============================================================
+def grafico_faturamento_vendedor(df_vend):
+    fig_vend = px.bar(df_vend, y="Vendedor", x="Faturamento Total",
+                     orientation="h",
+                     title="Faturamento por Vendedor",
+                     labels={"Vendedor": "Vendedor", "Faturamento Total": "Faturamento (R$)"},
+                     color="Faturamento Total",
+                     color_continuous_scale="Blues")
+    fig_vend.update_layout(yaxis={'categoryorder':'total ascending'})
+    fig_vend.update_traces(hovertemplate='<b>%{y}</b><br>Faturamento: R$ %{x:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_vend, 'x')
+
+
+def grafico_quantidade_vendedor(df_vend_qtd):
+    fig_vend_qtd = px.bar(df_vend_qtd, y="Vendedor", x="Quantidade de Vendas",
+                         orientation="h",
+                         title="Quantidade de Vendas por Vendedor",
+                         labels={"Vendedor": "Vendedor", "Quantidade de Vendas": "Nº de Vendas"},
+                         color="Quantidade de Vendas",
+                         color_continuous_scale="Greens")
+    fig_vend_qtd.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_vend_qtd
+
+
+def grafico_ticket_vendedor(df_ticket):
+    fig_ticket = px.bar(df_ticket, y="Vendedor", x="Ticket Médio",
+                       orientation="h",
+                       title="Ticket Médio por Vendedor",
+                       labels={"Vendedor": "Vendedor", "Ticket Médio": "Ticket Médio (R$)"},
+                       color="Ticket Médio",
+                       color_continuous_scale="Oranges")
+    fig_ticket.update_layout(yaxis={'categoryorder':'total ascending'})
+    fig_ticket.update_traces(hovertemplate='<b>%{y}</b><br>Ticket Médio: R$ %{x:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_ticket, 'x')
+
+
+def grafico_ciclo_vendedor(df_ciclo):
+    fig_ciclo = px.bar(df_ciclo, y="Vendedor", x="Ciclo Médio (dias)",
+                      orientation="h",
+                      title="Ciclo Médio de Venda por Vendedor",
+                      labels={"Vendedor": "Vendedor", "Ciclo Médio (dias)": "Dias"},
+                      color="Ciclo Médio (dias)",
+                      color_continuous_scale="RdYlGn_r")
+    fig_ciclo.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_ciclo
+
+
+# ============================================================
+# CLIENTES
+# ============================================================
+def grafico_top_clientes(df_cliente):
+    fig_cli = px.bar(df_cliente, y="Cliente", x="Faturamento Total",
+                    orientation="h",
+                    title="Top 10 Clientes por Faturamento",
+                    labels={"Cliente": "Cliente", "Faturamento Total": "Faturamento (R$)"},
+                    color="Faturamento Total",
+                    color_continuous_scale="Blues")
+    fig_cli.update_layout(yaxis={'categoryorder':'total ascending'})
+    fig_cli.update_traces(hovertemplate='<b>%{y}</b><br>Faturamento: R$ %{x:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_cli, 'x')
+
+
+def grafico_clientes_recorrentes(df_recorrencia_top):
+    fig_rec = px.bar(df_recorrencia_top, y="Cliente", x="Número de Compras",
+                    orientation="h",
+                    title="Top 10 Clientes Mais Recorrentes",
+                    labels={"Cliente": "Cliente", "Número de Compras": "Nº de Compras"},
+                    color="Número de Compras",
+                    color_continuous_scale="Greens")
+    fig_rec.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig_rec
+
+
+def grafico_curva_abc(contagem_abc):
+    return px.pie(contagem_abc, values="Quantidade de Clientes", names="Classificação",
+                  title="Distribuição de Clientes por Curva ABC",
+                  color="Classificação",
+                  color_discrete_map={"A (0-80%)": "#2ecc71", "B (80-95%)": "#f39c12", "C (95-100%)": "#e74c3c"})
+
+
+# ============================================================
+# PRODUTOS/SOLUÇÕES
+# ============================================================
+def grafico_faturamento_tipo(df_tipo):
+    fig_tipo = px.bar(df_tipo, x="Tipo de Solução", y="Faturamento Total",
+                     title="Faturamento por Tipo de Solução",
+                     labels={"Tipo de Solução": "Tipo de Solução",
+                            "Faturamento Total": "Faturamento (R$)"},
+                     color="Faturamento Total",
+                     color_continuous_scale="Viridis")
+    fig_tipo.update_layout(xaxis_tickangle=-45)
+    fig_tipo.update_traces(hovertemplate='<b>%{x}</b><br>Faturamento: R$ %{y:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_tipo, 'y')
+
+
+def grafico_quantidade_tipo(df_tipo_qtd):
+    fig_tipo_qtd = px.bar(df_tipo_qtd, x="Tipo de Solução", y="Quantidade de Vendas",
+                         title="Quantidade de Vendas por Tipo de Solução",
+                         labels={"Tipo de Solução": "Tipo de Solução",
+                                "Quantidade de Vendas": "Nº de Vendas"},
+                         color="Quantidade de Vendas",
+                         color_continuous_scale="Teal")
+    fig_tipo_qtd.update_layout(xaxis_tickangle=-45)
+    return fig_tipo_qtd
+
+
+def grafico_evolucao_tipo(df_tipo_tempo):
+    fig_tipo_tempo = px.line(df_tipo_tempo, x="Período", y="Faturamento",
+                             color="Tipo de Solução",
+                             title="Evolução do Faturamento por Tipo de Solução",
+                             labels={"Período": "Período (Ano-Mês)",
+                                    "Faturamento": "Faturamento (R$)",
+                                    "Tipo de Solução": "Tipo"},
+                             markers=True)
+    fig_tipo_tempo.update_traces(hovertemplate='<b>%{fullData.name}</b><br>Período: %{x}<br>Faturamento: R$ %{y:,.2f}<extra></extra>')
+    return formatar_eixo_reais(fig_tipo_tempo, 'y')
+
+
+# ============================================================
+# PAINEL
+# ============================================================
+PAINEL_VENDAS = {
+    "nome": "vendas",
+    "mensal": MENSAL_VENDAS,
+    # "opcoes": lista vazia não filtra; "periodo": lista aplicada sempre; "intervalo": (início, fim)
+    "filtros": {
+        "ano": "periodo",
+        "data_nf": "intervalo",
+        "vendedor": "opcoes",
+        "tipo_solucao": "opcoes",
+        "cliente": "opcoes",
+        "faixa_valor": "opcoes",
+    },
+    "medidas": {
+        "faturamento": ("valor_venda", "sum"),
+        "vendas": ("valor_venda", "size"),
+        "quantidade": ("valor_venda", "count"),
+        "ticket": ("valor_venda", "mean"),
+        "ciclo": ("lead_time", "mean"),
+        "clientes": ("cliente", "nunique"),
+    },
+    "consultas": {
+        "kpis": {"medidas": ["faturamento", "vendas", "ciclo", "clientes"]},
+        "mensal": {
+            "por": ["ano_mes"], "medidas": ["faturamento", "vendas"],
+            "nomes": {"ano_mes": "Período", "faturamento": "Faturamento", "vendas": "Quantidade de Vendas"},
+        },
+        "faixa": {
+            "por": ["faixa_valor"], "medidas": ["faturamento", "quantidade"], "todas_categorias": True,
+            "nomes": {"faixa_valor": "Faixa de Valor", "faturamento": "Faturamento Total", "quantidade": "Quantidade"},
+        },
+        "vendedor_faturamento": {
+            "por": ["vendedor"], "medidas": ["faturamento"], "ordem": ("faturamento", False),
+            "nomes": {"vendedor": "Vendedor", "faturamento": "Faturamento Total"},
+        },
+        "vendedor_quantidade": {
+            "por": ["vendedor"], "medidas": ["vendas"], "ordem": ("vendas", False),
+            "nomes": {"vendedor": "Vendedor", "vendas": "Quantidade de Vendas"},
+        },
+        "vendedor_ticket": {
+            "por": ["vendedor"], "medidas": ["faturamento", "quantidade", "ticket"], "ordem": ("ticket", False),
+            "nomes": {"vendedor": "Vendedor", "faturamento": "Faturamento Total", "quantidade": "Quantidade",
+                      "ticket": "Ticket Médio"},
+        },
+        "vendedor_ciclo": {
+            "por": ["vendedor"], "medidas": ["ciclo"], "ordem": ("ciclo", True),
+            "nomes": {"vendedor": "Vendedor", "ciclo": "Ciclo Médio (dias)"},
+        },
+        "tipo_faturamento": {
+            "por": ["tipo_solucao"], "medidas": ["faturamento"], "ordem": ("faturamento", False),
+            "nomes": {"tipo_solucao": "Tipo de Solução", "faturamento": "Faturamento Total"},
+        },
+        "tipo_quantidade": {
+            "por": ["tipo_solucao"], "medidas": ["vendas"], "ordem": ("vendas", False),
+            "nomes": {"tipo_solucao": "Tipo de Solução", "vendas": "Quantidade de Vendas"},
+        },
+        "tipo_mensal": {
+            "por": ["ano_mes", "tipo_solucao"], "medidas": ["faturamento"],
+            "nomes": {"ano_mes": "Período", "tipo_solucao": "Tipo de Solução", "faturamento": "Faturamento"},
+        },
+    },
+    # Gráfico: (consulta que o alimenta, função que o monta)
+    "graficos": {
+        "faturamento_mensal": ("mensal", grafico_faturamento_mensal),
+        "quantidade_mensal": ("mensal", grafico_quantidade_mensal),
+        "faturamento_faixa": ("faixa", grafico_faturamento_faixa),
+        "quantidade_faixa": ("faixa", grafico_quantidade_faixa),
+        "faturamento_vendedor": ("vendedor_faturamento", grafico_faturamento_vendedor),
+        "quantidade_vendedor": ("vendedor_quantidade", grafico_quantidade_vendedor),
+        "ticket_vendedor": ("vendedor_ticket", grafico_ticket_vendedor),
+        "ciclo_vendedor": ("vendedor_ciclo", grafico_ciclo_vendedor),
+        "faturamento_tipo": ("tipo_faturamento", grafico_faturamento_tipo),
+        "quantidade_tipo": ("tipo_quantidade", grafico_quantidade_tipo),
+        "evolucao_tipo": ("tipo_mensal", grafico_evolucao_tipo),
+    },
+}
+
+
+# ============================================================
+# CÁLCULO COMPLETO (fora da página)
+# ============================================================
+def calcular(versao, selecoes):
+    """Filtra o snapshot pelas ``selecoes`` e calcula as tabelas do painel e os rankings de clientes.
+
+    Devolve ``{"vazio": True}`` se nada passar pelos filtros.
+    """
+    df_f = painel.filtrar(processamento.carregar("vendas", versao, COLUNAS_ANALISE), PAINEL_VENDAS, selecoes)
+    if df_f.empty:
+        return {"vazio": True}
+    mensal_f = None
+    if painel.cabe_no_mensal(PAINEL_VENDAS, selecoes):
+        mensal_f = painel.filtrar(processamento.agregado("vendas", versao, "mensal"), PAINEL_VENDAS, selecoes)
+    return {
+        "vazio": False,
+        "tabelas": painel.executar(PAINEL_VENDAS, df_f, mensal_f),
+        "clientes": ranking_clientes(df_f),
+    }
@@ -1,5 +1,9 @@
 import streamlit as st
 
+from core import metricas, perfilador, processamento, telemetria
+
+metricas.iniciar_servidor()
+
 menu_inicial = st.Page("pages/Home.py", title = "HUB de Dados ARV", icon="🏠")
 menu_projetos = st.Page("pages/Projetos.py", title="Engenharia", icon="🔨")
 menu_vendas = st.Page("pages/Vendas.py", title="Vendas", icon="💰")
@@ -11,4 +15,6 @@ pg = st.navigation(
     }
 )
 
-pg.run()
\ No newline at end of file
+with telemetria.rerun(pg.title), perfilador.capturar_se_solicitado(pg.title):
+    processamento.nova_execucao()
+    pg.run()
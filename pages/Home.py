@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 
 st.title("👨‍💻 Hub de Dados ARV")
 st.write("Bem-vindo ao Hub de Dados da ARV! Utilize o menu lateral para navegar entre os dashboards de Engenharia e Vendas.")
\ No newline at end of file
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import distintos
+
+
+def _hashes(inicio, fim):
+    return distintos.hashes(pd.Series([f"cliente {i}" for i in range(inicio, fim)]))
+
+
+def test_esboco_exato_ate_o_limite():
+    assert distintos.esboco(_hashes(0, distintos.LIMITE_EXATO))[:1] == b"E"
+    assert distintos.esboco(_hashes(0, distintos.LIMITE_EXATO + 1))[:1] == b"H"
+
+
+def test_uniao_de_exatos_continua_exata():
+    contagem = distintos.contar([distintos.esboco(_hashes(0, 300)), distintos.esboco(_hashes(200, 450)), None])
+    assert contagem.exata
+    assert contagem.valor == 450
+    assert contagem.formatar() == "450" and contagem.margem() == ""
+
+
+def test_esboco_ignora_nulos_e_repetidos():
+    serie = pd.Series(["a", "b", None, "a", np.nan])
+    assert distintos.contar([distintos.esboco(distintos.hashes(serie))]).valor == 2
+
+
+@pytest.mark.parametrize("total", [600, 5_000, 50_000, 300_000])
+def test_estimativa_dentro_de_dois_erros_padrao(total):
+    contagem = distintos.contar([distintos.esboco(_hashes(0, total))])
+    assert not contagem.exata
+    assert contagem.valor == pytest.approx(total, rel=2 * distintos.ERRO_PADRAO)
+
+
+def test_uniao_de_exatos_com_aproximados():
+    # Células com sobreposição: uma exata, duas aproximadas e outra exata já contida nelas
+    esbocos = [
+        distintos.esboco(_hashes(0, 400)),
+        distintos.esboco(_hashes(300, 12_000)),
+        distintos.esboco(_hashes(10_000, 20_000)),
+        distintos.esboco(_hashes(15_000, 15_100)),
+    ]
+    assert [e[:1] for e in esbocos] == [b"E", b"H", b"H", b"E"]
+    contagem = distintos.contar(esbocos)
+    assert not contagem.exata
+    assert contagem.valor == pytest.approx(20_000, rel=0.03)
+    assert contagem.formatar().startswith("≈")
+
+
+def test_uniao_independe_da_ordem_e_da_particao():
+    inteiro = distintos.contar([distintos.esboco(_hashes(0, 20_000))])
+    partes = distintos.contar([distintos.esboco(_hashes(i, i + 2_500)) for i in range(0, 20_000, 2_500)][::-1])
+    assert partes.valor == inteiro.valor
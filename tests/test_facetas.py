@@ -0,0 +1,46 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+from core import facetas, painel, projetos
+from core.snapshots import _facetas_tarefas
+from core.vendas import PAINEL_VENDAS
+
+
+def _tarefas():
+    return pd.DataFrame({
+        "responsavel": ["Ana", "Bruno", "Carla", "Davi", "Eva"],
+        "data_conclusao": pd.to_datetime([
+            "2024-03-08 09:00", "2024-03-10 00:00", "2024-03-10 17:45", "2024-03-11 00:00", None,
+        ]),
+        "ano_mes": ["2024-03", "2024-03", "2024-03", "2024-03", None],
+    })
+
+
+def _indice(df):
+    # Ida e volta em JSON, como o agregado gravado no snapshot
+    return facetas.IndiceFacetas(json.loads(json.dumps(_facetas_tarefas(df))))
+
+
+@pytest.mark.parametrize("fim", [datetime.date(2024, 3, 10), pd.Timestamp("2024-03-10"), "2024-03-10"])
+def test_dia_final_inteiro_no_indice_e_nas_linhas(fim):
+    df = _tarefas()
+    filtros = projetos.filtros_padrao(intervalo=(datetime.date(2024, 3, 8), fim))
+    linhas = sorted(projetos.filtrar_periodo(df, filtros)["responsavel"])
+    assert linhas == ["Ana", "Bruno", "Carla"]
+    assert sorted(projetos.responsaveis_disponiveis(_indice(df), filtros)) == linhas
+
+
+def test_dia_unico():
+    df = _tarefas()
+    filtros = projetos.filtros_padrao(intervalo=("2024-03-11", "2024-03-11"))
+    assert list(projetos.filtrar_periodo(df, filtros)["responsavel"]) == ["Davi"]
+    assert projetos.responsaveis_disponiveis(_indice(df), filtros) == ["Davi"]
+
+
+def test_intervalo_do_painel_inclui_o_dia_final():
+    df = pd.DataFrame({"data_nf": pd.to_datetime(["2024-01-31 00:00", "2024-01-31 23:59", "2024-02-01 00:00"])})
+    filtrado = painel.filtrar(df, PAINEL_VENDAS, {"data_nf": (datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))})
+    assert len(filtrado) == 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from core import mensal
+from core.snapshots import MENSAL_VENDAS
+
+
+def _vendas():
+    rng = np.random.default_rng(11)
+    n = 400
+    data_nf = pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 180, n), unit="D")
+    df = pd.DataFrame({
+        "data_nf": data_nf,
+        "cliente": rng.choice([f"Cliente {i}" for i in range(40)], n),
+        "vendedor": rng.choice(["Ana", "Bruno", None], n),
+        "tipo_solucao": rng.choice(["Automação", "Robótica"], n),
+        "valor_venda": rng.lognormal(10, 1.5, n).round(2),
+    })
+    df["ano"] = df["data_nf"].dt.year
+    df["ano_mes"] = df["data_nf"].dt.to_period("M").astype(str)
+    df["faixa_valor"] = pd.cut(df["valor_venda"], bins=[0, 10000, 50000, float("inf")],
+                               labels=["< R$ 10k", "R$ 10k-50k", "> R$ 50k"])
+    return df
+
+
+def _meses_agregados(monkeypatch):
+    """Meses que chegam a ``_agregar`` (os reagregados) em cada construção"""
+    chamadas = []
+    original = mensal._agregar
+
+    def _agregar(base, espec):
+        chamadas.append(set(base[espec["dimensoes"][0]].unique()))
+        return original(base, espec)
+
+    monkeypatch.setattr(mensal, "_agregar", _agregar)
+    return chamadas
+
+
+def test_incremental_igual_a_reconstrucao(monkeypatch):
+    df = _vendas()
+    anterior = mensal.construir(df, MENSAL_VENDAS)
+
+    alterado = df.copy()
+    marco = alterado["ano_mes"] == "2024-03"
+    alterado.loc[marco.idxmax(), "valor_venda"] += 1000
+    alterado.loc[marco[marco].index[1], "cliente"] = "Cliente novo"
+
+    chamadas = _meses_agregados(monkeypatch)
+    incremental = mensal.construir(alterado, MENSAL_VENDAS, anterior)
+    assert chamadas == [{"2024-03"}]
+
+    completa = mensal.construir(alterado, MENSAL_VENDAS)
+    pd.testing.assert_frame_equal(incremental, completa)
+
+    # Os meses intocados são as linhas da versão anterior, sem reagregar
+    outros = incremental["ano_mes"] != "2024-03"
+    pd.testing.assert_frame_equal(incremental[outros].reset_index(drop=True),
+                                  anterior[anterior["ano_mes"] != "2024-03"].reset_index(drop=True))
+
+
+def test_sem_mudancas_nao_reagrega(monkeypatch):
+    df = _vendas()
+    anterior = mensal.construir(df, MENSAL_VENDAS)
+    chamadas = _meses_agregados(monkeypatch)
+    pd.testing.assert_frame_equal(mensal.construir(df.sample(frac=1, random_state=3), MENSAL_VENDAS, anterior),
+                                  anterior)
+    assert chamadas == [set()]
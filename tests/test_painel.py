@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import mensal, painel
+from core.snapshots import MENSAL_VENDAS
+from core.vendas import PAINEL_VENDAS
+
+FAIXAS = ["< R$ 10k", "R$ 10k-50k", "R$ 50k-100k", "R$ 100k-500k", "> R$ 500k"]
+
+
+def _vendas(categorias):
+    """Vendas sintéticas com nulos nas dimensões (vendedor, tipo) e nas medidas"""
+    rng = np.random.default_rng(7)
+    n = 600
+    data_nf = pd.to_datetime("2023-01-01") + pd.to_timedelta(rng.integers(0, 540, n), unit="D")
+    df = pd.DataFrame({
+        "data_nf": data_nf,
+        "cliente": rng.choice([f"Cliente {i}" for i in range(80)], n),
+        "vendedor": rng.choice(["Ana", "Bruno", "Carla", None], n, p=[0.4, 0.3, 0.2, 0.1]),
+        "tipo_solucao": rng.choice(["Automação", "Robótica", "Visão", None], n, p=[0.4, 0.3, 0.2, 0.1]),
+        "valor_venda": rng.lognormal(10, 1.5, n).round(2),
+        "lead_time": rng.integers(0, 90, n).astype(float),
+    })
+    df.loc[rng.choice(n, 40, replace=False), "valor_venda"] = np.nan
+    df.loc[rng.choice(n, 40, replace=False), "lead_time"] = np.nan
+    df["ano"] = df["data_nf"].dt.year
+    df["ano_mes"] = df["data_nf"].dt.to_period("M").astype(str)
+    df["faixa_valor"] = pd.cut(df["valor_venda"], bins=[0, 10000, 50000, 100000, 500000, float("inf")], labels=FAIXAS)
+    if categorias:
+        # Como o snapshot entrega os textos (dicionário com categorias ordenadas)
+        for coluna in ("cliente", "vendedor", "tipo_solucao"):
+            df[coluna] = df[coluna].astype(pd.CategoricalDtype(sorted(df[coluna].dropna().unique())))
+    return df
+
+
+def _esperado(df):
+    """As mesmas consultas de PAINEL_VENDAS com groupbys diretos do pandas"""
+    valor = df["valor_venda"]
+    por_vendedor = df.groupby("vendedor", observed=True)["valor_venda"]
+    por_tipo = df.groupby("tipo_solucao", observed=True)["valor_venda"]
+    por_faixa = df.groupby("faixa_valor", observed=False)["valor_venda"]
+    return {
+        "kpis": {"faturamento": valor.sum(), "vendas": len(df), "ciclo": df["lead_time"].mean(),
+                 "clientes": df["cliente"].nunique()},
+        "mensal": pd.DataFrame({"Faturamento": df.groupby("ano_mes")["valor_venda"].sum(),
+                                "Quantidade de Vendas": df.groupby("ano_mes").size()}).rename_axis("Período"),
+        "faixa": pd.DataFrame({"Faturamento Total": por_faixa.sum(),
+                               "Quantidade": por_faixa.count()}).rename_axis("Faixa de Valor"),
+        "vendedor_faturamento": por_vendedor.sum().rename("Faturamento Total").rename_axis("Vendedor").to_frame(),
+        "vendedor_quantidade": por_vendedor.size().rename("Quantidade de Vendas").rename_axis("Vendedor").to_frame(),
+        "vendedor_ticket": pd.DataFrame({"Faturamento Total": por_vendedor.sum(), "Quantidade": por_vendedor.count(),
+                                         "Ticket Médio": por_vendedor.mean()}).rename_axis("Vendedor"),
+        "vendedor_ciclo": df.groupby("vendedor", observed=True)["lead_time"].mean()
+                            .rename("Ciclo Médio (dias)").rename_axis("Vendedor").to_frame(),
+        "tipo_faturamento": por_tipo.sum().rename("Faturamento Total").rename_axis("Tipo de Solução").to_frame(),
+        "tipo_quantidade": por_tipo.size().rename("Quantidade de Vendas").rename_axis("Tipo de Solução").to_frame(),
+        "tipo_mensal": df.groupby(["ano_mes", "tipo_solucao"], observed=True)["valor_venda"].sum()
+                         .rename("Faturamento").rename_axis(["Período", "Tipo de Solução"]).to_frame(),
+    }
+
+
+def _comparar(tabelas, esperado):
+    assert set(tabelas) == set(esperado)
+    kpis = tabelas["kpis"]
+    assert kpis["faturamento"] == pytest.approx(esperado["kpis"]["faturamento"])
+    assert kpis["vendas"] == esperado["kpis"]["vendas"]
+    assert kpis["ciclo"] == pytest.approx(esperado["kpis"]["ciclo"])
+    assert kpis["clientes"].exata and kpis["clientes"].valor == esperado["kpis"]["clientes"]
+
+    for nome, consulta in PAINEL_VENDAS["consultas"].items():
+        if nome == "kpis":
+            continue
+        obtido, referencia = tabelas[nome], esperado[nome]
+        if "ordem" in consulta:
+            coluna, crescente = consulta["ordem"]
+            ordem = obtido[consulta["nomes"][coluna]]
+            assert ordem.is_monotonic_increasing if crescente else ordem.is_monotonic_decreasing
+        dimensoes = list(referencia.index.names)
+        obtido = obtido.astype({d: str for d in dimensoes}).set_index(dimensoes).sort_index()
+        referencia = referencia.reset_index().astype({d: str for d in dimensoes}).set_index(dimensoes).sort_index()
+        pd.testing.assert_frame_equal(obtido, referencia[obtido.columns], check_dtype=False, obj=nome)
+
+
+def test_plano_deriva_graos_mais_grossos():
+    plano = painel.compilar(PAINEL_VENDAS)
+    assert plano.derivar[("tipo_solucao",)][0] == ("ano_mes", "tipo_solucao")
+    assert plano.derivar[("ano_mes",)][0] == ("ano_mes", "tipo_solucao")
+
+
+@pytest.mark.parametrize("categorias", [False, True])
+def test_executar_igual_ao_groupby_das_linhas(categorias):
+    df = _vendas(categorias)
+    assert df["vendedor"].isna().any() and df["tipo_solucao"].isna().any()
+    selecoes = {"ano": sorted(df["ano"].unique()), "vendedor": [], "tipo_solucao": [], "cliente": [], "faixa_valor": []}
+    df_f = painel.filtrar(df, PAINEL_VENDAS, selecoes)
+    _comparar(painel.executar(PAINEL_VENDAS, df_f), _esperado(df_f))
+
+
+@pytest.mark.parametrize("selecoes", [
+    {"ano": [2023, 2024]},
+    {"ano": [2024], "vendedor": ["Ana", "Carla"], "tipo_solucao": ["Robótica", "Visão"]},
+    {"ano": [2023, 2024], "faixa_valor": ["R$ 10k-50k", "R$ 50k-100k"]},
+])
+def test_executar_pela_tabela_mensal(selecoes):
+    df = _vendas(categorias=True)
+    tabela_mensal = mensal.construir(df, MENSAL_VENDAS)
+    assert painel.cabe_no_mensal(PAINEL_VENDAS, selecoes)
+    df_f = painel.filtrar(df, PAINEL_VENDAS, selecoes)
+    mensal_f = painel.filtrar(tabela_mensal, PAINEL_VENDAS, selecoes)
+    _comparar(painel.executar(PAINEL_VENDAS, df_f, mensal_f), _esperado(df_f))
+
+
+def test_intervalo_volta_as_linhas():
+    df = _vendas(categorias=True)
+    selecoes = {"data_nf": (pd.Timestamp("2023-03-01"), pd.Timestamp("2023-09-30"))}
+    assert not painel.cabe_no_mensal(PAINEL_VENDAS, selecoes)
+    df_f = painel.filtrar(df, PAINEL_VENDAS, selecoes)
+    _comparar(painel.executar(PAINEL_VENDAS, df_f), _esperado(df_f))
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import ranking
+
+
+def _abc_linha_a_linha(valores):
+    """Classificação ABC como a página fazia: acumulado e ``apply`` por linha"""
+    percentual = valores.sort_values(ascending=False) / valores.sum() * 100
+    classes = percentual.cumsum().apply(
+        lambda x: "A (0-80%)" if x <= 80 else ("B (80-95%)" if x <= 95 else "C (95-100%)")
+    )
+    return classes.value_counts().to_dict()
+
+
+@pytest.mark.parametrize("crescente", [False, True])
+@pytest.mark.parametrize("n", [1, 3, 5, 10, 50])
+def test_top_n_igual_a_ordenar_e_cortar(n, crescente):
+    valores = pd.Series([5.0, 3.0, 5.0, np.nan, 1.0, 3.0, 5.0, 2.0, np.nan, 3.0],
+                        index=[f"e{i}" for i in range(10)])
+    esperado = valores.sort_values(ascending=crescente, kind="stable").head(n)
+    pd.testing.assert_series_equal(ranking.top_n(valores, n, crescente), esperado)
+
+
+def test_top_n_empate_no_corte_segue_a_ordem_do_indice():
+    valores = pd.Series([1, 7, 4, 7, 7, 2], index=list("abcdef"))
+    assert list(ranking.top_n(valores, 2).index) == ["b", "d"]
+
+
+@pytest.mark.parametrize("valores", [
+    [50, 30, 15, 5],           # acumulado cai exatamente em 80 e 95
+    [40, 40, 15, 5],
+    [80, 15, 5],
+    [79, 1, 1, 14, 5],
+    [100],
+    [10] * 20,                 # empates: 8 atingem 80%
+    [1, 1, 1, 1, 96],
+])
+def test_curva_abc_igual_a_classificacao_linha_a_linha(valores):
+    serie = pd.Series(valores, dtype=float)
+    obtido = ranking.curva_abc(serie)
+    assert dict(zip(obtido["Classificação"], obtido["Quantidade de Clientes"])) == _abc_linha_a_linha(serie)
+    assert obtido["Quantidade de Clientes"].is_monotonic_decreasing
+
+
+def test_curva_abc_aleatoria():
+    serie = pd.Series(np.random.default_rng(5).lognormal(10, 2, 5_000))
+    obtido = ranking.curva_abc(serie)
+    assert dict(zip(obtido["Classificação"], obtido["Quantidade de Clientes"])) == _abc_linha_a_linha(serie)
+
+
+def test_em_cache_por_estado_de_filtro(monkeypatch):
+    monkeypatch.setattr(ranking, "_cache", OrderedDict())
+    calculos = []
+
+    def calcular(ano):
+        calculos.append(ano)
+        return f"ranking {ano}"
+
+    chave_2023 = ranking.chave({"ano": [2023], "vendedor": []})
+    chave_2024 = ranking.chave({"vendedor": [], "ano": [2024]})
+    assert ranking.em_cache("top", chave_2023, lambda: calcular(2023)) == "ranking 2023"
+    assert ranking.em_cache("top", chave_2024, lambda: calcular(2024)) == "ranking 2024"
+    assert ranking.em_cache("top", ranking.chave({"vendedor": [], "ano": [2023]}),
+                            lambda: calcular(0)) == "ranking 2023"
+    assert calculos == [2023, 2024]
@@ -0,0 +1,58 @@
+import pytest
+
+from core import relatorios
+from core.dados import EQUIPES_PESSOAS
+
+OPCOES = {
+    "projetos": {"meses": ["2024-10", "2024-11", "2024-12"]},
+    "vendas": {"anos": [2023, 2024], "vendedores": ["Ana", "Ana Maria", "Bruno"], "tipos": ["Robótica", "Visão"],
+               "data_min": "2024-09-15T00:00:00", "data_max": "2024-12-02T00:00:00"},
+}
+
+
+def test_presets_padrao_um_por_valor():
+    concretos = relatorios.expandir(relatorios.PRESETS_PADRAO, OPCOES)
+    nomes = [c["nome"] for c in concretos]
+    assert nomes == [
+        "Engenharia - Geral",
+        *[f"Engenharia - {equipe}" for equipe in EQUIPES_PESSOAS],
+        "Engenharia - 2024-10", "Engenharia - 2024-11", "Engenharia - 2024-12",
+        "Vendas - Geral",
+        "Vendas - Ana", "Vendas - Ana Maria", "Vendas - Bruno",
+        "Vendas - 2024-10", "Vendas - 2024-11", "Vendas - 2024-12",
+    ]
+    assert len({c["arquivo"] for c in concretos}) == len(concretos)
+
+    por_nome = {c["nome"]: c["filtros"] for c in concretos}
+    assert por_nome["Engenharia - Geral"]["meses"] == OPCOES["projetos"]["meses"]
+    assert por_nome["Engenharia - Compras"]["equipes"] == ["Compras"]
+    assert por_nome["Engenharia - 2024-11"]["meses"] == ["2024-11"]
+    assert por_nome["Vendas - Ana Maria"]["vendedor"] == ["Ana Maria"]
+    assert por_nome["Vendas - Ana Maria"]["ano"] == [2023, 2024]
+    # Período por datas substitui o ano, com o dia final inteiro
+    assert por_nome["Vendas - 2024-11"]["data_nf"] == ("2024-11-01", "2024-11-30")
+    assert "ano" not in por_nome["Vendas - 2024-11"]
+
+
+def test_filtros_do_preset_combinados_com_cada_valor():
+    presets = [{"pagina": "projetos", "nome": "Atrasos", "por": "equipe",
+                "filtros": {"apenas_atrasadas": True, "intervalo": ["2024-10-01", "2024-10-31"]}}]
+    concretos = relatorios.expandir(presets, OPCOES)
+    assert len(concretos) == len(EQUIPES_PESSOAS)
+    for concreto, equipe in zip(concretos, EQUIPES_PESSOAS):
+        assert concreto["filtros"]["equipes"] == [equipe]
+        assert concreto["filtros"]["apenas_atrasadas"] is True
+        assert concreto["filtros"]["meses"] == []
+
+
+def test_nomes_repetidos_ganham_arquivos_distintos():
+    presets = [{"pagina": "vendas", "nome": "Resumo"}, {"pagina": "vendas", "nome": "Resumo"},
+               {"pagina": "projetos", "nome": "resumo!"}, {"pagina": "vendas", "nome": "Visão", "por": "tipo"}]
+    concretos = relatorios.expandir(presets, OPCOES)
+    assert [c["arquivo"] for c in concretos] == ["resumo", "resumo-2", "resumo-3", "visao-robotica", "visao-visao"]
+
+
+@pytest.mark.parametrize("preset", [{"pagina": "compras"}, {"pagina": "vendas", "por": "equipe"}])
+def test_preset_invalido(preset):
+    with pytest.raises(ValueError):
+        relatorios.expandir([preset], OPCOES)
@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core import snapshots
+
+MENSAL = {"dimensoes": ["ano_mes", "grupo"], "medidas": {"valor": ("valor", "sum")}}
+
+
+@pytest.fixture
+def fonte(tmp_path, monkeypatch):
+    """Dataset de teste lido de um CSV, com os snapshots num diretório temporário"""
+    caminho = tmp_path / "fonte.csv"
+    monkeypatch.setattr(snapshots, "DIRETORIO_SNAPSHOTS", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(snapshots, "PAPEL", "local")
+    monkeypatch.setattr(snapshots, "_fontes_conferidas", {})
+    monkeypatch.setitem(snapshots.DATASETS, "teste", {
+        "fontes": lambda: [str(caminho)],
+        "ler": lambda: pd.read_csv(caminho),
+        "agregados": {},
+        "mensal": MENSAL,
+    })
+    return caminho
+
+
+def _escrever(caminho, valores):
+    pd.DataFrame({
+        "ano_mes": ["2024-01", "2024-02", "2024-02"][:len(valores)],
+        "grupo": ["a", "b", "a"][:len(valores)],
+        "valor": valores,
+    }).to_csv(caminho, index=False)
+
+
+def _ponteiro():
+    with open(os.path.join(snapshots.DIRETORIO_SNAPSHOTS, "teste", snapshots.ARQUIVO_PONTEIRO)) as f:
+        return f.read()
+
+
+def test_nova_versao_move_o_ponteiro(fonte):
+    _escrever(fonte, [1.0, 2.0])
+    primeira = snapshots.construir("teste")
+    assert _ponteiro() == primeira
+    assert snapshots.construir("teste") == primeira
+
+    _escrever(fonte, [1.0, 2.0, 30.0])
+    segunda = snapshots.versao_vigente("teste")
+    assert segunda != primeira
+    assert _ponteiro() == segunda
+
+    df = snapshots.carregar("teste", snapshots.versao_vigente("teste"))
+    assert list(df["valor"]) == [1.0, 2.0, 30.0]
+    mensal = snapshots.ler_agregado("teste", segunda, "mensal")
+    assert mensal.set_index(["ano_mes", "grupo"])["valor"].to_dict() == {
+        ("2024-01", "a"): 1.0, ("2024-02", "a"): 30.0, ("2024-02", "b"): 2.0,
+    }
+    # A versão anterior continua legível por quem já a abriu
+    assert snapshots.ler_tabela("teste", primeira).num_rows == 2
+
+
+def test_leitor_sem_snapshot_publicado(fonte, monkeypatch):
+    _escrever(fonte, [1.0])
+    monkeypatch.setattr(snapshots, "PAPEL", "leitor")
+    with pytest.raises(snapshots.SnapshotIndisponivel):
+        snapshots.versao_vigente("teste")
+    assert not os.path.exists(os.path.join(snapshots.DIRETORIO_SNAPSHOTS, "teste"))
+
+
+def test_leitor_nao_reconstroi(fonte, monkeypatch):
+    _escrever(fonte, [1.0])
+    publicada = snapshots.construir("teste")
+    monkeypatch.setattr(snapshots, "PAPEL", "leitor")
+    _escrever(fonte, [1.0, 2.0])
+    assert snapshots.versao_vigente("teste") == publicada
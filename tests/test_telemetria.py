@@ -0,0 +1,66 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from core import telemetria
+
+
+def _pagina():
+    import streamlit as st
+
+    from core import telemetria
+
+    with telemetria.rerun("teste"):
+        with telemetria.secao("filtros"):
+            st.sidebar.write("filtros")
+            if st.query_params.get("parar"):
+                st.warning("Nenhum dado encontrado com os filtros selecionados.")
+                st.stop()
+        with telemetria.secao("kpis"):
+            st.metric("Total", 1)
+
+
+def _amostras(pagina, secao):
+    return next((linha["amostras"] for linha in telemetria.agregador.resumo()
+                 if linha["pagina"] == pagina and linha["secao"] == secao), 0)
+
+
+@pytest.fixture
+def painel(monkeypatch):
+    monkeypatch.setenv("HUB_PERF_PANEL", "1")
+    monkeypatch.setenv("HUB_PERF_LOG", "0")
+
+
+def _rodar(parar):
+    at = AppTest.from_function(_pagina)
+    if parar:
+        at.query_params["parar"] = "1"
+    at.run()
+    assert not at.exception
+    return at
+
+
+def test_painel_na_execucao_completa(painel):
+    antes = _amostras("teste", "total")
+    at = _rodar(parar=False)
+    assert [e.label for e in at.sidebar.expander] == ["⏱ Performance"]
+    assert _amostras("teste", "total") == antes + 1
+
+
+def test_painel_desenhado_apos_st_stop(painel):
+    antes = {secao: _amostras("teste", secao) for secao in ("total", "filtros")}
+    at = _rodar(parar=True)
+    assert len(at.warning) == 1 and len(at.metric) == 0
+    assert [e.label for e in at.sidebar.expander] == ["⏱ Performance"]
+    assert "interrompido por st.stop()" in at.sidebar.caption[0].value
+    # A execução interrompida não entra nos percentis
+    assert {secao: _amostras("teste", secao) for secao in antes} == antes
+
+
+def test_eventos_interrompidos_marcados(painel):
+    eventos = []
+    ouvinte = telemetria.assinar(eventos.append)
+    try:
+        _rodar(parar=True)
+    finally:
+        telemetria._ouvintes.remove(ouvinte)
+    assert {(e["secao"], e.get("interrompido")) for e in eventos} == {("filtros", "stop"), ("total", "stop")}